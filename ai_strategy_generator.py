@@ -2,9 +2,18 @@
 AI Strategy Generator using OpenAI
 """
 
+import asyncio
+import copy
+import functools
+import hashlib
 import json
+import math
+import os
+import re
+import shelve
+import threading
 import time
-from datetime import datetime, timedelta
+from collections import OrderedDict, deque
 from typing import Dict, List, Optional, Tuple
 import logging
 
@@ -14,42 +23,408 @@ logger = logging.getLogger(__name__)
 
 try:
     import openai
+    import httpx
     OPENAI_AVAILABLE = True
 except ImportError:
     OPENAI_AVAILABLE = False
     logger.warning("OpenAI not available. Install with: pip install openai")
 
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+try:
+    import tiktoken
+    TIKTOKEN_AVAILABLE = True
+except ImportError:
+    TIKTOKEN_AVAILABLE = False
+
+# Read once so repeated AIStrategyGenerator construction does not hit the environment
+OPENAI_API_KEY = os.getenv('OPENAI_API_KEY')
+
+
+# Keywords scanned for in analysis text, in the order strategies are reported
+_KEYWORD_TAGS = (
+    ('bullish', ('sentiment', 'Bullish')),
+    ('bearish', ('sentiment', 'Bearish')),
+    ('iron condor', ('strategy', 'Iron Condor')),
+    ('straddle', ('strategy', 'Straddle')),
+    ('strangle', ('strategy', 'Strangle')),
+    ('call spread', ('strategy', 'Call Spread')),
+    ('put spread', ('strategy', 'Put Spread')),
+    ('high', ('risk', 'High')),
+    ('low', ('risk', 'Low')),
+)
+_KEYWORD_LOOKUP = dict(_KEYWORD_TAGS)
+_STRATEGY_ORDER = tuple(tag[1] for _, tag in _KEYWORD_TAGS if tag[0] == 'strategy')
+
+if AHOCORASICK_AVAILABLE:
+    _KEYWORD_AUTOMATON = ahocorasick.Automaton()
+    for _keyword, _tag in _KEYWORD_TAGS:
+        _KEYWORD_AUTOMATON.add_word(_keyword, _tag)
+    _KEYWORD_AUTOMATON.make_automaton()
+else:
+    _KEYWORD_RE = re.compile('|'.join(re.escape(k) for k, _ in _KEYWORD_TAGS))
+
+
+def _scan_keywords(text_lower: str) -> set:
+    """Find every keyword tag present in the text in a single pass"""
+    if AHOCORASICK_AVAILABLE:
+        return {tag for _, tag in _KEYWORD_AUTOMATON.iter(text_lower)}
+    return {_KEYWORD_LOOKUP[m.group()] for m in _KEYWORD_RE.finditer(text_lower)}
+
+
+STRATEGY_SCHEMA = {
+    'name': 'options_strategy',
+    'schema': {
+        'type': 'object',
+        'properties': {
+            'strategy_type': {
+                'type': 'string',
+                'enum': ['Iron Condor', 'Straddle', 'Strangle', 'Call Spread', 'Put Spread']
+            },
+            'reasoning': {'type': 'string', 'maxLength': 400, 'description': 'One or two sentences'},
+            'parameters': {
+                'type': 'object',
+                'properties': {
+                    'expiration_days': {'type': 'integer'},
+                    'strikes': {'type': 'object', 'additionalProperties': {'type': 'number'}},
+                    'premiums': {'type': 'object', 'additionalProperties': {'type': 'number'}},
+                    'max_profit': {'type': 'number'},
+                    'max_loss': {'type': 'number'},
+                    'probability_of_profit': {'type': 'number'}
+                },
+                'required': ['expiration_days', 'strikes', 'premiums', 'max_profit',
+                             'max_loss', 'probability_of_profit']
+            },
+            'risk_level': {'type': 'string', 'enum': ['Low', 'Medium', 'High']},
+            'confidence': {'type': 'number'}
+        },
+        'required': ['strategy_type', 'reasoning', 'parameters', 'risk_level', 'confidence']
+    }
+}
+
+
+class ResponseCache:
+    """LRU cache with TTL for parsed AI responses, optionally persisted with shelve"""
+    
+    def __init__(self, maxsize: int = 512, ttl: float = 300.0, path: Optional[str] = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._shelf = None
+        # Reentrant so get/set can evict while holding it; callers arrive via asyncio.to_thread
+        self._lock = threading.RLock()
+        
+        if path:
+            try:
+                self._shelf = shelve.open(path)
+                now = time.time()
+                for key in list(self._shelf.keys()):
+                    stored_at, value = self._shelf[key]
+                    if now - stored_at < self.ttl:
+                        self._entries[key] = (stored_at, value)
+                    else:
+                        del self._shelf[key]
+            except Exception as e:
+                logger.warning("Could not open response cache at %s: %s", path, e)
+                self._shelf = None
+    
+    @staticmethod
+    def make_key(kind: str, market_data: Dict, *extra) -> str:
+        """Build a key from market data rounded to coarse buckets so near-identical ticks collide"""
+        canonical = {
+            'kind': kind,
+            'vix': _bucket(market_data.get('vix'), 0.5),
+            'spy_price': _log_bucket(market_data.get('spy_price')),
+            'trend': market_data.get('trend'),
+            'volatility': _bucket(market_data.get('volatility'), 0.005),
+            'extra': [_log_bucket(x) if isinstance(x, float) else x for x in extra]
+        }
+        payload = json.dumps(canonical, sort_keys=True, default=str).encode()
+        return hashlib.blake2b(payload, digest_size=16).hexdigest()
+    
+    def get(self, key: str) -> Optional[Dict]:
+        """Return a copy of the cached value, or None on miss/expiry"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            stored_at, value = entry
+            if time.time() - stored_at >= self.ttl:
+                self._evict(key)
+                return None
+            self._entries.move_to_end(key)
+            return copy.deepcopy(value)
+    
+    def set(self, key: str, value: Dict):
+        """Store a value, evicting the least recently used entry when full"""
+        entry = (time.time(), copy.deepcopy(value))
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            if self._shelf is not None:
+                self._shelf[key] = entry
+            while len(self._entries) > self.maxsize:
+                oldest = next(iter(self._entries))
+                self._evict(oldest)
+    
+    def close(self):
+        """Flush and close the persistent store"""
+        with self._lock:
+            if self._shelf is not None:
+                self._shelf.close()
+                self._shelf = None
+    
+    def _evict(self, key: str):
+        with self._lock:
+            self._entries.pop(key, None)
+            if self._shelf is not None and key in self._shelf:
+                del self._shelf[key]
+
+
+class SingleFlight:
+    """Coalesces concurrent identical requests so only the first caller does the work"""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self._futures = {}
+    
+    def do(self, key: str, fn, *args):
+        """Run fn(*args) once per key across threads; concurrent callers share the result"""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = {'done': threading.Event(), 'result': None, 'error': None}
+        
+        if not leader:
+            call['done'].wait()
+            if call['error'] is not None:
+                raise call['error']
+            return copy.deepcopy(call['result'])
+        
+        try:
+            call['result'] = fn(*args)
+            return call['result']
+        except BaseException as e:
+            call['error'] = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call['done'].set()
+    
+    async def ado(self, key: str, fn, *args):
+        """Await fn(*args) once per key on the running loop; concurrent callers share the result"""
+        future = self._futures.get(key)
+        if future is not None:
+            return copy.deepcopy(await asyncio.shield(future))
+        
+        future = asyncio.get_running_loop().create_future()
+        self._futures[key] = future
+        try:
+            result = await fn(*args)
+            future.set_result(result)
+            return result
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            # Followers re-raise the leader's error; reading it back marks it retrieved, so an
+            # unwaited future doesn't log "exception was never retrieved"
+            future.set_exception(e)
+            future.exception()
+            raise
+        finally:
+            self._futures.pop(key, None)
+
+
+def _bucket(value, step: float):
+    """Round a numeric value to the nearest multiple of step"""
+    if not isinstance(value, (int, float)):
+        return value
+    return round(round(value / step) * step, 6)
+
+
+def _log_bucket(value, rel_step: float = 0.001):
+    """Round a positive value to a relative bucket (0.1% by default)"""
+    if not isinstance(value, (int, float)) or value <= 0:
+        return value
+    return round(math.log(value) / rel_step)
+
+
+# Fallback (sentiment, strategies, risk level) by VIX regime: low, normal, high
+_FALLBACK_ANALYSIS_TABLE = (
+    ('Bullish', ('Call Spread', 'Straddle'), 'Low'),
+    ('Neutral', ('Iron Condor', 'Strangle'), 'Medium'),
+    ('Bearish', ('Iron Condor', 'Put Spread'), 'High'),
+)
+
+# Fallback (type, expiration days, strike multipliers, max profit, max loss) for VIX <= 25, VIX > 25
+_FALLBACK_STRATEGY_TABLE = (
+    ('Straddle', 21, (('strike', 1.0),), float('inf'), 15.0),
+    ('Iron Condor', 30, (('short_call', 1.05), ('long_call', 1.10),
+                         ('short_put', 0.95), ('long_put', 0.90)), 2.0, 3.0),
+)
+
+
+# Prompt templates, filled with str.format_map from _prompt_params
+_MARKET_ANALYSIS_TEMPLATE = (
+    "VIX={vix} SPY={spy_price} trend={trend} vol={volatility} time={time_of_day}\n"
+    "Give: sentiment (Bullish/Bearish/Neutral), strategy types, risk (Low/Medium/High), "
+    "key factors as '- ' bullets."
+)
+_STRATEGY_TEMPLATE = (
+    "Options strategy for {symbol} price={current_price:.2f} VIX={vix} trend={trend} vol={volatility}"
+)
+_RECOMMENDATION_TEMPLATE = (
+    "1) " + _MARKET_ANALYSIS_TEMPLATE + "\n"
+    "2) " + _STRATEGY_TEMPLATE + "\n"
+    "Return JSON: {{\"analysis\": answer to 1 as a string, \"strategy\": {{strategy_type, reasoning, "
+    "parameters: {{expiration_days, strikes, premiums, max_profit, max_loss, probability_of_profit}}, "
+    "risk_level, confidence}}}}"
+)
+
+# Prompt token budgets and the order in which fields are dropped to meet them
+_ANALYSIS_TOKEN_BUDGET = 400
+_STRATEGY_TOKEN_BUDGET = 600
+_PROMPT_DROP_ORDER = ('time_of_day', 'spy_price', 'volatility', 'trend', 'vix')
+
+
+@functools.lru_cache(maxsize=8)
+def _encoding_for(model: str):
+    """Return the tiktoken encoding for a model, cached per model"""
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        return tiktoken.get_encoding('o200k_base')
+
+
+def _count_tokens(text: str, model: str) -> int:
+    """Count prompt tokens, estimating ~4 characters per token without tiktoken"""
+    if TIKTOKEN_AVAILABLE:
+        return len(_encoding_for(model).encode(text))
+    return len(text) // 4 + 1
+
+
+# (epoch second, formatted prefix) reused for every timestamp within the same second
+_timestamp_prefix = (0, '')
+
+
+def _isoformat_now() -> str:
+    """Local ISO-8601 timestamp equivalent to datetime.now().isoformat()"""
+    global _timestamp_prefix
+    now = time.time()
+    second = int(now)
+    cached_second, prefix = _timestamp_prefix
+    if second != cached_second:
+        prefix = time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(second))
+        _timestamp_prefix = (second, prefix)
+    return f"{prefix}.{int((now - second) * 1_000_000):06d}"
+
+
+class _JsonObjectTracker:
+    """Tracks brace depth across streamed text to spot the end of a JSON object"""
+    
+    def __init__(self):
+        self.depth = 0
+        self.in_string = False
+        self.escape = False
+    
+    def feed(self, text: str) -> int:
+        """Consume text; return the index just past the closing brace, or -1"""
+        for i, ch in enumerate(text):
+            if self.in_string:
+                if self.escape:
+                    self.escape = False
+                elif ch == '\\':
+                    self.escape = True
+                elif ch == '"':
+                    self.in_string = False
+            elif ch == '"':
+                self.in_string = True
+            elif ch == '{':
+                self.depth += 1
+            elif ch == '}':
+                self.depth -= 1
+                if self.depth == 0:
+                    return i + 1
+        return -1
+
 
 class AIStrategyGenerator:
     """Generates trading strategies using OpenAI"""
     
-    def __init__(self, api_key: Optional[str] = None):
+    __slots__ = ('api_key', 'model', 'client', '_http', 'strategy_history', 'cache', '_inflight')
+    
+    def __init__(self, api_key: Optional[str] = None, cache_path: Optional[str] = None,
+                 model: str = "gpt-4o-mini"):
         self.api_key = api_key
+        self.model = model
         self.client = None
-        self.strategy_history = []
+        self._http = None
+        self.strategy_history = deque(maxlen=256)
+        self.cache = ResponseCache(path=cache_path)
+        self._inflight = SingleFlight()
         
         if OPENAI_AVAILABLE and api_key:
             openai.api_key = api_key
-            self.client = openai.OpenAI(api_key=api_key)
+            self.client = openai.OpenAI(api_key=api_key, http_client=self._create_http_client())
         elif OPENAI_AVAILABLE:
             # Try to get from environment
-            import os
-            api_key = os.getenv('OPENAI_API_KEY')
+            api_key = OPENAI_API_KEY
             if api_key:
-                self.client = openai.OpenAI(api_key=api_key)
+                self.api_key = api_key
+                self.client = openai.OpenAI(api_key=api_key, http_client=self._create_http_client())
             else:
                 logger.warning("No OpenAI API key provided. Set OPENAI_API_KEY environment variable.")
     
+    @staticmethod
+    def _http_limits():
+        """Connection pool limits shared by the sync and async HTTP clients"""
+        return httpx.Limits(max_keepalive_connections=20, max_connections=40, keepalive_expiry=60.0)
+    
+    def _create_http_client(self):
+        """Create a pooled HTTP client so calls reuse keep-alive TCP/TLS connections"""
+        self._http = httpx.Client(limits=self._http_limits(), timeout=30.0)
+        return self._http
+    
+    def close(self):
+        """Release pooled connections and flush the response cache"""
+        if self._http is not None:
+            self._http.close()
+            self._http = None
+        self.cache.close()
+    
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
+    
     def analyze_market_conditions(self, market_data: Dict) -> Dict:
         """Analyze current market conditions and generate trading insights"""
         if not self.client:
             return self._fallback_analysis(market_data)
-            
+        
+        cache_key = ResponseCache.make_key('analysis', market_data)
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
+        return self._inflight.do(cache_key, self._request_analysis, market_data, cache_key)
+    
+    def _request_analysis(self, market_data: Dict, cache_key: str) -> Dict:
+        """Call the model for a market analysis and cache the parsed result"""
         try:
             prompt = self._create_market_analysis_prompt(market_data)
             
             response = self.client.chat.completions.create(
-                model="gpt-4",
+                model=self.model,
                 messages=[
                     {"role": "system", "content": "You are an expert options trader and market analyst. Provide concise, actionable trading insights."},
                     {"role": "user", "content": prompt}
@@ -59,151 +434,283 @@ class AIStrategyGenerator:
             )
             
             analysis = response.choices[0].message.content
-            return self._parse_analysis(analysis, market_data)
+            result = self._parse_analysis(analysis, market_data)
+            self.cache.set(cache_key, result)
+            return result
             
         except Exception as e:
-            logger.error(f"Error in AI analysis: {e}")
+            logger.error("Error in AI analysis: %s", e)
             return self._fallback_analysis(market_data)
     
     def generate_strategy(self, symbol: str, market_data: Dict, current_price: float) -> Dict:
         """Generate a specific trading strategy for a symbol"""
         if not self.client:
             return self._fallback_strategy(symbol, market_data, current_price)
+        
+        cache_key = ResponseCache.make_key('strategy', market_data, symbol, float(current_price))
+        cached = self._get_cached_strategy(cache_key, current_price)
+        if cached is not None:
+            return cached
+        
+        return self._inflight.do(cache_key, self._request_strategy, symbol, market_data, current_price, cache_key)
+    
+    def _request_strategy(self, symbol: str, market_data: Dict, current_price: float, cache_key: str) -> Dict:
+        """Call the model for a strategy and cache the parsed result"""
+        try:
+            strategy_text = self._stream_json(**self._strategy_request(symbol, market_data, current_price))
+            strategy = self._parse_strategy(strategy_text, symbol, current_price)
+            self.cache.set(cache_key, strategy)
+            return strategy
+            
+        except Exception as e:
+            logger.error("Error generating strategy: %s", e)
+            return self._fallback_strategy(symbol, market_data, current_price)
+    
+    async def generate_strategies_bulk(self, items: List[Tuple[str, Dict, float]],
+                                       max_concurrent: int = 8) -> List[Dict]:
+        """Generate strategies for many (symbol, market_data, price) items concurrently"""
+        if not self.client:
+            return [self._fallback_strategy(s, m, p) for s, m, p in items]
+        
+        semaphore = asyncio.Semaphore(max_concurrent)
+        # Transports belong to the running loop, so the async client lives for this call only
+        async with httpx.AsyncClient(limits=self._http_limits(), timeout=30.0) as http:
+            client = openai.AsyncOpenAI(api_key=self.api_key, http_client=http)
             
+            async def bounded(symbol, market_data, current_price):
+                async with semaphore:
+                    return await self._agenerate(client, symbol, market_data, current_price)
+            
+            return list(await asyncio.gather(*[bounded(s, m, p) for s, m, p in items]))
+    
+    async def _agenerate(self, client, symbol: str, market_data: Dict, current_price: float) -> Dict:
+        """Async counterpart of generate_strategy"""
+        cache_key = ResponseCache.make_key('strategy', market_data, symbol, float(current_price))
+        cached = self._get_cached_strategy(cache_key, current_price)
+        if cached is not None:
+            return cached
+        
+        return await self._inflight.ado(cache_key, self._arequest_strategy,
+                                        client, symbol, market_data, current_price, cache_key)
+    
+    async def _arequest_strategy(self, client, symbol: str, market_data: Dict, current_price: float,
+                                 cache_key: str) -> Dict:
+        """Async counterpart of _request_strategy"""
         try:
-            prompt = self._create_strategy_prompt(symbol, market_data, current_price)
+            response = await client.chat.completions.create(
+                **self._strategy_request(symbol, market_data, current_price)
+            )
             
-            response = self.client.chat.completions.create(
-                model="gpt-4",
+            strategy_text = response.choices[0].message.content
+            strategy = self._parse_strategy(strategy_text, symbol, current_price)
+            self.cache.set(cache_key, strategy)
+            return strategy
+            
+        except Exception as e:
+            logger.error("Error generating strategy for %s: %s", symbol, e)
+            return self._fallback_strategy(symbol, market_data, current_price)
+    
+    def _strategy_request(self, symbol: str, market_data: Dict, current_price: float) -> Dict:
+        """Build chat completion arguments for strategy generation"""
+        return {
+            'model': self.model,
+            'messages': [
+                {"role": "system", "content": "You are an expert options trader. Generate specific, executable trading strategies with exact parameters."},
+                {"role": "user", "content": self._create_strategy_prompt(symbol, market_data, current_price)}
+            ],
+            # Not strict: strict mode can't express the strike/premium maps, so the reasoning
+            # maxLength is only guidance. Leave room for it; a truncated answer falls back
+            'max_tokens': 512,
+            'temperature': 0.6,
+            'response_format': {'type': 'json_schema', 'json_schema': STRATEGY_SCHEMA}
+        }
+    
+    def _stream_json(self, timeout: float = 30.0, **request) -> str:
+        """Stream a JSON completion and return it as soon as the top-level object closes"""
+        deadline = time.monotonic() + timeout
+        tracker = _JsonObjectTracker()
+        parts = []
+        stream = self.client.chat.completions.create(stream=True, **request)
+        
+        try:
+            for chunk in stream:
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content or ''
+                end = tracker.feed(delta)
+                if end >= 0:
+                    parts.append(delta[:end])
+                    break
+                parts.append(delta)
+                if time.monotonic() > deadline:
+                    raise TimeoutError(f"AI response stalled after {timeout:.0f}s")
+        finally:
+            close = getattr(stream, 'close', None)
+            if close:
+                close()
+        
+        return ''.join(parts)
+    
+    def _get_cached_strategy(self, cache_key: str, current_price: float) -> Optional[Dict]:
+        """Return a cached strategy refreshed for the current price, or None"""
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            cached['current_price'] = current_price
+            cached['generated_at'] = _isoformat_now()
+        return cached
+    
+    def _generate_recommendation(self, symbol: str, market_data: Dict, current_price: float) -> Tuple[Dict, Dict]:
+        """Generate market analysis and strategy with a single AI call"""
+        if not self.client:
+            return (self._fallback_analysis(market_data),
+                    self._fallback_strategy(symbol, market_data, current_price))
+        
+        analysis_key = ResponseCache.make_key('analysis', market_data)
+        strategy_key = ResponseCache.make_key('strategy', market_data, symbol, float(current_price))
+        market_analysis = self.cache.get(analysis_key)
+        strategy = self._get_cached_strategy(strategy_key, current_price)
+        if market_analysis is not None and strategy is not None:
+            return market_analysis, strategy
+        
+        if market_analysis is None:
+            # Keyed on the snapshot alone, so concurrent callers for other symbols share one analysis
+            flight_key = ResponseCache.make_key('recommendation', market_data)
+            market_analysis, strategies = self._inflight.do(flight_key, self._request_recommendation,
+                                                            symbol, market_data, current_price,
+                                                            analysis_key, strategy_key, strategy)
+            strategy = strategy or strategies.get(strategy_key)
+        
+        if strategy is None:
+            # The shared call answered for another symbol; only the strategy half is missing
+            strategy = self.generate_strategy(symbol, market_data, current_price)
+        
+        return market_analysis, strategy
+    
+    def _request_recommendation(self, symbol: str, market_data: Dict, current_price: float,
+                                analysis_key: str, strategy_key: str,
+                                cached_strategy: Optional[Dict]) -> Tuple[Dict, Dict]:
+        """Call the model for a combined recommendation and cache both halves (strategy keyed by cache key)"""
+        try:
+            prompt = self._create_recommendation_prompt(symbol, market_data, current_price)
+            
+            content = self._stream_json(
+                model=self.model,
                 messages=[
-                    {"role": "system", "content": "You are an expert options trader. Generate specific, executable trading strategies with exact parameters."},
+                    {"role": "system", "content": "You are an expert options trader and market analyst. Provide concise, actionable insights and specific, executable trading strategies with exact parameters."},
                     {"role": "user", "content": prompt}
                 ],
-                max_tokens=800,
-                temperature=0.6
+                max_tokens=1000,
+                temperature=0.6,
+                response_format={"type": "json_object"}
             )
             
-            strategy_text = response.choices[0].message.content
-            return self._parse_strategy(strategy_text, symbol, current_price)
+            data = json.loads(content)
+            
+            analysis_text = data.get('analysis', '')
+            if not isinstance(analysis_text, str):
+                analysis_text = json.dumps(analysis_text)
+            market_analysis = self._parse_analysis(analysis_text, market_data)
+            strategy = self._build_strategy(data['strategy'], symbol, current_price)
+            
+            self.cache.set(analysis_key, market_analysis)
+            self.cache.set(strategy_key, strategy)
+            return market_analysis, {strategy_key: strategy}
             
         except Exception as e:
-            logger.error(f"Error generating strategy: {e}")
-            return self._fallback_strategy(symbol, market_data, current_price)
+            logger.error("Error generating AI recommendation: %s", e)
+            return (self._fallback_analysis(market_data),
+                    {strategy_key: cached_strategy or self._fallback_strategy(symbol, market_data, current_price)})
     
     def _create_market_analysis_prompt(self, market_data: Dict) -> str:
         """Create prompt for market analysis"""
-        prompt = f"""
-        Analyze the current market conditions and provide trading insights:
-        
-        Market Data:
-        - VIX: {market_data.get('vix', 'N/A')}
-        - SPY Price: {market_data.get('spy_price', 'N/A')}
-        - Market Trend: {market_data.get('trend', 'N/A')}
-        - Volatility: {market_data.get('volatility', 'N/A')}
-        - Time of Day: {market_data.get('time_of_day', 'N/A')}
-        
-        Provide:
-        1. Market sentiment (Bullish/Bearish/Neutral)
-        2. Recommended strategy types (Iron Condor, Straddle, etc.)
-        3. Risk level (Low/Medium/High)
-        4. Key factors to watch
-        """
-        return prompt
+        return self._fit_prompt(_MARKET_ANALYSIS_TEMPLATE, self._prompt_params(market_data),
+                                _ANALYSIS_TOKEN_BUDGET)
     
     def _create_strategy_prompt(self, symbol: str, market_data: Dict, current_price: float) -> str:
         """Create prompt for strategy generation"""
-        prompt = f"""
-        Generate a specific options trading strategy for {symbol}:
-        
-        Current Price: ${current_price:.2f}
-        Market Conditions:
-        - VIX: {market_data.get('vix', 'N/A')}
-        - Trend: {market_data.get('trend', 'N/A')}
-        - Volatility: {market_data.get('volatility', 'N/A')}
-        
-        Provide a JSON response with:
-        {{
-            "strategy_type": "Iron Condor|Straddle|Strangle|Call Spread|Put Spread",
-            "reasoning": "Why this strategy",
-            "parameters": {{
-                "expiration_days": 30,
-                "strikes": {{}},
-                "premiums": {{}},
-                "max_profit": 0,
-                "max_loss": 0,
-                "probability_of_profit": 0.0
-            }},
-            "risk_level": "Low|Medium|High",
-            "confidence": 0.0
-        }}
-        """
+        return self._fit_prompt(_STRATEGY_TEMPLATE, self._prompt_params(market_data, symbol, current_price),
+                                _STRATEGY_TOKEN_BUDGET)
+    
+    def _create_recommendation_prompt(self, symbol: str, market_data: Dict, current_price: float) -> str:
+        """Create a combined prompt for market analysis and strategy generation"""
+        return self._fit_prompt(_RECOMMENDATION_TEMPLATE, self._prompt_params(market_data, symbol, current_price),
+                                _ANALYSIS_TOKEN_BUDGET + _STRATEGY_TOKEN_BUDGET)
+    
+    def _fit_prompt(self, template: str, params: Dict, budget: int) -> str:
+        """Fill a template, dropping low-priority fields until it fits the token budget"""
+        prompt = template.format_map(params)
+        for field in _PROMPT_DROP_ORDER:
+            if _count_tokens(prompt, self.model) <= budget:
+                break
+            if '{' + field + '}' not in template:
+                continue
+            logger.warning("Prompt over %d tokens, dropping '%s'", budget, field)
+            params[field] = 'N/A'
+            prompt = template.format_map(params)
         return prompt
     
-    def _parse_analysis(self, analysis: str, market_data: Dict) -> Dict:
-        """Parse AI analysis response"""
+    def _prompt_params(self, market_data: Dict, symbol: str = '', current_price: float = 0.0) -> Dict:
+        """Collect the fields substituted into the prompt templates"""
         return {
-            'sentiment': self._extract_sentiment(analysis),
-            'recommended_strategies': self._extract_strategies(analysis),
-            'risk_level': self._extract_risk_level(analysis),
-            'key_factors': self._extract_factors(analysis),
-            'raw_analysis': analysis
+            'symbol': symbol,
+            'current_price': current_price,
+            'vix': market_data.get('vix', 'N/A'),
+            'spy_price': market_data.get('spy_price', 'N/A'),
+            'trend': market_data.get('trend', 'N/A'),
+            'volatility': market_data.get('volatility', 'N/A'),
+            'time_of_day': market_data.get('time_of_day', 'N/A')
         }
     
+    def _parse_analysis(self, analysis: str, market_data: Dict) -> Dict:
+        """Parse AI analysis response"""
+        parsed = self._extract_all(analysis)
+        parsed['key_factors'] = self._extract_factors(analysis)
+        parsed['raw_analysis'] = analysis
+        return parsed
+    
     def _parse_strategy(self, strategy_text: str, symbol: str, current_price: float) -> Dict:
         """Parse AI strategy response"""
         try:
-            # Try to extract JSON from response
-            import re
-            json_match = re.search(r'\{.*\}', strategy_text, re.DOTALL)
-            if json_match:
-                strategy_data = json.loads(json_match.group())
-                strategy_data['symbol'] = symbol
-                strategy_data['current_price'] = current_price
-                strategy_data['generated_at'] = datetime.now().isoformat()
-                return strategy_data
-        except:
+            # Structured output mode guarantees a bare JSON body
+            return self._build_strategy(json.loads(strategy_text), symbol, current_price)
+        except (TypeError, ValueError):
             pass
         
         # Fallback parsing
         return self._fallback_strategy(symbol, {}, current_price)
     
-    def _extract_sentiment(self, text: str) -> str:
-        """Extract market sentiment from text"""
-        text_lower = text.lower()
-        if 'bullish' in text_lower:
-            return 'Bullish'
-        elif 'bearish' in text_lower:
-            return 'Bearish'
-        else:
-            return 'Neutral'
+    def _build_strategy(self, strategy_data: Dict, symbol: str, current_price: float) -> Dict:
+        """Attach symbol and pricing context to a parsed strategy"""
+        strategy_data['symbol'] = symbol
+        strategy_data['current_price'] = current_price
+        strategy_data['generated_at'] = _isoformat_now()
+        return strategy_data
     
-    def _extract_strategies(self, text: str) -> List[str]:
-        """Extract recommended strategies from text"""
-        strategies = []
-        text_lower = text.lower()
+    def _extract_all(self, text: str) -> Dict:
+        """Extract sentiment, recommended strategies and risk level from text"""
+        found = _scan_keywords(text.lower())
         
-        if 'iron condor' in text_lower:
-            strategies.append('Iron Condor')
-        if 'straddle' in text_lower:
-            strategies.append('Straddle')
-        if 'strangle' in text_lower:
-            strategies.append('Strangle')
-        if 'call spread' in text_lower:
-            strategies.append('Call Spread')
-        if 'put spread' in text_lower:
-            strategies.append('Put Spread')
-            
-        return strategies if strategies else ['Iron Condor']
-    
-    def _extract_risk_level(self, text: str) -> str:
-        """Extract risk level from text"""
-        text_lower = text.lower()
-        if 'high risk' in text_lower or 'high' in text_lower:
-            return 'High'
-        elif 'low risk' in text_lower or 'low' in text_lower:
-            return 'Low'
+        if ('sentiment', 'Bullish') in found:
+            sentiment = 'Bullish'
+        elif ('sentiment', 'Bearish') in found:
+            sentiment = 'Bearish'
         else:
-            return 'Medium'
+            sentiment = 'Neutral'
+        
+        strategies = [name for name in _STRATEGY_ORDER if ('strategy', name) in found]
+        
+        if ('risk', 'High') in found:
+            risk_level = 'High'
+        elif ('risk', 'Low') in found:
+            risk_level = 'Low'
+        else:
+            risk_level = 'Medium'
+        
+        return {
+            'sentiment': sentiment,
+            'recommended_strategies': strategies if strategies else ['Iron Condor'],
+            'risk_level': risk_level
+        }
     
     def _extract_factors(self, text: str) -> List[str]:
         """Extract key factors from text"""
@@ -220,22 +727,12 @@ class AIStrategyGenerator:
         """Fallback analysis when AI is not available"""
         vix = market_data.get('vix', 20)
         
-        if vix > 30:
-            sentiment = 'Bearish'
-            strategies = ['Iron Condor', 'Put Spread']
-            risk_level = 'High'
-        elif vix < 15:
-            sentiment = 'Bullish'
-            strategies = ['Call Spread', 'Straddle']
-            risk_level = 'Low'
-        else:
-            sentiment = 'Neutral'
-            strategies = ['Iron Condor', 'Strangle']
-            risk_level = 'Medium'
+        # Index 0: VIX < 15, 1: 15 <= VIX <= 30, 2: VIX > 30
+        sentiment, strategies, risk_level = _FALLBACK_ANALYSIS_TABLE[(vix >= 15) + (vix > 30)]
         
         return {
             'sentiment': sentiment,
-            'recommended_strategies': strategies,
+            'recommended_strategies': list(strategies),
             'risk_level': risk_level,
             'key_factors': ['VIX level', 'Market volatility', 'Trend direction'],
             'raw_analysis': f'Fallback analysis: {sentiment} market with {risk_level} risk'
@@ -245,27 +742,10 @@ class AIStrategyGenerator:
         """Fallback strategy when AI is not available"""
         vix = market_data.get('vix', 20)
         
-        if vix > 25:
-            # High volatility - use Iron Condor
-            strategy_type = 'Iron Condor'
-            expiration_days = 30
-            strikes = {
-                'short_call': current_price * 1.05,
-                'long_call': current_price * 1.10,
-                'short_put': current_price * 0.95,
-                'long_put': current_price * 0.90
-            }
-            max_profit = 2.0
-            max_loss = 3.0
-        else:
-            # Low volatility - use Straddle
-            strategy_type = 'Straddle'
-            expiration_days = 21
-            strikes = {
-                'strike': current_price
-            }
-            max_profit = float('inf')
-            max_loss = 15.0
+        # High volatility uses an Iron Condor, low volatility a Straddle
+        strategy_type, expiration_days, strike_multipliers, max_profit, max_loss = \
+            _FALLBACK_STRATEGY_TABLE[vix > 25]
+        strikes = {name: current_price * mult for name, mult in strike_multipliers}
         
         return {
             'symbol': symbol,
@@ -281,25 +761,26 @@ class AIStrategyGenerator:
             },
             'risk_level': 'Medium',
             'confidence': 0.5,
-            'generated_at': datetime.now().isoformat()
+            'generated_at': _isoformat_now()
         }
     
     def get_strategy_recommendation(self, symbol: str, market_data: Dict, current_price: float) -> Dict:
         """Get a complete strategy recommendation"""
-        # First analyze market conditions
-        market_analysis = self.analyze_market_conditions(market_data)
-        
-        # Then generate specific strategy
-        strategy = self.generate_strategy(symbol, market_data, current_price)
+        # Analyze market conditions and generate the strategy in one AI call
+        market_analysis, strategy = self._generate_recommendation(symbol, market_data, current_price)
         
         # Combine results
         recommendation = {
             'market_analysis': market_analysis,
             'strategy': strategy,
-            'timestamp': datetime.now().isoformat()
+            'timestamp': _isoformat_now()
         }
         
-        # Store in history
-        self.strategy_history.append(recommendation)
+        # Store in history without the raw AI text
+        self.strategy_history.append({
+            'market_analysis': {k: v for k, v in market_analysis.items() if k != 'raw_analysis'},
+            'strategy': strategy,
+            'timestamp': recommendation['timestamp']
+        })
         
         return recommendation
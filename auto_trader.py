@@ -7,7 +7,9 @@ Self-executing trading system with AI strategy generation
 import sys
 import os
 import argparse
-import time
+import asyncio
+import signal
+import threading
 from datetime import datetime
 import logging
 
@@ -29,6 +31,9 @@ except ImportError as e:
     logger.error(f"Error importing automated trader: {e}")
     AUTOMATED_TRADER_AVAILABLE = False
 
+# Set by the SIGINT handler to interrupt the startup wait and the trading loop
+stop_event = threading.Event()
+
 
 def main():
     """Main entry point for automated trading system"""
@@ -71,14 +76,26 @@ def main():
         if args.config:
             load_configuration(trader, args.config)
         
+        # Stop cleanly on Ctrl+C instead of unwinding through KeyboardInterrupt
+        def handle_sigint(signum, frame):
+            stop_event.set()
+            trader.stop_trading()
+        
+        signal.signal(signal.SIGINT, handle_sigint)
+        
         # Display startup information
         display_startup_info(trader, args)
         
         # Start trading
-        logger.info("🚀 Starting automated trading system...")
-        logger.info("   Press Ctrl+C to stop")
+        if not stop_event.is_set():
+            logger.info("🚀 Starting automated trading system...")
+            logger.info("   Press Ctrl+C to stop")
+            
+            asyncio.run(trader.run())
         
-        trader.start_trading()
+        logger.info("🛑 Stopping automated trading system...")
+        display_final_report(trader)
+        return 0
         
     except KeyboardInterrupt:
         logger.info("🛑 Stopping automated trading system...")
@@ -113,7 +130,7 @@ def display_startup_info(trader, args):
     print("   • Log all activities to trading.log")
     print("="*60)
     print("🚀 Starting in 5 seconds...")
-    time.sleep(5)
+    stop_event.wait(timeout=5)
 
 
 def display_final_report(trader):
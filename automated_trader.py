@@ -2,12 +2,20 @@
 Automated Trading Engine with AI Strategy Generation
 """
 
-import time
+import asyncio
+import io
+import itertools
+import random
+import signal
+import sys
 import threading
+import time
 from datetime import datetime, timedelta, date
-from typing import Dict, List, Optional
+from typing import ClassVar, Dict, List, Optional, Tuple
 import logging
 import json
+from collections import deque
+from dataclasses import dataclass, asdict
 
 from options_models import IronCondor, Straddle, Strangle, CallSpread, PutSpread
 from trading_engine import TradingEngine
@@ -18,10 +26,64 @@ from ai_strategy_generator import AIStrategyGenerator
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+_TRENDS = ('Bullish', 'Bearish', 'Neutral')
+TS_FMT = '%Y-%m-%d %H:%M:%S'
+
+
+@dataclass(slots=True)
+class PerfMetrics:
+    """Running performance counters for the trader"""
+    total_trades: int = 0
+    winning_trades: int = 0
+    losing_trades: int = 0
+    total_pnl: float = 0.0
+    max_drawdown: float = 0.0
+    sharpe_ratio: float = 0.0
+
+
+@dataclass(slots=True)
+class TradeRecord:
+    """One executed AI strategy in the trade log"""
+    timestamp: datetime
+    symbol: str
+    strategy_type: str
+    reasoning: str
+    risk_level: str
+    confidence: float
+    parameters: dict
+    
+    def to_dict(self) -> Dict:
+        """Plain dict form used by reports"""
+        record = asdict(self)
+        record['timestamp'] = self.timestamp.isoformat()
+        return record
+    
+    def to_json(self) -> bytes:
+        """Serialize for persistence, using orjson when installed"""
+        if ORJSON_AVAILABLE:
+            return orjson.dumps(self, option=orjson.OPT_SERIALIZE_DATACLASS | orjson.OPT_NAIVE_UTC)
+        return json.dumps(self.to_dict(), default=str).encode()
+
 
 class AutomatedTrader:
     """Automated trading engine that monitors markets and executes trades"""
     
+    # Simulated base prices for the monitored symbols
+    _BASE_PRICES: ClassVar[Dict[str, float]] = {
+        'SPY': 425.0,
+        'QQQ': 380.0,
+        'AAPL': 150.0,
+        'TSLA': 200.0,
+        'MSFT': 300.0,
+        'GOOGL': 140.0
+    }
+    
     def __init__(self, api_key: Optional[str] = None, initial_capital: float = 10000.0):
         self.trading_engine = TradingEngine()
         self.analyzer = StrategyAnalyzer()
@@ -31,7 +93,13 @@ class AutomatedTrader:
         self.trading_interval = 1800  # 30 minutes
         self.symbols_to_monitor = ['SPY', 'QQQ', 'AAPL', 'TSLA', 'MSFT', 'GOOGL']
         self.max_positions = 5
+        self.max_concurrent = 4  # Concurrent AI requests per trading tick
         self.risk_per_trade = 0.02  # 2%
+        self._loop = None
+        self._stop_event = None
+        self._rng = random.Random()  # Simulation RNG, one instance for the trader
+        self._snapshot_lock = threading.Lock()
+        self._market_snapshot: Dict = {}  # Latest market data from the monitoring loop
         
         # Set up trading engine
         from trading_engine import SimulationConfig
@@ -45,104 +113,161 @@ class AutomatedTrader:
         self.trading_engine.set_config(config)
         
         # Trading history
-        self.trade_log = []
-        self.performance_metrics = {
-            'total_trades': 0,
-            'winning_trades': 0,
-            'losing_trades': 0,
-            'total_pnl': 0.0,
-            'max_drawdown': 0.0,
-            'sharpe_ratio': 0.0
-        }
+        self.trade_log = deque(maxlen=1000)  # Bounded so long runs don't grow memory
+        self.performance_metrics = PerfMetrics()
         
     def start_trading(self):
         """Start the automated trading system"""
+        asyncio.run(self.run())
+    
+    async def run(self):
+        """Run the trading system on one asyncio event loop with a task per symbol"""
         logger.info("🚀 Starting Automated Trading System")
         self.running = True
-        
-        # Start monitoring thread
-        monitor_thread = threading.Thread(target=self._monitoring_loop, daemon=True)
-        monitor_thread.start()
-        
-        # Start trading thread
-        trading_thread = threading.Thread(target=self._trading_loop, daemon=True)
-        trading_thread.start()
-        
-        # Start dashboard thread
-        dashboard_thread = threading.Thread(target=self._dashboard_loop, daemon=True)
-        dashboard_thread.start()
+        self._loop = asyncio.get_running_loop()
+        self._stop_event = asyncio.Event()
+        previous_sigint = signal.getsignal(signal.SIGINT)
+        signal_installed = self._install_signal_handler()
         
         try:
-            while self.running:
-                time.sleep(1)
-        except KeyboardInterrupt:
-            logger.info("🛑 Stopping Automated Trading System")
+            await asyncio.gather(
+                self._monitoring_loop(),
+                self._trading_loop(),
+                self._dashboard_loop()
+            )
+        finally:
+            if signal_installed:
+                self._loop.remove_signal_handler(signal.SIGINT)
+                # That resets SIGINT to the default; put back the caller's handler (auto_trader's)
+                if previous_sigint is not None:
+                    signal.signal(signal.SIGINT, previous_sigint)
             self.running = False
+            self._loop = None
     
-    def _monitoring_loop(self):
+    def _install_signal_handler(self) -> bool:
+        """Route Ctrl+C to the stop event; only possible from the main thread on Unix"""
+        try:
+            self._loop.add_signal_handler(signal.SIGINT, self.stop_trading)
+            return True
+        except (NotImplementedError, RuntimeError, ValueError):
+            return False
+    
+    async def _wait(self, seconds: float) -> bool:
+        """Sleep until the interval elapses or a stop is requested; True if stopping"""
+        try:
+            await asyncio.wait_for(self._stop_event.wait(), timeout=seconds)
+        except asyncio.TimeoutError:
+            pass
+        return self._stop_event.is_set()
+    
+    @staticmethod
+    def _next_tick(next_tick: float, interval: float) -> Tuple[float, float]:
+        """Advance a fixed-cadence schedule so work time doesn't add drift; resets after an overrun"""
+        next_tick += interval
+        delay = next_tick - time.monotonic()
+        if delay <= 0:
+            return time.monotonic(), 0.0
+        return next_tick, delay
+    
+    async def _monitoring_loop(self):
         """Monitor market conditions and update data"""
-        while self.running:
+        next_tick = time.monotonic()
+        while not self._stop_event.is_set():
             try:
                 logger.info("📊 Monitoring market conditions...")
-                
-                # Get market data
-                market_data = self._get_market_data()
-                
-                # Log market status
-                self._log_market_status(market_data)
-                
-                time.sleep(self.monitoring_interval)
-                
+                self._log_market_status(self._refresh_market_snapshot())
+                interval = self.monitoring_interval
             except Exception as e:
-                logger.error(f"Error in monitoring loop: {e}")
-                time.sleep(60)  # Wait 1 minute before retrying
+                logger.error("Error in monitoring loop: %s", e)
+                interval = 60  # Wait 1 minute before retrying
+            next_tick, delay = self._next_tick(next_tick, interval)
+            if await self._wait(delay):
+                break
     
-    def _trading_loop(self):
-        """Main trading loop that generates and executes strategies"""
-        while self.running:
+    async def _trading_loop(self):
+        """Generate strategies for every candidate symbol concurrently, then execute them"""
+        next_tick = time.monotonic()
+        while not self._stop_event.is_set():
             try:
                 logger.info("🤖 AI Strategy Generation and Execution")
+                market_data = self._get_market_snapshot()
                 
-                # Get current market data
-                market_data = self._get_market_data()
-                
-                # Check if we should trade
                 if self._should_trade():
-                    # Generate AI strategy
-                    strategy_recommendation = self._generate_ai_strategy(market_data)
+                    free_slots = self.max_positions - len(self.trading_engine.positions)
+                    candidates = self._select_trading_symbols(free_slots)
                     
-                    if strategy_recommendation:
-                        # Execute the strategy
-                        self._execute_strategy(strategy_recommendation)
-                
-                time.sleep(self.trading_interval)
-                
+                    recommendations = await self._recommend(candidates, market_data)
+                    self._analyze_and_execute(recommendations)
+                interval = self.trading_interval
             except Exception as e:
-                logger.error(f"Error in trading loop: {e}")
-                time.sleep(300)  # Wait 5 minutes before retrying
+                logger.error("Error in trading loop: %s", e)
+                interval = 300  # Wait 5 minutes before retrying
+            next_tick, delay = self._next_tick(next_tick, interval)
+            if await self._wait(delay):
+                break
     
-    def _dashboard_loop(self):
-        """Display real-time dashboard"""
-        while self.running:
+    async def _recommend(self, symbols: List[str], market_data: Dict) -> List[Dict]:
+        """One market analysis for the tick, then every symbol's strategy over the async client"""
+        if not symbols:
+            return []
+        items = [(symbol, market_data, self._get_symbol_price(symbol)) for symbol in symbols]
+        # The blocking analysis call runs off-loop; the strategies overlap up to max_concurrent
+        market_analysis = await asyncio.to_thread(self.ai_generator.analyze_market_conditions, market_data)
+        strategies = await self.ai_generator.generate_strategies_bulk(items, self.max_concurrent)
+        
+        recommendations = []
+        for (symbol, _, current_price), strategy in zip(items, strategies):
+            logger.info("🎯 AI Strategy Generated for %s", symbol)
+            logger.info("   Strategy: %s", strategy['strategy_type'])
+            recommendations.append({
+                'market_analysis': market_analysis,
+                'strategy': strategy,
+                'current_price': current_price
+            })
+        return recommendations
+    
+    def _analyze_and_execute(self, recommendations: List[Dict]):
+        """Analyze the tick's strategies, then execute them"""
+        pending = []
+        for recommendation in recommendations:
+            strategy = recommendation['strategy']
+            strategy_obj = self._create_strategy_object(
+                strategy['symbol'], strategy['strategy_type'], strategy['parameters'],
+                current_price=recommendation['current_price']
+            )
+            if strategy_obj:
+                pending.append((recommendation, strategy_obj))
+        
+        # A handful of strategies per tick: analyzing inline is cheaper than
+        # shipping them to worker processes, and leaves no pool to fork or shut down
+        for recommendation, strategy_obj in pending:
             try:
-                self._display_dashboard()
-                time.sleep(10)  # Update every 10 seconds
+                analysis = self.analyzer.analyze_strategy(strategy_obj)
+                logger.info("🔍 %s analysis: %s, EV $%.2f", strategy_obj.symbol,
+                            analysis['recommendation'], analysis['expected_value'])
             except Exception as e:
-                logger.error(f"Error in dashboard loop: {e}")
-                time.sleep(10)
+                logger.error("Error analyzing %s: %s", strategy_obj.symbol, e)
+            self._execute_strategy(recommendation, strategy_obj)
+    
+    async def _dashboard_loop(self):
+        """Display real-time dashboard"""
+        next_tick = time.monotonic()
+        while not self._stop_event.is_set():
+            self._display_dashboard()
+            next_tick, delay = self._next_tick(next_tick, 10)  # Update every 10 seconds
+            if await self._wait(delay):
+                break
     
     def _get_market_data(self) -> Dict:
         """Get current market data"""
         try:
             # This would normally fetch real data
             # For now, we'll simulate market data
-            import random
-            
             market_data = {
-                'vix': random.uniform(15, 35),
-                'spy_price': random.uniform(400, 450),
-                'trend': random.choice(['Bullish', 'Bearish', 'Neutral']),
-                'volatility': random.uniform(0.15, 0.35),
+                'vix': self._rng.uniform(15, 35),
+                'spy_price': self._rng.uniform(400, 450),
+                'trend': self._rng.choice(_TRENDS),
+                'volatility': self._rng.uniform(0.15, 0.35),
                 'time_of_day': datetime.now().strftime('%H:%M'),
                 'market_open': True
             }
@@ -150,7 +275,7 @@ class AutomatedTrader:
             return market_data
             
         except Exception as e:
-            logger.error(f"Error getting market data: {e}")
+            logger.error("Error getting market data: %s", e)
             return {
                 'vix': 20,
                 'spy_price': 425,
@@ -160,6 +285,19 @@ class AutomatedTrader:
                 'market_open': True
             }
     
+    def _refresh_market_snapshot(self) -> Dict:
+        """Fetch market data once and publish it for the other loops"""
+        market_data = self._get_market_data()
+        with self._snapshot_lock:
+            self._market_snapshot = market_data
+        return market_data
+    
+    def _get_market_snapshot(self) -> Dict:
+        """Copy of the latest market data, fetching it if nothing has been published yet"""
+        with self._snapshot_lock:
+            snapshot = self._market_snapshot.copy()
+        return snapshot or self._refresh_market_snapshot()
+    
     def _should_trade(self) -> bool:
         """Determine if we should generate new trades"""
         # Check if we have room for more positions
@@ -174,67 +312,31 @@ class AutomatedTrader:
         
         return True
     
-    def _generate_ai_strategy(self, market_data: Dict) -> Optional[Dict]:
-        """Generate AI strategy recommendation"""
-        try:
-            # Select a symbol to trade
-            symbol = self._select_trading_symbol()
-            if not symbol:
-                return None
-            
-            # Get current price (simulated)
-            current_price = self._get_symbol_price(symbol)
-            
-            # Generate AI recommendation
-            recommendation = self.ai_generator.get_strategy_recommendation(
-                symbol, market_data, current_price
-            )
-            
-            logger.info(f"🎯 AI Strategy Generated for {symbol}")
-            logger.info(f"   Strategy: {recommendation['strategy']['strategy_type']}")
-            logger.info(f"   Reasoning: {recommendation['strategy']['reasoning']}")
-            logger.info(f"   Risk Level: {recommendation['strategy']['risk_level']}")
-            
-            return recommendation
-            
-        except Exception as e:
-            logger.error(f"Error generating AI strategy: {e}")
-            return None
-    
     def _select_trading_symbol(self) -> Optional[str]:
         """Select a symbol to trade based on current positions"""
+        symbols = self._select_trading_symbols(1)
+        return symbols[0] if symbols else None
+    
+    def _select_trading_symbols(self, needed: int) -> List[str]:
+        """Pick up to needed distinct symbols without open positions in one draw"""
         # Avoid symbols we already have positions in
-        current_symbols = [pos.symbol for pos in self.trading_engine.positions]
-        
+        current_symbols = {pos.symbol for pos in self.trading_engine.positions}
         available_symbols = [s for s in self.symbols_to_monitor if s not in current_symbols]
         
-        if available_symbols:
-            import random
-            return random.choice(available_symbols)
-        
-        return None
+        if not available_symbols or needed <= 0:
+            return []
+        return self._rng.sample(available_symbols, min(needed, len(available_symbols)))
     
     def _get_symbol_price(self, symbol: str) -> float:
         """Get current price for a symbol (simulated)"""
         # This would normally fetch real price data
-        import random
-        
-        base_prices = {
-            'SPY': 425,
-            'QQQ': 380,
-            'AAPL': 150,
-            'TSLA': 200,
-            'MSFT': 300,
-            'GOOGL': 140
-        }
-        
-        base_price = base_prices.get(symbol, 100)
+        base_price = self._BASE_PRICES.get(symbol, 100.0)
         # Add some random movement
-        price = base_price * (1 + random.uniform(-0.02, 0.02))
+        price = base_price * (1 + self._rng.uniform(-0.02, 0.02))
         
         return round(price, 2)
     
-    def _execute_strategy(self, recommendation: Dict):
+    def _execute_strategy(self, recommendation: Dict, strategy_obj=None):
         """Execute the AI-recommended strategy"""
         try:
             strategy = recommendation['strategy']
@@ -242,38 +344,38 @@ class AutomatedTrader:
             strategy_type = strategy['strategy_type']
             parameters = strategy['parameters']
             
-            # Create the strategy object
-            strategy_obj = self._create_strategy_object(
-                symbol, strategy_type, parameters
-            )
+            # Create the strategy object unless the caller already built it
+            if strategy_obj is None:
+                strategy_obj = self._create_strategy_object(
+                    symbol, strategy_type, parameters,
+                    current_price=recommendation['current_price']
+                )
             
             if strategy_obj:
                 # Add to trading engine
                 self.trading_engine.add_strategy(strategy_obj)
                 
                 # Log the trade
-                trade_log = {
-                    'timestamp': datetime.now().isoformat(),
-                    'symbol': symbol,
-                    'strategy_type': strategy_type,
-                    'reasoning': strategy['reasoning'],
-                    'risk_level': strategy['risk_level'],
-                    'confidence': strategy.get('confidence', 0.5),
-                    'parameters': parameters
-                }
-                
-                self.trade_log.append(trade_log)
-                self.performance_metrics['total_trades'] += 1
+                self.trade_log.append(TradeRecord(
+                    timestamp=datetime.now(),
+                    symbol=symbol,
+                    strategy_type=strategy_type,
+                    reasoning=strategy['reasoning'],
+                    risk_level=strategy['risk_level'],
+                    confidence=strategy.get('confidence', 0.5),
+                    parameters=parameters
+                ))
+                self.performance_metrics.total_trades += 1
                 
-                logger.info(f"✅ Strategy Executed: {symbol} {strategy_type}")
+                logger.info("✅ Strategy Executed: %s %s", symbol, strategy_type)
                 
         except Exception as e:
-            logger.error(f"Error executing strategy: {e}")
+            logger.error("Error executing strategy: %s", e)
     
-    def _create_strategy_object(self, symbol: str, strategy_type: str, parameters: Dict):
-        """Create a strategy object from AI parameters"""
+    def _create_strategy_object(self, symbol: str, strategy_type: str, parameters: Dict,
+                                current_price: float):
+        """Create a strategy object from AI parameters at the price the AI was given"""
         try:
-            current_price = self._get_symbol_price(symbol)
             expiration = date.today() + timedelta(days=parameters.get('expiration_days', 30))
             
             if strategy_type == 'Iron Condor':
@@ -315,79 +417,91 @@ class AutomatedTrader:
             # Add more strategy types as needed
             
         except Exception as e:
-            logger.error(f"Error creating strategy object: {e}")
+            logger.error("Error creating strategy object: %s", e)
             return None
     
     def _display_dashboard(self):
         """Display real-time trading dashboard"""
         try:
+            now = datetime.now()
+            buf = io.StringIO()
+            write = buf.write
+            
             # Clear screen (works on most terminals)
-            print('\033[2J\033[H', end='')
+            write('\033[2J\033[H')
             
-            print("🤖 AUTOMATED OPTIONS TRADING SYSTEM")
-            print("=" * 60)
-            print(f"⏰ Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-            print(f"🔄 Status: {'RUNNING' if self.running else 'STOPPED'}")
-            print()
+            write("🤖 AUTOMATED OPTIONS TRADING SYSTEM\n")
+            write("=" * 60 + "\n")
+            write(f"⏰ Time: {now.strftime(TS_FMT)}\n")
+            write(f"🔄 Status: {'RUNNING' if self.running else 'STOPPED'}\n\n")
             
             # Portfolio Summary
             portfolio = self.trading_engine.get_portfolio()
-            print("💰 PORTFOLIO SUMMARY")
-            print(f"   Cash: ${portfolio['cash']:,.2f}")
-            print(f"   Total Value: ${portfolio['total_value']:,.2f}")
-            print(f"   Open Positions: {len(portfolio['positions'])}")
-            print()
+            write("💰 PORTFOLIO SUMMARY\n")
+            write(f"   Cash: ${portfolio['cash']:,.2f}\n")
+            write(f"   Total Value: ${portfolio['total_value']:,.2f}\n")
+            write(f"   Open Positions: {len(portfolio['positions'])}\n\n")
             
             # Performance Metrics
-            print("📊 PERFORMANCE METRICS")
-            print(f"   Total Trades: {self.performance_metrics['total_trades']}")
-            print(f"   Winning Trades: {self.performance_metrics['winning_trades']}")
-            print(f"   Losing Trades: {self.performance_metrics['losing_trades']}")
-            print(f"   Total P&L: ${self.performance_metrics['total_pnl']:,.2f}")
-            print()
+            write("📊 PERFORMANCE METRICS\n")
+            write(f"   Total Trades: {self.performance_metrics.total_trades}\n")
+            write(f"   Winning Trades: {self.performance_metrics.winning_trades}\n")
+            write(f"   Losing Trades: {self.performance_metrics.losing_trades}\n")
+            write(f"   Total P&L: ${self.performance_metrics.total_pnl:,.2f}\n\n")
             
             # Current Positions
             if portfolio['positions']:
-                print("📈 CURRENT POSITIONS")
+                write("📈 CURRENT POSITIONS\n")
                 for i, position in enumerate(portfolio['positions'][:5], 1):
-                    print(f"   {i}. {position['symbol']} - {position['strategy_type']}")
-                    print(f"      P&L: ${position['unrealized_pnl']:,.2f}")
-                print()
+                    write(f"   {i}. {position['symbol']} - {position['strategy_type']}\n")
+                    write(f"      P&L: ${position['unrealized_pnl']:,.2f}\n")
+                write("\n")
             
             # Recent Trades
             if self.trade_log:
-                print("📋 RECENT AI STRATEGIES")
-                for trade in self.trade_log[-3:]:
-                    print(f"   {trade['symbol']} - {trade['strategy_type']}")
-                    print(f"      Risk: {trade['risk_level']} | Confidence: {trade['confidence']:.1%}")
-                    print(f"      {trade['reasoning'][:50]}...")
-                print()
+                write("📋 RECENT AI STRATEGIES\n")
+                recent = list(itertools.islice(reversed(self.trade_log), 3))
+                for trade in reversed(recent):
+                    write(f"   {trade.symbol} - {trade.strategy_type}\n")
+                    write(f"      Risk: {trade.risk_level} | Confidence: {trade.confidence:.1%}\n")
+                    write(f"      {trade.reasoning[:50]}...\n")
+                write("\n")
             
-            # Market Data
-            market_data = self._get_market_data()
-            print("🌐 MARKET CONDITIONS")
-            print(f"   VIX: {market_data['vix']:.1f}")
-            print(f"   SPY: ${market_data['spy_price']:.2f}")
-            print(f"   Trend: {market_data['trend']}")
-            print(f"   Volatility: {market_data['volatility']:.1%}")
-            print()
+            # Market Data (the monitoring loop's snapshot, not a fresh fetch)
+            market_data = self._get_market_snapshot()
+            write("🌐 MARKET CONDITIONS\n")
+            write(f"   VIX: {market_data['vix']:.1f}\n")
+            write(f"   SPY: ${market_data['spy_price']:.2f}\n")
+            write(f"   Trend: {market_data['trend']}\n")
+            write(f"   Volatility: {market_data['volatility']:.1%}\n\n")
             
-            print("Press Ctrl+C to stop...")
+            write("Press Ctrl+C to stop...\n")
+            
+            # One write per refresh instead of a print per line
+            sys.stdout.write(buf.getvalue())
+            sys.stdout.flush()
             
         except Exception as e:
-            logger.error(f"Error displaying dashboard: {e}")
+            logger.error("Error displaying dashboard: %s", e)
     
     def _log_market_status(self, market_data: Dict):
         """Log current market status"""
-        logger.info(f"📊 Market Status - VIX: {market_data['vix']:.1f}, "
-                   f"SPY: ${market_data['spy_price']:.2f}, "
-                   f"Trend: {market_data['trend']}")
+        logger.info("📊 Market Status - VIX: %.1f, SPY: $%.2f, Trend: %s",
+                    market_data['vix'], market_data['spy_price'], market_data['trend'])
     
     def stop_trading(self):
         """Stop the automated trading system"""
         self.running = False
+        if self._loop is not None and self._stop_event is not None:
+            self._loop.call_soon_threadsafe(self._stop_event.set)
         logger.info("🛑 Automated trading system stopped")
     
+    def save_trade_log(self, path: str):
+        """Write the trade log as JSON Lines"""
+        with open(path, 'wb') as f:
+            for record in self.trade_log:
+                f.write(record.to_json() + b'\n')
+    
     def get_performance_report(self) -> Dict:
         """Get detailed performance report"""
         portfolio = self.trading_engine.get_portfolio()
@@ -398,13 +512,13 @@ class AutomatedTrader:
             winning_trades = [t for t in trade_history if t['pnl'] > 0]
             losing_trades = [t for t in trade_history if t['pnl'] < 0]
             
-            self.performance_metrics['winning_trades'] = len(winning_trades)
-            self.performance_metrics['losing_trades'] = len(losing_trades)
-            self.performance_metrics['total_pnl'] = sum(t['pnl'] for t in trade_history)
+            self.performance_metrics.winning_trades = len(winning_trades)
+            self.performance_metrics.losing_trades = len(losing_trades)
+            self.performance_metrics.total_pnl = sum(t['pnl'] for t in trade_history)
         
         return {
             'portfolio': portfolio,
-            'performance_metrics': self.performance_metrics,
-            'trade_log': self.trade_log,
+            'performance_metrics': asdict(self.performance_metrics),
+            'trade_log': [record.to_dict() for record in self.trade_log],
             'trade_history': trade_history
         }
@@ -2,8 +2,15 @@
 Data fetcher for live options and stock data using Yahoo Finance
 """
 
+import asyncio
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import requests
 import yfinance as yf
 import pandas as pd
+from cachetools import TTLCache
 from datetime import datetime, date, timedelta
 from typing import List, Dict, Optional, Tuple
 import time
@@ -13,18 +20,210 @@ import logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    AIOHTTP_AVAILABLE = False
+
+# The v8 spark endpoint serves many symbols per request without the crumb/cookie v7 quote needs
+YAHOO_SPARK_URL = "https://query1.finance.yahoo.com/v8/finance/spark"
+YAHOO_HEADERS = {'User-Agent': 'Mozilla/5.0'}
+QUOTE_BATCH_SIZE = 20  # Symbols per spark request (Yahoo's limit)
+MAX_PRICE_WORKERS = 8  # Concurrent single-symbol fallbacks
+IC_CANDIDATE_STRIKES = 20  # OTM strikes per side swept when scoring iron condors
+DEFAULT_IV = 0.25
+
+
+def _spark_params(symbols: List[str]) -> Dict[str, str]:
+    """Query for one spark request: today's daily bar per symbol"""
+    return {'symbols': ','.join(symbols), 'range': '1d', 'interval': '1d'}
+
+
+def _parse_spark(data: Dict) -> Dict[str, float]:
+    """Latest positive price per symbol from a spark response (keyed by symbol, or the older wrapped form)"""
+    prices = {}
+    if 'spark' in data:
+        for item in (data['spark'] or {}).get('result') or []:
+            for response in item.get('response') or []:
+                price = (response.get('meta') or {}).get('regularMarketPrice')
+                if price and price > 0:
+                    prices[item['symbol']] = float(price)
+        return prices
+    for symbol, series in data.items():
+        if not isinstance(series, dict):
+            continue
+        closes = [close for close in series.get('close') or () if close is not None]
+        if closes and closes[-1] > 0:
+            prices[series.get('symbol', symbol)] = float(closes[-1])
+    return prices
+
+
+@functools.lru_cache(maxsize=256)
+def _parse_expirations(expirations: Tuple[str, ...]) -> Tuple[date, ...]:
+    """Parse Yahoo's 'YYYY-MM-DD' expiration strings once per distinct list"""
+    return tuple(date.fromisoformat(exp) for exp in expirations)
+
+
+def _chain_columns(options_df: pd.DataFrame) -> Dict[str, np.ndarray]:
+    """Strike-ascending, read-only arrays of the columns strategies read (safe to share from the cache)"""
+    strikes = options_df['strike'].to_numpy(dtype=float)
+    # Yahoo already sends strikes ascending; sort once here so lookups can binary search
+    order = None if np.all(strikes[1:] >= strikes[:-1]) else np.argsort(strikes, kind='stable')
+    columns = {}
+    for name in ('strike', 'lastPrice', 'impliedVolatility'):
+        if name not in options_df:
+            continue
+        values = options_df[name].to_numpy(dtype=float)
+        if order is not None:
+            values = values[order]
+        values.setflags(write=False)
+        columns[name] = values
+    return columns
+
+
+def _nearest_strike_index(strikes: np.ndarray, target: float) -> Optional[int]:
+    """Index of the strike closest to target in an ascending strike grid"""
+    if strikes.size == 0:
+        return None
+    i = int(np.searchsorted(strikes, target))
+    if i == strikes.size or (i > 0 and target - strikes[i - 1] <= strikes[i] - target):
+        return i - 1
+    return i
+
+
+def _nearest_otm_indices(strikes: np.ndarray, price: float, count: int,
+                         above: bool) -> np.ndarray:
+    """Up to count indices of strikes strictly above/below price in an ascending grid, nearest first"""
+    if above:
+        start = int(np.searchsorted(strikes, price, side='right'))
+        return np.arange(start, min(start + count, strikes.size))
+    end = int(np.searchsorted(strikes, price, side='left'))
+    return np.arange(end - 1, max(end - 1 - count, -1), -1)
+
 
 class YahooFinanceDataFetcher:
     """Fetches live data from Yahoo Finance"""
     
     def __init__(self):
-        self.cache = {}
         self.cache_duration = 60  # Cache for 1 minute
+        self._cache_lock = threading.Lock()
+        self._chain_cache = TTLCache(maxsize=128, ttl=self.cache_duration)
+        self._expirations_cache = TTLCache(maxsize=128, ttl=300)  # Expirations rarely change
+        self._quote_cache = TTLCache(maxsize=256, ttl=5)  # Repeated lookups within a screen
+        self._volatility_cache = TTLCache(maxsize=256, ttl=300)  # Daily closes barely move intraday
+        self._async_session = None
+        self._async_session_loop = None
+        self._session = requests.Session()  # Keeps the connection alive across spark requests
+        # yfinance memoizes quote info on the Ticker, so reuse expires with the data cache.
+        # Tickers use yfinance's own HTTP session: recent releases reject plain requests sessions
+        self._tickers = TTLCache(maxsize=64, ttl=self.cache_duration)
+        
+    def _ticker(self, symbol: str):
+        """Shared yfinance Ticker for symbol"""
+        with self._cache_lock:
+            ticker = self._tickers.get(symbol)
+            if ticker is None:
+                ticker = yf.Ticker(symbol)
+                self._tickers[symbol] = ticker
+        return ticker
+        
+    async def get_stock_prices_batch(self, symbols: List[str]) -> Dict[str, float]:
+        """Get current prices for many symbols concurrently (async counterpart of get_stock_prices)"""
+        symbols = list(dict.fromkeys(symbols))
+        prices = self._cached_prices(symbols)
+        missing = [symbol for symbol in symbols if symbol not in prices]
+        
+        if missing and AIOHTTP_AVAILABLE:
+            # All spark chunks in flight at once
+            session = self._get_async_session()
+            chunks = [missing[i:i + QUOTE_BATCH_SIZE] for i in range(0, len(missing), QUOTE_BATCH_SIZE)]
+            results = await asyncio.gather(
+                *[self._fetch_json(session, YAHOO_SPARK_URL, _spark_params(chunk)) for chunk in chunks],
+                return_exceptions=True
+            )
+            for chunk, data in zip(chunks, results):
+                if isinstance(data, Exception):
+                    logger.warning("Batch quote request failed, fetching individually: %s", data)
+                    continue
+                self._merge_spark(prices, chunk, data)
+        
+        # Fetch anything the batch requests missed in parallel
+        missing = [symbol for symbol in symbols if symbol not in prices]
+        if missing:
+            results = await asyncio.gather(*[asyncio.to_thread(self.get_stock_price, s) for s in missing])
+            prices.update(zip(missing, results))
+        
+        return {symbol: prices[symbol] for symbol in symbols}
+        
+    def _cached_prices(self, symbols: List[str]) -> Dict[str, float]:
+        """The quotes for symbols that are still in the short-lived quote cache"""
+        prices = {}
+        with self._cache_lock:
+            for symbol in symbols:
+                cached = self._quote_cache.get(symbol)
+                if cached is not None:
+                    prices[symbol] = cached
+        return prices
+        
+    def _merge_spark(self, prices: Dict[str, float], chunk: List[str], data: Dict):
+        """Add a spark response's prices for chunk to prices and the quote cache"""
+        wanted = set(chunk)
+        fetched = {symbol: price for symbol, price in _parse_spark(data).items() if symbol in wanted}
+        prices.update(fetched)
+        with self._cache_lock:
+            self._quote_cache.update(fetched)
+    
+    async def get_options_chains_batch(self, symbols: List[str],
+                                       expiration_date: Optional[date] = None) -> Dict[str, Dict]:
+        """Get options chains for many symbols concurrently"""
+        chains = await asyncio.gather(*[
+            asyncio.to_thread(self.get_options_chain, symbol, expiration_date) for symbol in symbols
+        ])
+        return dict(zip(symbols, chains))
+    
+    def _get_async_session(self):
+        """Reuse one aiohttp session per event loop"""
+        loop = asyncio.get_running_loop()
+        if self._async_session is None or self._async_session_loop is not loop:
+            self._async_session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=32),
+                headers=YAHOO_HEADERS,
+                timeout=aiohttp.ClientTimeout(total=10)
+            )
+            self._async_session_loop = loop
+        return self._async_session
+    
+    async def _fetch_json(self, session, url: str, params: Optional[Dict] = None) -> Dict:
+        """GET a Yahoo JSON endpoint"""
+        async with session.get(url, params=params) as response:
+            response.raise_for_status()
+            return await response.json()
+    
+    async def close_async(self):
+        """Close the aiohttp session on the current event loop"""
+        if self._async_session is not None:
+            await self._async_session.close()
+            self._async_session = None
+            self._async_session_loop = None
+        
+    def invalidate(self, symbol: Optional[str] = None):
+        """Drop cached quotes (all, or just symbol) so the next lookup refetches"""
+        with self._cache_lock:
+            if symbol is None:
+                self._quote_cache.clear()
+            else:
+                self._quote_cache.pop(symbol, None)
         
     def get_stock_price(self, symbol: str) -> float:
         """Get current stock price"""
+        with self._cache_lock:
+            cached = self._quote_cache.get(symbol)
+        if cached is not None:
+            return cached
+            
         try:
-            ticker = yf.Ticker(symbol)
+            ticker = self._ticker(symbol)
             info = ticker.info
             current_price = info.get('currentPrice', info.get('regularMarketPrice', 0))
             
@@ -34,22 +233,56 @@ class YahooFinanceDataFetcher:
                 if not hist.empty:
                     current_price = hist['Close'].iloc[-1]
                     
-            logger.info(f"Fetched {symbol} price: ${current_price:.2f}")
-            return float(current_price)
+            logger.info("Fetched %s price: $%.2f", symbol, current_price)
+            current_price = float(current_price)
+            if current_price > 0:
+                with self._cache_lock:
+                    self._quote_cache[symbol] = current_price
+            return current_price
             
         except Exception as e:
-            logger.error(f"Error fetching price for {symbol}: {e}")
+            logger.error("Error fetching price for %s: %s", symbol, e)
             return 0.0
             
+    def get_stock_prices(self, symbols: List[str]) -> Dict[str, float]:
+        """Get current prices for many symbols with one spark request per 20 symbols"""
+        symbols = list(dict.fromkeys(symbols))
+        prices = self._cached_prices(symbols)
+        
+        missing = [symbol for symbol in symbols if symbol not in prices]
+        for start in range(0, len(missing), QUOTE_BATCH_SIZE):
+            chunk = missing[start:start + QUOTE_BATCH_SIZE]
+            try:
+                response = self._session.get(YAHOO_SPARK_URL, params=_spark_params(chunk),
+                                             headers=YAHOO_HEADERS, timeout=10)
+                response.raise_for_status()
+                self._merge_spark(prices, chunk, response.json())
+            except Exception as e:
+                logger.warning("Batch quote request failed, fetching individually: %s", e)
+        
+        # Anything the spark endpoint didn't return goes through the per-ticker path
+        missing = [symbol for symbol in symbols if symbol not in prices]
+        if missing:
+            with ThreadPoolExecutor(max_workers=min(MAX_PRICE_WORKERS, len(missing))) as executor:
+                prices.update(zip(missing, executor.map(self.get_stock_price, missing)))
+        
+        return {symbol: prices[symbol] for symbol in symbols}
+            
     def get_options_chain(self, symbol: str, expiration_date: Optional[date] = None) -> Dict:
-        """Get options chain for a symbol"""
+        """Get options chain for a symbol as {'calls'/'puts': column arrays, 'expiration'}"""
+        cache_key = (symbol, expiration_date)
+        with self._cache_lock:
+            cached = self._chain_cache.get(cache_key)
+        if cached is not None:
+            return dict(cached)
+            
         try:
-            ticker = yf.Ticker(symbol)
+            ticker = self._ticker(symbol)
             
             # Get available expiration dates
-            expirations = ticker.options
+            expirations = self._get_expirations(symbol, ticker)
             if not expirations:
-                logger.warning(f"No options data available for {symbol}")
+                logger.warning("No options data available for %s", symbol)
                 return {}
                 
             # Use provided expiration or closest one
@@ -59,9 +292,8 @@ class YahooFinanceDataFetcher:
                     exp_date = target_exp
                 else:
                     # Find closest expiration
-                    exp_date = min(expirations, key=lambda x: abs(
-                        datetime.strptime(x, '%Y-%m-%d').date() - expiration_date
-                    ))
+                    parsed = zip(_parse_expirations(expirations), expirations)
+                    _, exp_date = min(parsed, key=lambda p: abs(p[0] - expiration_date))
             else:
                 # Use closest expiration
                 exp_date = expirations[0]
@@ -69,17 +301,33 @@ class YahooFinanceDataFetcher:
             # Get options chain
             options_chain = ticker.option_chain(exp_date)
             
-            logger.info(f"Fetched options chain for {symbol} exp {exp_date}")
-            return {
-                'calls': options_chain.calls,
-                'puts': options_chain.puts,
+            logger.info("Fetched options chain for %s exp %s", symbol, exp_date)
+            chain = {
+                'calls': _chain_columns(options_chain.calls),
+                'puts': _chain_columns(options_chain.puts),
                 'expiration': exp_date
             }
+            with self._cache_lock:
+                self._chain_cache[cache_key] = chain
+            return dict(chain)
             
         except Exception as e:
-            logger.error(f"Error fetching options chain for {symbol}: {e}")
+            logger.error("Error fetching options chain for %s: %s", symbol, e)
             return {}
             
+    def _get_expirations(self, symbol: str, ticker=None) -> Tuple[str, ...]:
+        """Get expiration date strings for a symbol, cached for a few minutes"""
+        with self._cache_lock:
+            cached = self._expirations_cache.get(symbol)
+        if cached is not None:
+            return cached
+        
+        expirations = tuple((ticker or self._ticker(symbol)).options)
+        if expirations:
+            with self._cache_lock:
+                self._expirations_cache[symbol] = expirations
+        return expirations
+            
     def get_option_price(self, symbol: str, strike: float, option_type: str, 
                         expiration: date) -> float:
         """Get specific option price"""
@@ -89,45 +337,41 @@ class YahooFinanceDataFetcher:
                 return 0.0
                 
             if option_type.upper() == 'CALL':
-                options_df = options_chain['calls']
+                options = options_chain['calls']
             else:
-                options_df = options_chain['puts']
+                options = options_chain['puts']
                 
             # Find closest strike
-            closest_strike = options_df.iloc[(options_df['strike'] - strike).abs().argsort()[:1]]
+            closest = _nearest_strike_index(options['strike'], strike)
             
-            if not closest_strike.empty:
-                price = closest_strike['lastPrice'].iloc[0]
-                logger.info(f"Fetched {symbol} {option_type} ${strike} price: ${price:.2f}")
+            if closest is not None:
+                price = options['lastPrice'][closest]
+                logger.info("Fetched %s %s $%s price: $%.2f", symbol, option_type, strike, price)
                 return float(price)
                 
         except Exception as e:
-            logger.error(f"Error fetching option price for {symbol} {option_type} ${strike}: {e}")
+            logger.error("Error fetching option price for %s %s $%s: %s", symbol, option_type, strike, e)
             
         return 0.0
         
     def get_available_expirations(self, symbol: str) -> List[date]:
         """Get available expiration dates for a symbol"""
         try:
-            ticker = yf.Ticker(symbol)
-            expirations = ticker.options
+            expirations = self._get_expirations(symbol)
             
             if not expirations:
                 return []
                 
             # Convert to date objects and sort
-            exp_dates = [datetime.strptime(exp, '%Y-%m-%d').date() for exp in expirations]
-            exp_dates.sort()
-            
-            return exp_dates
+            return sorted(_parse_expirations(expirations))
             
         except Exception as e:
-            logger.error(f"Error fetching expirations for {symbol}: {e}")
+            logger.error("Error fetching expirations for %s: %s", symbol, e)
             return []
             
     def get_iron_condor_data(self, symbol: str, current_price: float, 
-                           expiration: date) -> Dict:
-        """Get data for iron condor strategy"""
+                           expiration: date, optimize_strikes: bool = False) -> Dict:
+        """Get data for iron condor strategy (nearest OTM strikes, or the best-scoring ones if optimize_strikes)"""
         try:
             options_chain = self.get_options_chain(symbol, expiration)
             if not options_chain:
@@ -136,25 +380,40 @@ class YahooFinanceDataFetcher:
             calls = options_chain['calls']
             puts = options_chain['puts']
             
-            # Find strikes around current price
-            call_strikes = calls[calls['strike'] > current_price].sort_values('strike')
-            put_strikes = puts[puts['strike'] < current_price].sort_values('strike', ascending=False)
+            # Candidate OTM strikes around current price, nearest first
+            candidates = IC_CANDIDATE_STRIKES if optimize_strikes else 2
+            call_idx = _nearest_otm_indices(calls['strike'], current_price, candidates, above=True)
+            put_idx = _nearest_otm_indices(puts['strike'], current_price, candidates, above=False)
             
-            if len(call_strikes) < 2 or len(put_strikes) < 2:
-                logger.warning(f"Not enough strikes for iron condor on {symbol}")
+            if len(call_idx) < 2 or len(put_idx) < 2:
+                logger.warning("Not enough strikes for iron condor on %s", symbol)
                 return {}
                 
-            # Select strikes (simplified selection)
-            short_call_strike = call_strikes.iloc[0]['strike']
-            long_call_strike = call_strikes.iloc[1]['strike']
-            short_put_strike = put_strikes.iloc[0]['strike']
-            long_put_strike = put_strikes.iloc[1]['strike']
+            # Select strikes: the two nearest OTM strikes on each side
+            i, j = 0, 0
+            if optimize_strikes:
+                # Opt-in: the short strikes with the best expected value, long legs one strike out.
+                # Imported here so the default path never pays for the kernels' compile
+                from strategy_numba import score_ic_pairs, INVALID_SCORE
+                days = (expiration - date.today()).days if expiration else 30
+                scores = score_ic_pairs(
+                    calls['strike'][call_idx], calls['lastPrice'][call_idx],
+                    puts['strike'][put_idx], puts['lastPrice'][put_idx],
+                    current_price, self._chain_iv(calls, puts, call_idx, put_idx),
+                    max(days, 1) / 365.0
+                )
+                i, j = np.unravel_index(int(scores.argmax()), scores.shape)
+                if scores[i, j] <= INVALID_SCORE:
+                    i, j = 0, 0  # No credit anywhere; fall back to the nearest strikes
+            call_legs = call_idx[i:i + 2]
+            put_legs = put_idx[j:j + 2]
+            
+            short_call_strike, long_call_strike = calls['strike'][call_legs].tolist()
+            short_put_strike, long_put_strike = puts['strike'][put_legs].tolist()
             
             # Get premiums
-            short_call_premium = call_strikes.iloc[0]['lastPrice']
-            long_call_premium = call_strikes.iloc[1]['lastPrice']
-            short_put_premium = put_strikes.iloc[0]['lastPrice']
-            long_put_premium = put_strikes.iloc[1]['lastPrice']
+            short_call_premium, long_call_premium = calls['lastPrice'][call_legs].tolist()
+            short_put_premium, long_put_premium = puts['lastPrice'][put_legs].tolist()
             
             net_credit = (short_call_premium + short_put_premium) - (long_call_premium + long_put_premium)
             
@@ -171,9 +430,19 @@ class YahooFinanceDataFetcher:
             }
             
         except Exception as e:
-            logger.error(f"Error fetching iron condor data for {symbol}: {e}")
+            logger.error("Error fetching iron condor data for %s: %s", symbol, e)
             return {}
             
+    @staticmethod
+    def _chain_iv(calls: Dict, puts: Dict, call_idx: np.ndarray, put_idx: np.ndarray) -> float:
+        """Median implied volatility across the candidate strikes, or a default"""
+        if 'impliedVolatility' not in calls or 'impliedVolatility' not in puts:
+            return DEFAULT_IV
+        ivs = np.concatenate((calls['impliedVolatility'][call_idx],
+                              puts['impliedVolatility'][put_idx]))
+        ivs = ivs[np.isfinite(ivs) & (ivs > 0)]
+        return float(np.median(ivs)) if ivs.size else DEFAULT_IV
+        
     def get_straddle_data(self, symbol: str, current_price: float, 
                          expiration: date) -> Dict:
         """Get data for straddle strategy"""
@@ -186,16 +455,16 @@ class YahooFinanceDataFetcher:
             puts = options_chain['puts']
             
             # Find ATM strikes
-            atm_call = calls.iloc[(calls['strike'] - current_price).abs().argsort()[:1]]
-            atm_put = puts.iloc[(puts['strike'] - current_price).abs().argsort()[:1]]
+            atm_call = _nearest_strike_index(calls['strike'], current_price)
+            atm_put = _nearest_strike_index(puts['strike'], current_price)
             
-            if atm_call.empty or atm_put.empty:
-                logger.warning(f"No ATM options for straddle on {symbol}")
+            if atm_call is None or atm_put is None:
+                logger.warning("No ATM options for straddle on %s", symbol)
                 return {}
                 
-            strike = atm_call.iloc[0]['strike']
-            call_premium = atm_call.iloc[0]['lastPrice']
-            put_premium = atm_put.iloc[0]['lastPrice']
+            strike = float(calls['strike'][atm_call])
+            call_premium = float(calls['lastPrice'][atm_call])
+            put_premium = float(puts['lastPrice'][atm_put])
             
             return {
                 'strike': strike,
@@ -205,7 +474,7 @@ class YahooFinanceDataFetcher:
             }
             
         except Exception as e:
-            logger.error(f"Error fetching straddle data for {symbol}: {e}")
+            logger.error("Error fetching straddle data for %s: %s", symbol, e)
             return {}
             
     def get_strangle_data(self, symbol: str, current_price: float, 
@@ -220,17 +489,17 @@ class YahooFinanceDataFetcher:
             puts = options_chain['puts']
             
             # Find OTM strikes
-            otm_calls = calls[calls['strike'] > current_price].sort_values('strike')
-            otm_puts = puts[puts['strike'] < current_price].sort_values('strike', ascending=False)
+            otm_call = _nearest_otm_indices(calls['strike'], current_price, 1, above=True)
+            otm_put = _nearest_otm_indices(puts['strike'], current_price, 1, above=False)
             
-            if otm_calls.empty or otm_puts.empty:
-                logger.warning(f"No OTM options for strangle on {symbol}")
+            if otm_call.size == 0 or otm_put.size == 0:
+                logger.warning("No OTM options for strangle on %s", symbol)
                 return {}
                 
-            call_strike = otm_calls.iloc[0]['strike']
-            put_strike = otm_puts.iloc[0]['strike']
-            call_premium = otm_calls.iloc[0]['lastPrice']
-            put_premium = otm_puts.iloc[0]['lastPrice']
+            call_strike = float(calls['strike'][otm_call[0]])
+            put_strike = float(puts['strike'][otm_put[0]])
+            call_premium = float(calls['lastPrice'][otm_call[0]])
+            put_premium = float(puts['lastPrice'][otm_put[0]])
             
             return {
                 'call_strike': call_strike,
@@ -241,39 +510,52 @@ class YahooFinanceDataFetcher:
             }
             
         except Exception as e:
-            logger.error(f"Error fetching strangle data for {symbol}: {e}")
+            logger.error("Error fetching strangle data for %s: %s", symbol, e)
             return {}
             
     def get_historical_data(self, symbol: str, period: str = "1mo") -> pd.DataFrame:
         """Get historical price data"""
         try:
-            ticker = yf.Ticker(symbol)
+            ticker = self._ticker(symbol)
             hist = ticker.history(period=period)
-            logger.info(f"Fetched {len(hist)} days of historical data for {symbol}")
+            logger.info("Fetched %s days of historical data for %s", len(hist), symbol)
             return hist
             
         except Exception as e:
-            logger.error(f"Error fetching historical data for {symbol}: {e}")
+            logger.error("Error fetching historical data for %s: %s", symbol, e)
             return pd.DataFrame()
             
     def get_volatility(self, symbol: str, period: str = "1mo") -> float:
         """Calculate historical volatility"""
+        cache_key = (symbol, period)
+        with self._cache_lock:
+            cached = self._volatility_cache.get(cache_key)
+        if cached is not None:
+            return cached
+            
         try:
             hist = self.get_historical_data(symbol, period)
             if hist.empty:
                 return 0.0
                 
-            # Calculate daily returns
-            returns = hist['Close'].pct_change().dropna()
+            # Daily log returns straight off the close array; drop gaps/bad ticks
+            closes = hist['Close'].to_numpy(dtype=float)
+            returns = np.log(closes[1:] / closes[:-1])
+            returns = returns[np.isfinite(returns)]
+            if returns.size < 2:
+                return 0.0
             
             # Calculate annualized volatility
-            volatility = returns.std() * (252 ** 0.5)  # 252 trading days per year
+            volatility = returns.std(ddof=1) * np.sqrt(252)  # 252 trading days per year
             
-            logger.info(f"Calculated volatility for {symbol}: {volatility:.2%}")
-            return float(volatility)
+            logger.info("Calculated volatility for %s: %.2f%%", symbol, volatility * 100)
+            volatility = float(volatility)
+            with self._cache_lock:
+                self._volatility_cache[cache_key] = volatility
+            return volatility
             
         except Exception as e:
-            logger.error(f"Error calculating volatility for {symbol}: {e}")
+            logger.error("Error calculating volatility for %s: %s", symbol, e)
             return 0.0
             
     def search_symbols(self, query: str) -> List[str]:
@@ -290,14 +572,14 @@ class YahooFinanceDataFetcher:
             return matches
             
         except Exception as e:
-            logger.error(f"Error searching symbols: {e}")
+            logger.error("Error searching symbols: %s", e)
             return []
             
     def get_market_status(self) -> Dict:
         """Get current market status"""
         try:
             # Check if market is open by looking at SPY
-            spy = yf.Ticker("SPY")
+            spy = self._ticker("SPY")
             info = spy.info
             
             market_state = info.get('marketState', 'UNKNOWN')
@@ -310,5 +592,5 @@ class YahooFinanceDataFetcher:
             }
             
         except Exception as e:
-            logger.error(f"Error getting market status: {e}")
+            logger.error("Error getting market status: %s", e)
             return {'market_state': 'UNKNOWN', 'is_open': False, 'last_update': None}
@@ -3,6 +3,7 @@
 Demo script showing live data functionality
 """
 
+import asyncio
 import sys
 import os
 from datetime import datetime, timedelta
@@ -10,6 +11,37 @@ from datetime import datetime, timedelta
 # Add current directory to path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
+MAX_CONCURRENT_REQUESTS = 8
+
+
+async def _bounded(semaphore, fn, *args):
+    """Run a blocking fetcher call in a worker thread, limited by semaphore"""
+    async with semaphore:
+        return await asyncio.to_thread(fn, *args)
+
+
+async def fetch_all(fetcher, symbols):
+    """Fetch quotes for every symbol and the AAPL expirations in one round-trip window"""
+    try:
+        return await asyncio.gather(
+            fetcher.get_stock_prices_batch(symbols),
+            asyncio.to_thread(fetcher.get_available_expirations, "AAPL")
+        )
+    finally:
+        await fetcher.close_async()
+
+
+async def fetch_aapl_details(fetcher, aapl_price, expiration):
+    """Fetch the AAPL strategy chains and both volatilities concurrently"""
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+    return await asyncio.gather(
+        _bounded(semaphore, fetcher.get_iron_condor_data, "AAPL", aapl_price, expiration),
+        _bounded(semaphore, fetcher.get_straddle_data, "AAPL", aapl_price, expiration),
+        _bounded(semaphore, fetcher.get_volatility, 'AAPL'),
+        _bounded(semaphore, fetcher.get_volatility, 'TSLA')
+    )
+
+
 try:
     from data_fetcher import YahooFinanceDataFetcher
     from options_models import IronCondor, Straddle
@@ -31,8 +63,9 @@ try:
     # Demo 2: Stock Prices
     print("\n💰 Current Stock Prices:")
     symbols = ['AAPL', 'TSLA', 'SPY', 'QQQ']
+    prices, expirations = asyncio.run(fetch_all(fetcher, symbols))
     for symbol in symbols:
-        price = fetcher.get_stock_price(symbol)
+        price = prices.get(symbol, 0.0)
         if price > 0:
             print(f"  {symbol}: ${price:.2f}")
         else:
@@ -40,19 +73,21 @@ try:
     
     # Demo 3: Options Data for AAPL
     print("\n📈 AAPL Options Data:")
-    aapl_price = fetcher.get_stock_price("AAPL")
+    aapl_price = prices.get("AAPL", 0.0)
+    volatilities = {}
     if aapl_price > 0:
         print(f"  Current Price: ${aapl_price:.2f}")
         
-        # Get expirations
-        expirations = fetcher.get_available_expirations("AAPL")
         if expirations:
             print(f"  Available Expirations: {len(expirations)}")
             print(f"  Next 3: {[exp.strftime('%Y-%m-%d') for exp in expirations[:3]]}")
             
+            iron_condor_data, straddle_data, volatilities['AAPL'], volatilities['TSLA'] = asyncio.run(
+                fetch_aapl_details(fetcher, aapl_price, expirations[0])
+            )
+            
             # Demo Iron Condor
             print("\n  🦅 Iron Condor Data:")
-            iron_condor_data = fetcher.get_iron_condor_data("AAPL", aapl_price, expirations[0])
             if iron_condor_data:
                 print(f"    Short Call: ${iron_condor_data['short_call_strike']:.2f} @ ${iron_condor_data['short_call_premium']:.2f}")
                 print(f"    Long Call: ${iron_condor_data['long_call_strike']:.2f} @ ${iron_condor_data['long_call_premium']:.2f}")
@@ -81,7 +116,6 @@ try:
             
             # Demo Straddle
             print("\n  🎯 Straddle Data:")
-            straddle_data = fetcher.get_straddle_data("AAPL", aapl_price, expirations[0])
             if straddle_data:
                 print(f"    Strike: ${straddle_data['strike']:.2f}")
                 print(f"    Call Premium: ${straddle_data['call_premium']:.2f}")
@@ -108,7 +142,9 @@ try:
     # Demo 4: Volatility
     print("\n📊 Volatility Analysis:")
     for symbol in ['AAPL', 'TSLA']:
-        volatility = fetcher.get_volatility(symbol)
+        volatility = volatilities.get(symbol)
+        if volatility is None:
+            volatility = fetcher.get_volatility(symbol)
         if volatility > 0:
             print(f"  {symbol}: {volatility:.1%}")
     
@@ -5,19 +5,86 @@ A console application for simulating options trading strategies with real-time d
 """
 
 import sys
+import csv
+import functools
 import json
 from datetime import datetime, timedelta, date
-from typing import Dict, List, Optional
-from dataclasses import dataclass, asdict
+from typing import Dict, List, Optional, Tuple
+from dataclasses import dataclass, is_dataclass
 import argparse
 
-from options_models import Option, OptionsStrategy, IronCondor, Straddle, Strangle
+from options_models import Option, OptionsStrategy, IronCondor, Straddle, Strangle, to_dict
 from trading_engine import TradingEngine
 from strategy_analyzer import StrategyAnalyzer
 from data_fetcher import YahooFinanceDataFetcher
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
-@dataclass
+# Bulk import: normalized "type" value -> class built from the remaining fields
+IMPORT_TYPES = {
+    'option': Option,
+    'ironcondor': IronCondor,
+    'straddle': Straddle,
+    'strangle': Strangle
+}
+TEXT_FIELDS = {'symbol', 'option_type'}
+INT_FIELDS = {'volume', 'open_interest'}
+
+# Main menu, rendered once and written in a single call per redraw
+MENU_TEXT = "\n".join([
+    "",
+    "=" * 60,
+    "    OPTIONS TRADING SIMULATOR (LIVE DATA)",
+    "=" * 60,
+    "1. Configure Simulation",
+    "2. Add Options Data",
+    "3. Fetch Live Data",
+    "4. Analyze Strategy",
+    "5. Run Simulation",
+    "6. View Portfolio",
+    "7. View Trade History",
+    "8. Load Sample Data",
+    "9. Market Status",
+    "10. Export Results",
+    "11. Exit",
+    "=" * 60,
+    ""
+])
+
+
+def _parse_date(value: str) -> date:
+    """Parse a YYYY-MM-DD date (all date input goes through here)"""
+    return date.fromisoformat(value.strip())
+
+
+@functools.lru_cache(maxsize=1)
+def _sample_expirations(today: date) -> Tuple[date, date]:
+    """30- and 21-day sample expirations, computed once per calendar day"""
+    return today + timedelta(days=30), today + timedelta(days=21)
+
+
+def _export_default(obj):
+    """Serialize values JSON has no native form for (strategy objects, dates, dataclasses)"""
+    if isinstance(obj, (date, datetime)):
+        return obj.isoformat()
+    if is_dataclass(obj) or isinstance(obj, OptionsStrategy) or hasattr(obj, '__dict__'):
+        return to_dict(obj)
+    return str(obj)
+
+
+def _dumps(obj, indent: bool = False) -> bytes:
+    """Encode obj as JSON bytes, with orjson's C encoder when installed"""
+    if ORJSON_AVAILABLE:
+        option = orjson.OPT_SERIALIZE_NUMPY | (orjson.OPT_INDENT_2 if indent else 0)
+        return orjson.dumps(obj, default=_export_default, option=option)
+    return json.dumps(obj, indent=2 if indent else None, default=_export_default).encode()
+
+
+@dataclass(slots=True)
 class SimulationConfig:
     """Configuration for trading simulation"""
     initial_capital: float = 10000.0
@@ -37,24 +104,29 @@ class OptionsSimulator:
         self.analyzer = StrategyAnalyzer()
         self.config = SimulationConfig()
         self.running = True
+        self._dispatch = {
+            "1": self.configure_simulation,
+            "2": self.add_options_data,
+            "3": self.fetch_live_data,
+            "4": self.analyze_strategy,
+            "5": self.run_simulation,
+            "6": self.view_portfolio,
+            "7": self.view_trade_history,
+            "8": self.load_sample_data,
+            "9": self.market_status,
+            "10": self.export_results,
+            "11": self._exit
+        }
         
     def display_menu(self):
         """Display main menu options"""
-        print("\n" + "="*60)
-        print("    OPTIONS TRADING SIMULATOR (LIVE DATA)")
-        print("="*60)
-        print("1. Configure Simulation")
-        print("2. Add Options Data")
-        print("3. Fetch Live Data")
-        print("4. Analyze Strategy")
-        print("5. Run Simulation")
-        print("6. View Portfolio")
-        print("7. View Trade History")
-        print("8. Load Sample Data")
-        print("9. Market Status")
-        print("10. Export Results")
-        print("11. Exit")
-        print("="*60)
+        sys.stdout.write(MENU_TEXT)
+        sys.stdout.flush()
+        
+    def _exit(self):
+        """Leave the main loop"""
+        print("Goodbye!")
+        self.running = False
         
     def configure_simulation(self):
         """Configure simulation parameters"""
@@ -87,7 +159,8 @@ class OptionsSimulator:
         print("2. Add Iron Condor")
         print("3. Add Straddle")
         print("4. Add Strangle")
-        print("5. Back to Main Menu")
+        print("5. Import from JSON/CSV File")
+        print("6. Back to Main Menu")
         
         choice = input("\nSelect option: ").strip()
         
@@ -100,10 +173,60 @@ class OptionsSimulator:
         elif choice == "4":
             self._add_strangle()
         elif choice == "5":
+            path = input("File path (.json or .csv): ").strip()
+            try:
+                self.import_strategies(path)
+            except (OSError, ValueError) as e:
+                print(f"❌ Could not import {path}: {e}")
+        elif choice == "6":
             return
         else:
             print("❌ Invalid choice")
             
+    def import_strategies(self, path: str) -> int:
+        """Bulk-load options and strategies from a JSON list or a CSV file with a 'type' column"""
+        with open(path, newline='') as f:
+            if path.lower().endswith('.csv'):
+                rows = list(csv.DictReader(f))
+            else:
+                rows = json.load(f)
+                
+        imported = 0
+        for number, row in enumerate(rows, 1):
+            try:
+                fields = dict(row)
+                kind = IMPORT_TYPES[''.join(c for c in str(fields.pop('type', '')).lower() if c.isalpha())]
+                item = kind(**self._import_fields(fields))
+            except (KeyError, TypeError, ValueError) as e:
+                print(f"❌ Skipping row {number}: {e!r}")
+                continue
+                
+            if kind is Option:
+                self.trading_engine.add_option(item)
+            else:
+                self.trading_engine.add_strategy(item)
+            imported += 1
+            
+        print(f"✓ Imported {imported} of {len(rows)} entries from {path}")
+        return imported
+        
+    @staticmethod
+    def _import_fields(fields: Dict) -> Dict:
+        """Convert raw JSON/CSV values to constructor arguments"""
+        kwargs = {}
+        for name, value in fields.items():
+            if value is None or value == '':
+                continue
+            if name == 'expiration':
+                kwargs[name] = value if isinstance(value, date) else _parse_date(value)
+            elif name in TEXT_FIELDS:
+                kwargs[name] = str(value).strip().upper()
+            elif name in INT_FIELDS:
+                kwargs[name] = int(value)
+            else:
+                kwargs[name] = float(value)
+        return kwargs
+        
     def fetch_live_data(self):
         """Fetch live options data"""
         print("\n--- Fetch Live Options Data ---")
@@ -135,7 +258,7 @@ class OptionsSimulator:
         try:
             exp_input = input("Enter expiration date (YYYY-MM-DD) or press Enter for closest: ").strip()
             if exp_input:
-                expiration = datetime.strptime(exp_input, "%Y-%m-%d").date()
+                expiration = _parse_date(exp_input)
             else:
                 expiration = expirations[0]
                 
@@ -264,7 +387,7 @@ class OptionsSimulator:
                 symbol=symbol,
                 option_type=option_type,
                 strike=strike,
-                expiration=datetime.strptime(expiration, "%Y-%m-%d").date(),
+                expiration=_parse_date(expiration),
                 premium=premium,
                 current_price=strike  # Default to strike, can be updated
             )
@@ -293,7 +416,7 @@ class OptionsSimulator:
             iron_condor = IronCondor(
                 symbol=symbol,
                 current_price=current_price,
-                expiration=datetime.strptime(expiration, "%Y-%m-%d").date(),
+                expiration=_parse_date(expiration),
                 short_call_strike=short_call_strike,
                 long_call_strike=long_call_strike,
                 short_put_strike=short_put_strike,
@@ -321,7 +444,7 @@ class OptionsSimulator:
                 symbol=symbol,
                 strike=strike,
                 current_price=current_price,
-                expiration=datetime.strptime(expiration, "%Y-%m-%d").date(),
+                expiration=_parse_date(expiration),
                 call_premium=call_premium,
                 put_premium=put_premium
             )
@@ -348,7 +471,7 @@ class OptionsSimulator:
                 call_strike=call_strike,
                 put_strike=put_strike,
                 current_price=current_price,
-                expiration=datetime.strptime(expiration, "%Y-%m-%d").date(),
+                expiration=_parse_date(expiration),
                 call_premium=call_premium,
                 put_premium=put_premium
             )
@@ -367,17 +490,25 @@ class OptionsSimulator:
             
         print("\n--- Strategy Analysis ---")
         
-        for i, strategy in enumerate(self.trading_engine.strategies, 1):
-            print(f"\nStrategy {i}: {strategy.__class__.__name__}")
-            
-            # Update current price if using live data
-            if self.config.use_live_data:
-                current_price = self.data_fetcher.get_stock_price(strategy.symbol)
+        strategies = self.trading_engine.strategies
+        updated = set()
+        
+        # Update current prices if using live data, one lookup per unique symbol
+        if self.config.use_live_data:
+            prices = self.data_fetcher.get_stock_prices(list(dict.fromkeys(s.symbol for s in strategies)))
+            for i, strategy in enumerate(strategies):
+                current_price = prices.get(strategy.symbol, 0.0)
                 if current_price > 0:
                     strategy.current_price = current_price
-                    print(f"  Updated {strategy.symbol} price: ${current_price:.2f}")
-            
-            analysis = self.analyzer.analyze_strategy(strategy)
+                    updated.add(i)
+        
+        # Payoff curves for every strategy come from one vectorized pass
+        analyses = self.analyzer.analyze_batch(strategies)
+        
+        for i, (strategy, analysis) in enumerate(zip(strategies, analyses)):
+            print(f"\nStrategy {i + 1}: {strategy.__class__.__name__}")
+            if i in updated:
+                print(f"  Updated {strategy.symbol} price: ${strategy.current_price:.2f}")
             
             print(f"  Symbol: {strategy.symbol}")
             print(f"  Current Price: ${strategy.current_price:.2f}")
@@ -425,25 +556,25 @@ class OptionsSimulator:
                 
     def view_trade_history(self):
         """View trade history"""
-        history = self.trading_engine.get_trade_history()
-        
         print("\n--- Trade History ---")
-        if not history:
+        if not self.trading_engine.trades:
             print("No trades executed yet.")
             return
             
-        for trade in history[-10:]:  # Show last 10 trades
-            print(f"  {trade['date']} - {trade['symbol']} - {trade['action']} - P&L: ${trade['pnl']:,.2f}")
+        # Show last 10 trades, oldest first
+        for trade in reversed(list(self.trading_engine.iter_tail(10))):
+            print(f"  {trade['exit_date']} - {trade['symbol']} - {trade['action']} - P&L: ${trade['pnl']:,.2f}")
             
     def load_sample_data(self):
         """Load sample options data for testing"""
         print("\n--- Loading Sample Data ---")
+        exp_30, exp_21 = _sample_expirations(date.today())
         
         # Sample AAPL Iron Condor
         iron_condor = IronCondor(
             symbol="AAPL",
             current_price=150.0,
-            expiration=(datetime.now() + timedelta(days=30)).date(),
+            expiration=exp_30,
             short_call_strike=155.0,
             long_call_strike=160.0,
             short_put_strike=145.0,
@@ -456,7 +587,7 @@ class OptionsSimulator:
             symbol="TSLA",
             strike=200.0,
             current_price=200.0,
-            expiration=(datetime.now() + timedelta(days=21)).date(),
+            expiration=exp_21,
             call_premium=15.0,
             put_premium=12.0
         )
@@ -480,26 +611,36 @@ class OptionsSimulator:
         # Show some popular symbols
         popular_symbols = ['SPY', 'QQQ', 'AAPL', 'TSLA', 'MSFT']
         print(f"\nCurrent Prices:")
+        prices = self.data_fetcher.get_stock_prices(popular_symbols)
         for symbol in popular_symbols:
-            price = self.data_fetcher.get_stock_price(symbol)
+            price = prices[symbol]
             if price > 0:
                 print(f"  {symbol}: ${price:.2f}")
                 
     def export_results(self):
-        """Export simulation results to JSON"""
+        """Export simulation results to JSON, with trade history streamed as NDJSON"""
+        base = f"options_simulation_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        filename = f"{base}.json"
+        trades_filename = f"{base}_trades.ndjson"
+        
+        # Strategies and config are serialized in place rather than copied via asdict
         results = {
-            'config': asdict(self.config),
+            'config': self.config,
             'portfolio': self.trading_engine.get_portfolio(),
-            'trade_history': self.trading_engine.get_trade_history(),
-            'strategies': [asdict(strategy) for strategy in self.trading_engine.strategies]
+            'strategies': self.trading_engine.strategies,
+            'trade_history_file': trades_filename
         }
         
-        filename = f"options_simulation_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-        
-        with open(filename, 'w') as f:
-            json.dump(results, f, indent=2, default=str)
+        with open(filename, 'wb') as f:
+            f.write(_dumps(results, indent=True))
             
-        print(f"✓ Results exported to {filename}")
+        # One trade per line so the history is never held as one big list of dicts
+        with open(trades_filename, 'wb') as f:
+            for trade in self.trading_engine.trades:
+                f.write(_dumps(trade))
+                f.write(b"\n")
+            
+        print(f"✓ Results exported to {filename} (trades: {trades_filename})")
         
     def run(self):
         """Main application loop"""
@@ -514,29 +655,9 @@ class OptionsSimulator:
                 self.display_menu()
                 choice = input("\nSelect an option (1-11): ").strip()
                 
-                if choice == "1":
-                    self.configure_simulation()
-                elif choice == "2":
-                    self.add_options_data()
-                elif choice == "3":
-                    self.fetch_live_data()
-                elif choice == "4":
-                    self.analyze_strategy()
-                elif choice == "5":
-                    self.run_simulation()
-                elif choice == "6":
-                    self.view_portfolio()
-                elif choice == "7":
-                    self.view_trade_history()
-                elif choice == "8":
-                    self.load_sample_data()
-                elif choice == "9":
-                    self.market_status()
-                elif choice == "10":
-                    self.export_results()
-                elif choice == "11":
-                    print("Goodbye!")
-                    self.running = False
+                action = self._dispatch.get(choice)
+                if action:
+                    action()
                 else:
                     print("❌ Invalid choice. Please select 1-11.")
                     
@@ -553,6 +674,8 @@ def main():
     parser.add_argument("--config", help="Load configuration from JSON file")
     parser.add_argument("--sample", action="store_true", help="Load sample data and exit")
     parser.add_argument("--live", action="store_true", help="Enable live data by default")
+    parser.add_argument("--import", dest="import_path", metavar="PATH",
+                        help="Import options/strategies from a JSON or CSV file")
     
     args = parser.parse_args()
     
@@ -573,6 +696,13 @@ def main():
             print(f"❌ Error loading config: {e}")
             return 1
             
+    if args.import_path:
+        try:
+            simulator.import_strategies(args.import_path)
+        except (OSError, ValueError) as e:
+            print(f"❌ Error importing {args.import_path}: {e}")
+            return 1
+            
     if args.sample:
         simulator.load_sample_data()
         simulator.analyze_strategy()
@@ -8,15 +8,15 @@ import sys
 import json
 from datetime import datetime, timedelta, date
 from typing import Dict, List, Optional
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass
 import argparse
 
-from options_models import Option, OptionsStrategy, IronCondor, Straddle, Strangle
+from options_models import Option, OptionsStrategy, IronCondor, Straddle, Strangle, to_dict
 from trading_engine import TradingEngine
 from strategy_analyzer_safe import StrategyAnalyzer
 
 
-@dataclass
+@dataclass(slots=True)
 class SimulationConfig:
     """Configuration for trading simulation"""
     initial_capital: float = 10000.0
@@ -309,10 +309,10 @@ class OptionsSimulator:
     def export_results(self):
         """Export simulation results to JSON"""
         results = {
-            'config': asdict(self.config),
+            'config': to_dict(self.config),
             'portfolio': self.trading_engine.get_portfolio(),
             'trade_history': self.trading_engine.get_trade_history(),
-            'strategies': [asdict(strategy) for strategy in self.trading_engine.strategies]
+            'strategies': [to_dict(strategy) for strategy in self.trading_engine.strategies]
         }
         
         filename = f"options_simulation_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
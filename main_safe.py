@@ -5,42 +5,142 @@ A console application for simulating options trading strategies with optional li
 """
 
 import sys
+import asyncio
+import importlib.util
 import json
 from datetime import datetime, timedelta, date
-from typing import Dict, List, Optional
-from dataclasses import dataclass, asdict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from dataclasses import dataclass, replace
 import argparse
+from types import MappingProxyType
 
-from options_models import Option, OptionsStrategy, IronCondor, Straddle, Strangle
+from options_models import Option, OptionsStrategy, IronCondor, Straddle, Strangle, to_dict
 from trading_engine import TradingEngine
-from strategy_analyzer import StrategyAnalyzer
 
-# Try to import live data components, but don't fail if they're not available
+# The vectorized analyzer needs numpy; the pure-Python one has the same interface
 try:
-    from data_fetcher import YahooFinanceDataFetcher
-    LIVE_DATA_AVAILABLE = True
+    from strategy_analyzer import StrategyAnalyzer
 except ImportError:
+    from strategy_analyzer_safe import StrategyAnalyzer
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Live data needs these packages; they are only imported once a fetcher is first used
+LIVE_DATA_PACKAGES = ('yfinance', 'numpy', 'pandas', 'requests', 'cachetools')
+LIVE_DATA_AVAILABLE = all(importlib.util.find_spec(name) is not None for name in LIVE_DATA_PACKAGES)
+if not LIVE_DATA_AVAILABLE:
     print("⚠️  Live data features not available. Install yfinance, numpy, pandas for full functionality.")
-    LIVE_DATA_AVAILABLE = False
+
+# Shared read-only results, so the dummy never allocates per call
+_EMPTY_DATA = MappingProxyType({})
+_MARKET_UNKNOWN = MappingProxyType({'market_state': 'UNKNOWN', 'is_open': False, 'last_update': None})
+
+
+class OfflineDataFetcher:
+    """Stand-in fetcher when live data is unavailable (one shared no-op instance)"""
+    _instance = None
+    _warned = False
     
-    # Create a dummy data fetcher
-    class YahooFinanceDataFetcher:
-        def get_stock_price(self, symbol):
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+        return cls._instance
+    
+    @classmethod
+    def _warn(cls):
+        if not cls._warned:
+            cls._warned = True
             print(f"❌ Live data not available. Please install: pip install yfinance numpy pandas")
-            return 0.0
-        def get_market_status(self):
-            return {'market_state': 'UNKNOWN', 'is_open': False, 'last_update': None}
-        def get_available_expirations(self, symbol):
-            return []
-        def get_iron_condor_data(self, symbol, current_price, expiration):
-            return {}
-        def get_straddle_data(self, symbol, current_price, expiration):
-            return {}
-        def get_strangle_data(self, symbol, current_price, expiration):
-            return {}
+    def get_stock_price(self, symbol):
+        self._warn()
+        return 0.0
+    def get_stock_prices(self, symbols):
+        self._warn()
+        return dict.fromkeys(symbols, 0.0)
+    def get_market_status(self):
+        return _MARKET_UNKNOWN
+    def get_available_expirations(self, symbol):
+        return ()
+    def get_iron_condor_data(self, symbol, current_price, expiration):
+        return _EMPTY_DATA
+    def get_straddle_data(self, symbol, current_price, expiration):
+        return _EMPTY_DATA
+    def get_strangle_data(self, symbol, current_price, expiration):
+        return _EMPTY_DATA
+
+
+def _create_fetcher():
+    """Import the live data stack on first use, falling back to the offline fetcher"""
+    if LIVE_DATA_AVAILABLE:
+        try:
+            from data_fetcher import YahooFinanceDataFetcher
+            return YahooFinanceDataFetcher()
+        except ImportError as e:
+            print(f"⚠️  Live data could not be loaded: {e}")
+    return OfflineDataFetcher()
+
+
+# Main menu, rendered once for whichever mode this process runs in
+_UNAVAILABLE = "" if LIVE_DATA_AVAILABLE else " (Not Available)"
+MENU_TEXT = "\n".join([
+    "",
+    "=" * 60,
+    "    OPTIONS TRADING SIMULATOR (LIVE DATA)" if LIVE_DATA_AVAILABLE else "    OPTIONS TRADING SIMULATOR (OFFLINE MODE)",
+    "=" * 60,
+    "1. Configure Simulation",
+    "2. Add Options Data",
+    f"3. Fetch Live Data{_UNAVAILABLE}",
+    "4. Analyze Strategy",
+    "5. Run Simulation",
+    "6. View Portfolio",
+    "7. View Trade History",
+    "8. Load Sample Data",
+    f"9. Market Status{_UNAVAILABLE}",
+    "10. Export Results",
+    "11. Exit",
+    "=" * 60,
+    ""
+])
+
 
+def _emit(*lines: str):
+    """Write several output lines with a single stdout call"""
+    sys.stdout.write("\n".join(lines) + "\n")
 
-@dataclass
+
+def _parse_date(value: str) -> date:
+    """Parse a YYYY-MM-DD date (all date input goes through here)"""
+    return date.fromisoformat(value.strip())
+
+
+def _json_default(obj):
+    """Encode dates in exported results; anything else unexpected is an error, not a str()"""
+    if isinstance(obj, (date, datetime)):
+        return obj.isoformat()
+    raise TypeError(f"Object of type {obj.__class__.__name__} is not JSON serializable")
+
+
+def _prompt_values(fields: List[Tuple[str, Callable[[str], Any], Any]]) -> List[Any]:
+    """Prompt for each (label, parse, default) in turn; a blank answer keeps the default"""
+    values = []
+    for label, parse, default in fields:
+        sys.stdout.write(f"{label}: ")
+        sys.stdout.flush()
+        answer = sys.stdin.readline().strip()
+        values.append(parse(answer) if answer else default)
+    return values
+
+
+def _parse_yes(answer: str) -> bool:
+    """Treat any answer starting with y as yes"""
+    return answer.lower().startswith('y')
+
+
+@dataclass(frozen=True, slots=True)
 class SimulationConfig:
     """Configuration for trading simulation"""
     initial_capital: float = 10000.0
@@ -54,52 +154,62 @@ class OptionsSimulator:
     """Main application class for options trading simulation with optional live data"""
     
     def __init__(self):
-        self.data_fetcher = YahooFinanceDataFetcher()
+        self._data_fetcher = None
         self.trading_engine = TradingEngine()
-        self.trading_engine.set_data_fetcher(self.data_fetcher)
         self.analyzer = StrategyAnalyzer()
         self.config = SimulationConfig()
         self.running = True
+        self._dispatch = {
+            "1": self.configure_simulation,
+            "2": self.add_options_data,
+            "3": self.fetch_live_data,
+            "4": self.analyze_strategy,
+            "5": self.run_simulation,
+            "6": self.view_portfolio,
+            "7": self.view_trade_history,
+            "8": self.load_sample_data,
+            "9": self.market_status,
+            "10": self.export_results,
+            "11": self._exit
+        }
+        
+    @property
+    def data_fetcher(self):
+        """Data fetcher, created (and the live data stack imported) on first use"""
+        if self._data_fetcher is None:
+            self._data_fetcher = _create_fetcher()
+            self.trading_engine.set_data_fetcher(self._data_fetcher)
+        return self._data_fetcher
         
     def display_menu(self):
         """Display main menu options"""
-        print("\n" + "="*60)
-        if LIVE_DATA_AVAILABLE:
-            print("    OPTIONS TRADING SIMULATOR (LIVE DATA)")
-        else:
-            print("    OPTIONS TRADING SIMULATOR (OFFLINE MODE)")
-        print("="*60)
-        print("1. Configure Simulation")
-        print("2. Add Options Data")
-        if LIVE_DATA_AVAILABLE:
-            print("3. Fetch Live Data")
-        else:
-            print("3. Fetch Live Data (Not Available)")
-        print("4. Analyze Strategy")
-        print("5. Run Simulation")
-        print("6. View Portfolio")
-        print("7. View Trade History")
-        print("8. Load Sample Data")
-        if LIVE_DATA_AVAILABLE:
-            print("9. Market Status")
-        else:
-            print("9. Market Status (Not Available)")
-        print("10. Export Results")
-        print("11. Exit")
-        print("="*60)
+        sys.stdout.write(MENU_TEXT)
+        sys.stdout.flush()
+        
+    def _exit(self):
+        """Leave the main loop"""
+        print("Goodbye!")
+        self.running = False
         
     def configure_simulation(self):
         """Configure simulation parameters"""
         print("\n--- Simulation Configuration ---")
         
         try:
-            capital = float(input(f"Initial Capital (current: ${self.config.initial_capital:,.2f}): ") or self.config.initial_capital)
-            risk = float(input(f"Risk per Trade % (current: {self.config.risk_per_trade*100:.1f}%): ") or self.config.risk_per_trade*100) / 100
-            max_trades = int(input(f"Max Concurrent Trades (current: {self.config.max_concurrent_trades}): ") or self.config.max_concurrent_trades)
-            days = int(input(f"Simulation Days (current: {self.config.simulation_days}): ") or self.config.simulation_days)
+            fields = [
+                (f"Initial Capital (current: ${self.config.initial_capital:,.2f})", float, self.config.initial_capital),
+                (f"Risk per Trade % (current: {self.config.risk_per_trade*100:.1f}%)", float, self.config.risk_per_trade*100),
+                (f"Max Concurrent Trades (current: {self.config.max_concurrent_trades})", int, self.config.max_concurrent_trades),
+                (f"Simulation Days (current: {self.config.simulation_days})", int, self.config.simulation_days)
+            ]
+            if LIVE_DATA_AVAILABLE:
+                fields.append((f"Use Live Data (current: {self.config.use_live_data}) [y/n]", _parse_yes, self.config.use_live_data))
+            
+            capital, risk, max_trades, days, *live = _prompt_values(fields)
+            risk /= 100
             
             if LIVE_DATA_AVAILABLE:
-                use_live = input(f"Use Live Data (current: {self.config.use_live_data}) [y/n]: ").lower().startswith('y') if input() else self.config.use_live_data
+                use_live = live[0]
             else:
                 use_live = False
                 print("Live data not available - using simulated data only")
@@ -141,11 +251,20 @@ class OptionsSimulator:
         else:
             print("❌ Invalid choice")
             
+    async def _prefetch_symbol(self, symbol: str):
+        """Fetch the stock price and option expirations for symbol concurrently"""
+        return await asyncio.gather(
+            asyncio.to_thread(self.data_fetcher.get_stock_price, symbol),
+            asyncio.to_thread(self.data_fetcher.get_available_expirations, symbol)
+        )
+        
     def fetch_live_data(self):
         """Fetch live options data"""
         if not LIVE_DATA_AVAILABLE:
-            print("❌ Live data features not available.")
-            print("To enable live data, install: pip install yfinance numpy pandas")
+            _emit(
+                "❌ Live data features not available.",
+                "To enable live data, install: pip install yfinance numpy pandas"
+            )
             return
             
         print("\n--- Fetch Live Options Data ---")
@@ -157,16 +276,14 @@ class OptionsSimulator:
             
         print(f"Fetching data for {symbol}...")
         
-        # Get current stock price
-        current_price = self.data_fetcher.get_stock_price(symbol)
+        # Price and expirations are independent lookups, so overlap the round-trips
+        current_price, expirations = asyncio.run(self._prefetch_symbol(symbol))
         if current_price == 0:
             print(f"❌ Could not fetch price for {symbol}")
             return
             
         print(f"Current {symbol} price: ${current_price:.2f}")
         
-        # Get available expirations
-        expirations = self.data_fetcher.get_available_expirations(symbol)
         if not expirations:
             print(f"❌ No options data available for {symbol}")
             return
@@ -177,23 +294,25 @@ class OptionsSimulator:
         try:
             exp_input = input("Enter expiration date (YYYY-MM-DD) or press Enter for closest: ").strip()
             if exp_input:
-                expiration = datetime.strptime(exp_input, "%Y-%m-%d").date()
+                expiration = _parse_date(exp_input)
+                # Only typed dates need checking; the default comes from the list itself
+                if expiration not in expirations:
+                    print(f"❌ Expiration {expiration} not available")
+                    return
             else:
                 expiration = expirations[0]
                 
-            if expiration not in expirations:
-                print(f"❌ Expiration {expiration} not available")
-                return
-                
         except ValueError:
             print("❌ Invalid date format")
             return
             
         # Show strategy options
-        print("\nAvailable strategies:")
-        print("1. Iron Condor")
-        print("2. Straddle")
-        print("3. Strangle")
+        _emit(
+            "\nAvailable strategies:",
+            "1. Iron Condor",
+            "2. Straddle",
+            "3. Strangle"
+        )
         
         strategy_choice = input("Select strategy (1-3): ").strip()
         
@@ -215,12 +334,14 @@ class OptionsSimulator:
             print("❌ Could not fetch iron condor data")
             return
             
-        print(f"\nIron Condor Data for {symbol}:")
-        print(f"  Short Call: ${data['short_call_strike']:.2f} @ ${data['short_call_premium']:.2f}")
-        print(f"  Long Call: ${data['long_call_strike']:.2f} @ ${data['long_call_premium']:.2f}")
-        print(f"  Short Put: ${data['short_put_strike']:.2f} @ ${data['short_put_premium']:.2f}")
-        print(f"  Long Put: ${data['long_put_strike']:.2f} @ ${data['long_put_premium']:.2f}")
-        print(f"  Net Credit: ${data['net_credit']:.2f}")
+        _emit(
+            f"\nIron Condor Data for {symbol}:",
+            f"  Short Call: ${data['short_call_strike']:.2f} @ ${data['short_call_premium']:.2f}",
+            f"  Long Call: ${data['long_call_strike']:.2f} @ ${data['long_call_premium']:.2f}",
+            f"  Short Put: ${data['short_put_strike']:.2f} @ ${data['short_put_premium']:.2f}",
+            f"  Long Put: ${data['long_put_strike']:.2f} @ ${data['long_put_premium']:.2f}",
+            f"  Net Credit: ${data['net_credit']:.2f}"
+        )
         
         if input("Add this Iron Condor? (y/n): ").lower().startswith('y'):
             iron_condor = IronCondor(
@@ -246,11 +367,13 @@ class OptionsSimulator:
             print("❌ Could not fetch straddle data")
             return
             
-        print(f"\nStraddle Data for {symbol}:")
-        print(f"  Strike: ${data['strike']:.2f}")
-        print(f"  Call Premium: ${data['call_premium']:.2f}")
-        print(f"  Put Premium: ${data['put_premium']:.2f}")
-        print(f"  Total Cost: ${data['total_cost']:.2f}")
+        _emit(
+            f"\nStraddle Data for {symbol}:",
+            f"  Strike: ${data['strike']:.2f}",
+            f"  Call Premium: ${data['call_premium']:.2f}",
+            f"  Put Premium: ${data['put_premium']:.2f}",
+            f"  Total Cost: ${data['total_cost']:.2f}"
+        )
         
         if input("Add this Straddle? (y/n): ").lower().startswith('y'):
             straddle = Straddle(
@@ -274,10 +397,12 @@ class OptionsSimulator:
             print("❌ Could not fetch strangle data")
             return
             
-        print(f"\nStrangle Data for {symbol}:")
-        print(f"  Call Strike: ${data['call_strike']:.2f} @ ${data['call_premium']:.2f}")
-        print(f"  Put Strike: ${data['put_strike']:.2f} @ ${data['put_premium']:.2f}")
-        print(f"  Total Cost: ${data['total_cost']:.2f}")
+        _emit(
+            f"\nStrangle Data for {symbol}:",
+            f"  Call Strike: ${data['call_strike']:.2f} @ ${data['call_premium']:.2f}",
+            f"  Put Strike: ${data['put_strike']:.2f} @ ${data['put_premium']:.2f}",
+            f"  Total Cost: ${data['total_cost']:.2f}"
+        )
         
         if input("Add this Strangle? (y/n): ").lower().startswith('y'):
             strangle = Strangle(
@@ -306,7 +431,7 @@ class OptionsSimulator:
                 symbol=symbol,
                 option_type=option_type,
                 strike=strike,
-                expiration=datetime.strptime(expiration, "%Y-%m-%d").date(),
+                expiration=_parse_date(expiration),
                 premium=premium,
                 current_price=strike  # Default to strike, can be updated
             )
@@ -335,7 +460,7 @@ class OptionsSimulator:
             iron_condor = IronCondor(
                 symbol=symbol,
                 current_price=current_price,
-                expiration=datetime.strptime(expiration, "%Y-%m-%d").date(),
+                expiration=_parse_date(expiration),
                 short_call_strike=short_call_strike,
                 long_call_strike=long_call_strike,
                 short_put_strike=short_put_strike,
@@ -363,7 +488,7 @@ class OptionsSimulator:
                 symbol=symbol,
                 strike=strike,
                 current_price=current_price,
-                expiration=datetime.strptime(expiration, "%Y-%m-%d").date(),
+                expiration=_parse_date(expiration),
                 call_premium=call_premium,
                 put_premium=put_premium
             )
@@ -390,7 +515,7 @@ class OptionsSimulator:
                 call_strike=call_strike,
                 put_strike=put_strike,
                 current_price=current_price,
-                expiration=datetime.strptime(expiration, "%Y-%m-%d").date(),
+                expiration=_parse_date(expiration),
                 call_premium=call_premium,
                 put_premium=put_premium
             )
@@ -409,27 +534,37 @@ class OptionsSimulator:
             
         print("\n--- Strategy Analysis ---")
         
-        for i, strategy in enumerate(self.trading_engine.strategies, 1):
-            print(f"\nStrategy {i}: {strategy.__class__.__name__}")
-            
-            # Update current price if using live data
-            if self.config.use_live_data and LIVE_DATA_AVAILABLE:
-                current_price = self.data_fetcher.get_stock_price(strategy.symbol)
+        strategies = self.trading_engine.strategies
+        
+        # Fetch every live price up front and apply it before the batched analysis
+        updated = set()
+        if self.config.use_live_data and LIVE_DATA_AVAILABLE:
+            prices = self.data_fetcher.get_stock_prices(list(dict.fromkeys(s.symbol for s in strategies)))
+            for i, strategy in enumerate(strategies):
+                current_price = prices.get(strategy.symbol, 0.0)
                 if current_price > 0:
                     strategy.current_price = current_price
-                    print(f"  Updated {strategy.symbol} price: ${current_price:.2f}")
-            
-            analysis = self.analyzer.analyze_strategy(strategy)
-            
-            print(f"  Symbol: {strategy.symbol}")
-            print(f"  Current Price: ${strategy.current_price:.2f}")
-            print(f"  Expiration: {strategy.expiration}")
-            print(f"  Days to Expiration: {strategy.days_to_expiration}")
-            print(f"  Max Profit: ${analysis['max_profit']:.2f}")
-            print(f"  Max Loss: ${analysis['max_loss']:.2f}")
-            print(f"  Break-even Points: {analysis['break_even_points']}")
-            print(f"  Risk/Reward Ratio: {analysis['risk_reward_ratio']:.2f}")
-            print(f"  Recommendation: {analysis['recommendation']}")
+                    updated.add(i)
+        
+        # One vectorized pass over every strategy's payoff curve
+        analyses = self.analyzer.analyze_batch(strategies)
+        
+        for i, (strategy, analysis) in enumerate(zip(strategies, analyses)):
+            print(f"\nStrategy {i + 1}: {strategy.__class__.__name__}")
+            if i in updated:
+                print(f"  Updated {strategy.symbol} price: ${strategy.current_price:.2f}")
+            
+            _emit(
+                f"  Symbol: {strategy.symbol}",
+                f"  Current Price: ${strategy.current_price:.2f}",
+                f"  Expiration: {strategy.expiration}",
+                f"  Days to Expiration: {strategy.days_to_expiration}",
+                f"  Max Profit: ${analysis['max_profit']:.2f}",
+                f"  Max Loss: ${analysis['max_loss']:.2f}",
+                f"  Break-even Points: {analysis['break_even_points']}",
+                f"  Risk/Reward Ratio: {analysis['risk_reward_ratio']:.2f}",
+                f"  Recommendation: {analysis['recommendation']}"
+            )
             
     def run_simulation(self):
         """Run the trading simulation"""
@@ -437,45 +572,55 @@ class OptionsSimulator:
             print("❌ No strategies to simulate. Add some options data first.")
             return
             
-        print("\n--- Running Simulation ---")
-        print(f"Simulating {self.config.simulation_days} days with ${self.config.initial_capital:,.2f} capital...")
-        print(f"Using {'live' if self.config.use_live_data and LIVE_DATA_AVAILABLE else 'simulated'} data")
+        _emit(
+            "\n--- Running Simulation ---",
+            f"Simulating {self.config.simulation_days} days with ${self.config.initial_capital:,.2f} capital...",
+            f"Using {'live' if self.config.use_live_data and LIVE_DATA_AVAILABLE else 'simulated'} data"
+        )
+        
+        # Live runs need the fetcher bound to the engine before it starts
+        if self.config.use_live_data and LIVE_DATA_AVAILABLE:
+            self.trading_engine.set_data_fetcher(self.data_fetcher)
         
         results = self.trading_engine.run_simulation()
         
-        print(f"\n✓ Simulation Complete!")
-        print(f"  Final Portfolio Value: ${results['final_value']:,.2f}")
-        print(f"  Total Return: {results['total_return']:.2f}%")
-        print(f"  Total Trades: {results['total_trades']}")
-        print(f"  Winning Trades: {results['winning_trades']}")
-        print(f"  Losing Trades: {results['losing_trades']}")
-        print(f"  Win Rate: {results['win_rate']:.1f}%")
+        _emit(
+            f"\n✓ Simulation Complete!",
+            f"  Final Portfolio Value: ${results['final_value']:,.2f}",
+            f"  Total Return: {results['total_return']:.2f}%",
+            f"  Total Trades: {results['total_trades']}",
+            f"  Winning Trades: {results['winning_trades']}",
+            f"  Losing Trades: {results['losing_trades']}",
+            f"  Win Rate: {results['win_rate']:.1f}%"
+        )
         
     def view_portfolio(self):
         """View current portfolio"""
         portfolio = self.trading_engine.get_portfolio()
         
-        print("\n--- Current Portfolio ---")
-        print(f"Cash: ${portfolio['cash']:,.2f}")
-        print(f"Total Value: ${portfolio['total_value']:,.2f}")
-        print(f"Open Positions: {len(portfolio['positions'])}")
+        _emit(
+            "\n--- Current Portfolio ---",
+            f"Cash: ${portfolio['cash']:,.2f}",
+            f"Total Value: ${portfolio['total_value']:,.2f}",
+            f"Open Positions: {len(portfolio['positions'])}"
+        )
         
         if portfolio['positions']:
-            print("\nOpen Positions:")
-            for position in portfolio['positions']:
-                print(f"  {position['symbol']} - {position['strategy_type']} - P&L: ${position['unrealized_pnl']:,.2f}")
+            _emit("\nOpen Positions:", *(
+                f"  {position['symbol']} - {position['strategy_type']} - P&L: ${position['unrealized_pnl']:,.2f}"
+                for position in portfolio['positions']
+            ))
                 
     def view_trade_history(self):
         """View trade history"""
-        history = self.trading_engine.get_trade_history()
-        
         print("\n--- Trade History ---")
-        if not history:
+        if not self.trading_engine.trades:
             print("No trades executed yet.")
             return
             
-        for trade in history[-10:]:  # Show last 10 trades
-            print(f"  {trade['date']} - {trade['symbol']} - {trade['action']} - P&L: ${trade['pnl']:,.2f}")
+        # Show last 10 trades, oldest first
+        for trade in reversed(list(self.trading_engine.iter_tail(10))):
+            print(f"  {trade['exit_date']} - {trade['symbol']} - {trade['action']} - P&L: ${trade['pnl']:,.2f}")
             
     def load_sample_data(self):
         """Load sample options data for testing"""
@@ -511,40 +656,48 @@ class OptionsSimulator:
     def market_status(self):
         """Show market status"""
         if not LIVE_DATA_AVAILABLE:
-            print("❌ Market status not available.")
-            print("To enable market status, install: pip install yfinance numpy pandas")
+            _emit(
+                "❌ Market status not available.",
+                "To enable market status, install: pip install yfinance numpy pandas"
+            )
             return
             
         print("\n--- Market Status ---")
         
         status = self.data_fetcher.get_market_status()
         
-        print(f"Market State: {status['market_state']}")
-        print(f"Market Open: {'Yes' if status['is_open'] else 'No'}")
+        _emit(
+            f"Market State: {status['market_state']}",
+            f"Market Open: {'Yes' if status['is_open'] else 'No'}"
+        )
         if status['last_update']:
             print(f"Last Update: {status['last_update']}")
             
         # Show some popular symbols
         popular_symbols = ['SPY', 'QQQ', 'AAPL', 'TSLA', 'MSFT']
-        print(f"\nCurrent Prices:")
-        for symbol in popular_symbols:
-            price = self.data_fetcher.get_stock_price(symbol)
-            if price > 0:
-                print(f"  {symbol}: ${price:.2f}")
+        prices = self.data_fetcher.get_stock_prices(popular_symbols)
+        _emit(f"\nCurrent Prices:", *(
+            f"  {symbol}: ${prices[symbol]:.2f}" for symbol in popular_symbols if prices[symbol] > 0
+        ))
                 
-    def export_results(self):
-        """Export simulation results to JSON"""
+    def export_results(self, filename: Optional[str] = None):
+        """Export simulation results to JSON (timestamped filename unless one is given)"""
         results = {
-            'config': asdict(self.config),
+            'config': to_dict(self.config),
             'portfolio': self.trading_engine.get_portfolio(),
             'trade_history': self.trading_engine.get_trade_history(),
-            'strategies': [asdict(strategy) for strategy in self.trading_engine.strategies]
+            'strategies': [to_dict(strategy) for strategy in self.trading_engine.strategies]
         }
         
-        filename = f"options_simulation_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+        filename = filename or f"options_simulation_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
         
-        with open(filename, 'w') as f:
-            json.dump(results, f, indent=2, default=str)
+        # orjson encodes dates natively; the stdlib path needs the date hook
+        if ORJSON_AVAILABLE:
+            with open(filename, 'wb') as f:
+                f.write(orjson.dumps(results, option=orjson.OPT_INDENT_2 | orjson.OPT_NAIVE_UTC))
+        else:
+            with open(filename, 'w') as f:
+                json.dump(results, f, indent=2, default=_json_default)
             
         print(f"✓ Results exported to {filename}")
         
@@ -566,29 +719,9 @@ class OptionsSimulator:
                 self.display_menu()
                 choice = input("\nSelect an option (1-11): ").strip()
                 
-                if choice == "1":
-                    self.configure_simulation()
-                elif choice == "2":
-                    self.add_options_data()
-                elif choice == "3":
-                    self.fetch_live_data()
-                elif choice == "4":
-                    self.analyze_strategy()
-                elif choice == "5":
-                    self.run_simulation()
-                elif choice == "6":
-                    self.view_portfolio()
-                elif choice == "7":
-                    self.view_trade_history()
-                elif choice == "8":
-                    self.load_sample_data()
-                elif choice == "9":
-                    self.market_status()
-                elif choice == "10":
-                    self.export_results()
-                elif choice == "11":
-                    print("Goodbye!")
-                    self.running = False
+                action = self._dispatch.get(choice)
+                if action:
+                    action()
                 else:
                     print("❌ Invalid choice. Please select 1-11.")
                     
@@ -605,13 +738,19 @@ def main():
     parser.add_argument("--config", help="Load configuration from JSON file")
     parser.add_argument("--sample", action="store_true", help="Load sample data and exit")
     parser.add_argument("--live", action="store_true", help="Enable live data by default")
+    parser.add_argument("--analyze", action="store_true", help="Analyze strategies and exit")
+    parser.add_argument("--run", action="store_true", help="Run the simulation and exit")
+    parser.add_argument("--export", nargs="?", const="", metavar="PATH",
+                        help="Export results (optionally to PATH) and exit")
+    parser.add_argument("-q", "--quiet", action="store_true", help="Skip per-trade simulation output")
     
     args = parser.parse_args()
     
     simulator = OptionsSimulator()
+    simulator.trading_engine.verbose = not args.quiet
     
     if args.live and LIVE_DATA_AVAILABLE:
-        simulator.config.use_live_data = True
+        simulator.config = replace(simulator.config, use_live_data=True)
         
     if args.config:
         # Load configuration from file
@@ -625,9 +764,22 @@ def main():
             print(f"❌ Error loading config: {e}")
             return 1
             
+    # Any of these turns the run into a script: do them in order, then skip the menu
+    scripted = args.analyze or args.run or args.export is not None
+    
     if args.sample:
         simulator.load_sample_data()
-        simulator.analyze_strategy()
+        if not scripted:
+            simulator.analyze_strategy()
+            return 0
+            
+    if scripted:
+        if args.analyze:
+            simulator.analyze_strategy()
+        if args.run:
+            simulator.run_simulation()
+        if args.export is not None:
+            simulator.export_results(args.export or None)
         return 0
         
     simulator.run()
@@ -2,14 +2,51 @@
 Options data models and strategy classes
 """
 
-from dataclasses import dataclass
-from datetime import date, datetime
-from typing import List, Dict, Optional
+from dataclasses import dataclass, fields, is_dataclass
+from datetime import date, datetime, time, timedelta
+from typing import Any, List, Dict, Optional, Tuple
 from abc import ABC, abstractmethod
+import functools
 import math
+import time as _time
 
+# Today's date and the epoch time of the next local midnight, when it must be re-read
+_today_cache = (date.min, 0.0)
 
-@dataclass
+
+def _today() -> date:
+    """date.today(), re-read only once the cached day has ended"""
+    global _today_cache
+    today, expires = _today_cache
+    if _time.time() >= expires:
+        today = date.today()
+        _today_cache = (today, datetime.combine(today + timedelta(days=1), time()).timestamp())
+    return today
+
+
+@functools.lru_cache(maxsize=None)
+def _field_names(cls: type) -> Tuple[str, ...]:
+    """Dataclass field names, looked up once per class"""
+    return tuple(f.name for f in fields(cls))
+
+
+@functools.lru_cache(maxsize=None)
+def _slot_names(cls: type) -> Tuple[str, ...]:
+    """Slot attribute names of a class, base classes first"""
+    return tuple(name for klass in reversed(cls.__mro__)
+                 for name in klass.__dict__.get('__slots__', ()))
+
+
+def to_dict(obj: Any) -> Dict[str, Any]:
+    """Shallow dict of a model for export (no asdict deep copy; nested values are left to the encoder)"""
+    if is_dataclass(obj):
+        return {name: getattr(obj, name) for name in _field_names(type(obj))}
+    if hasattr(obj, '__dict__'):
+        return {'type': obj.__class__.__name__, **vars(obj)}
+    return {'type': obj.__class__.__name__, **{name: getattr(obj, name) for name in _slot_names(type(obj))}}
+
+
+@dataclass(frozen=True, slots=True)
 class Option:
     """Represents a single option contract"""
     symbol: str
@@ -24,7 +61,7 @@ class Option:
     @property
     def days_to_expiration(self) -> int:
         """Calculate days until expiration"""
-        return (self.expiration - date.today()).days
+        return (self.expiration - _today()).days
     
     @property
     def is_expired(self) -> bool:
@@ -46,25 +83,29 @@ class Option:
     
     def calculate_payoff(self, stock_price: float) -> float:
         """Calculate payoff at expiration for given stock price"""
-        if self.option_type == "CALL":
-            return max(0, stock_price - self.strike) - self.premium
-        else:  # PUT
-            return max(0, self.strike - stock_price) - self.premium
+        intrinsic = stock_price - self.strike if self.option_type == "CALL" else self.strike - stock_price
+        return (intrinsic if intrinsic > 0 else 0) - self.premium
 
 
 class OptionsStrategy(ABC):
     """Abstract base class for options strategies"""
     
+    __slots__ = ('symbol', 'current_price', 'expiration', 'entry_date')
+    
+    # Sign of the simplified greeks: does the strategy gain from time decay / rising volatility
+    POSITIVE_THETA = False
+    POSITIVE_VEGA = False
+    
     def __init__(self, symbol: str, current_price: float, expiration: date):
         self.symbol = symbol
         self.current_price = current_price
         self.expiration = expiration
-        self.entry_date = date.today()
+        self.entry_date = _today()
         
     @property
     def days_to_expiration(self) -> int:
         """Calculate days until expiration"""
-        return (self.expiration - date.today()).days
+        return (self.expiration - _today()).days
     
     @property
     def is_expired(self) -> bool:
@@ -91,6 +132,11 @@ class OptionsStrategy(ABC):
         """Calculate break-even points"""
         pass
     
+    @abstractmethod
+    def get_delta(self, stock_price: float) -> float:
+        """Slope of the expiration payoff at stock_price (right-hand slope at a strike)"""
+        pass
+    
     def get_profit_loss_range(self, price_range: List[float]) -> Dict[float, float]:
         """Calculate P&L for a range of stock prices"""
         return {price: self.calculate_payoff(price) for price in price_range}
@@ -99,6 +145,9 @@ class OptionsStrategy(ABC):
 class IronCondor(OptionsStrategy):
     """Iron Condor strategy: sell call spread + sell put spread"""
     
+    __slots__ = ('short_call_strike', 'long_call_strike', 'short_put_strike', 'long_put_strike', 'net_credit')
+    POSITIVE_THETA = True
+    
     def __init__(self, symbol: str, current_price: float, expiration: date,
                  short_call_strike: float, long_call_strike: float,
                  short_put_strike: float, long_put_strike: float,
@@ -112,21 +161,19 @@ class IronCondor(OptionsStrategy):
         
     def calculate_payoff(self, stock_price: float) -> float:
         """Calculate payoff at expiration"""
-        # Call spread payoff
-        call_spread_payoff = 0
+        # Total payoff = net credit - (call spread loss + put spread loss), capped at each width
+        loss = 0.0
         if stock_price > self.short_call_strike:
-            call_spread_payoff = min(stock_price - self.short_call_strike, 
-                                   self.long_call_strike - self.short_call_strike)
-        
-        # Put spread payoff
-        put_spread_payoff = 0
+            if stock_price < self.long_call_strike:
+                loss = stock_price - self.short_call_strike
+            else:
+                loss = self.long_call_strike - self.short_call_strike
         if stock_price < self.short_put_strike:
-            put_spread_payoff = min(self.short_put_strike - stock_price,
-                                  self.short_put_strike - self.long_put_strike)
-        
-        # Total payoff = net credit - (call spread loss + put spread loss)
-        total_loss = call_spread_payoff + put_spread_payoff
-        return self.net_credit - total_loss
+            if stock_price > self.long_put_strike:
+                loss += self.short_put_strike - stock_price
+            else:
+                loss += self.short_put_strike - self.long_put_strike
+        return self.net_credit - loss
     
     def get_max_profit(self) -> float:
         """Maximum profit is the net credit received"""
@@ -146,11 +193,22 @@ class IronCondor(OptionsStrategy):
         # Lower break-even: short put strike - net credit
         lower_be = self.short_put_strike - self.net_credit
         return [lower_be, upper_be]
+    
+    def get_delta(self, stock_price: float) -> float:
+        """Short call spread loses 1:1 between the call strikes, short put spread between the put strikes"""
+        if self.short_call_strike <= stock_price < self.long_call_strike:
+            return -1.0
+        if self.long_put_strike <= stock_price < self.short_put_strike:
+            return 1.0
+        return 0.0
 
 
 class Straddle(OptionsStrategy):
     """Straddle strategy: buy call + buy put at same strike"""
     
+    __slots__ = ('strike', 'call_premium', 'put_premium', 'total_cost')
+    POSITIVE_VEGA = True
+    
     def __init__(self, symbol: str, strike: float, current_price: float,
                  expiration: date, call_premium: float, put_premium: float):
         super().__init__(symbol, current_price, expiration)
@@ -161,9 +219,11 @@ class Straddle(OptionsStrategy):
         
     def calculate_payoff(self, stock_price: float) -> float:
         """Calculate payoff at expiration"""
-        call_payoff = max(0, stock_price - self.strike) - self.call_premium
-        put_payoff = max(0, self.strike - stock_price) - self.put_premium
-        return call_payoff + put_payoff
+        # Only one leg is in the money; branching avoids two max() builtin calls
+        intrinsic = stock_price - self.strike
+        if intrinsic < 0:
+            intrinsic = -intrinsic
+        return intrinsic - self.total_cost
     
     def get_max_profit(self) -> float:
         """Maximum profit is unlimited (theoretically)"""
@@ -178,11 +238,18 @@ class Straddle(OptionsStrategy):
         upper_be = self.strike + self.total_cost
         lower_be = self.strike - self.total_cost
         return [lower_be, upper_be]
+    
+    def get_delta(self, stock_price: float) -> float:
+        """Long call above the strike, long put below it"""
+        return 1.0 if stock_price >= self.strike else -1.0
 
 
 class Strangle(OptionsStrategy):
     """Strangle strategy: buy call + buy put at different strikes"""
     
+    __slots__ = ('call_strike', 'put_strike', 'call_premium', 'put_premium', 'total_cost')
+    POSITIVE_VEGA = True
+    
     def __init__(self, symbol: str, call_strike: float, put_strike: float,
                  current_price: float, expiration: date,
                  call_premium: float, put_premium: float):
@@ -195,9 +262,13 @@ class Strangle(OptionsStrategy):
         
     def calculate_payoff(self, stock_price: float) -> float:
         """Calculate payoff at expiration"""
-        call_payoff = max(0, stock_price - self.call_strike) - self.call_premium
-        put_payoff = max(0, self.put_strike - stock_price) - self.put_premium
-        return call_payoff + put_payoff
+        # Intrinsic value of each leg, branching instead of max() builtin calls
+        intrinsic = 0.0
+        if stock_price > self.call_strike:
+            intrinsic = stock_price - self.call_strike
+        if stock_price < self.put_strike:
+            intrinsic += self.put_strike - stock_price
+        return intrinsic - self.total_cost
     
     def get_max_profit(self) -> float:
         """Maximum profit is unlimited (theoretically)"""
@@ -212,11 +283,21 @@ class Strangle(OptionsStrategy):
         upper_be = self.call_strike + self.total_cost
         lower_be = self.put_strike - self.total_cost
         return [lower_be, upper_be]
+    
+    def get_delta(self, stock_price: float) -> float:
+        """Long call above the call strike, long put below the put strike, flat between"""
+        if stock_price >= self.call_strike:
+            return 1.0
+        if stock_price < self.put_strike:
+            return -1.0
+        return 0.0
 
 
 class CallSpread(OptionsStrategy):
     """Call Spread strategy: buy call + sell call at higher strike"""
     
+    __slots__ = ('buy_strike', 'sell_strike', 'buy_premium', 'sell_premium', 'net_debit')
+    
     def __init__(self, symbol: str, buy_strike: float, sell_strike: float,
                  current_price: float, expiration: date,
                  buy_premium: float, sell_premium: float):
@@ -247,11 +328,17 @@ class CallSpread(OptionsStrategy):
     def get_break_even_points(self) -> List[float]:
         """Calculate break-even point"""
         return [self.buy_strike + self.net_debit]
+    
+    def get_delta(self, stock_price: float) -> float:
+        """Gains 1:1 between the strikes, flat outside"""
+        return 1.0 if self.buy_strike <= stock_price < self.sell_strike else 0.0
 
 
 class PutSpread(OptionsStrategy):
     """Put Spread strategy: buy put + sell put at lower strike"""
     
+    __slots__ = ('buy_strike', 'sell_strike', 'buy_premium', 'sell_premium', 'net_debit')
+    
     def __init__(self, symbol: str, buy_strike: float, sell_strike: float,
                  current_price: float, expiration: date,
                  buy_premium: float, sell_premium: float):
@@ -282,11 +369,18 @@ class PutSpread(OptionsStrategy):
     def get_break_even_points(self) -> List[float]:
         """Calculate break-even point"""
         return [self.buy_strike - self.net_debit]
+    
+    def get_delta(self, stock_price: float) -> float:
+        """Gains 1:1 as price falls between the strikes, flat outside"""
+        return -1.0 if self.sell_strike <= stock_price < self.buy_strike else 0.0
 
 
 class Butterfly(OptionsStrategy):
     """Butterfly strategy: buy 1 ITM, sell 2 ATM, buy 1 OTM"""
     
+    __slots__ = ('low_strike', 'middle_strike', 'high_strike', 'low_premium', 'middle_premium', 'high_premium', 'net_debit')
+    POSITIVE_THETA = True  # Long butterflies gain as time passes near the middle strike
+    
     def __init__(self, symbol: str, low_strike: float, middle_strike: float,
                  high_strike: float, current_price: float, expiration: date,
                  low_premium: float, middle_premium: float, high_premium: float):
@@ -323,3 +417,11 @@ class Butterfly(OptionsStrategy):
         lower_be = self.low_strike + self.net_debit
         upper_be = self.high_strike - self.net_debit
         return [lower_be, upper_be]
+    
+    def get_delta(self, stock_price: float) -> float:
+        """Rises 1:1 from the low strike to the middle, falls 1:1 from the middle to the high strike"""
+        if self.low_strike <= stock_price < self.middle_strike:
+            return 1.0
+        if self.middle_strike <= stock_price < self.high_strike:
+            return -1.0
+        return 0.0
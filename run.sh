@@ -23,12 +23,12 @@ else
         elif [ "$1" = "--live" ]; then
             echo "🌐 Running with live data..."
             # Check if dependencies are available
-            if python3 -c "import yfinance, numpy, pandas" &> /dev/null; then
+            if python3 -c "import yfinance, numpy, pandas, cachetools" &> /dev/null; then
                 python3 main.py
             else
                 echo "❌ Live data dependencies not found."
                 echo "Installing dependencies..."
-                pip3 install yfinance numpy pandas
+                pip3 install yfinance numpy pandas cachetools
                 python3 main.py
             fi
         else
@@ -2,12 +2,119 @@
 Strategy analyzer for options trading strategies
 """
 
+import functools
 import math
 from typing import Dict, List
 from datetime import date
-import numpy as np
 
-from options_models import OptionsStrategy
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    # Curves and market summaries fall back to per-strategy Python; the column helpers need numpy
+    NUMPY_AVAILABLE = False
+
+from options_models import (OptionsStrategy, IronCondor, Straddle, Strangle,
+                            CallSpread, PutSpread, Butterfly)
+
+CURVE_POINTS = 50  # Price points per profit/loss curve
+
+
+def _field(group: List[OptionsStrategy], name: str) -> 'np.ndarray':
+    """One strategy attribute across a group, as a column for broadcasting against price rows"""
+    return np.array([getattr(s, name) for s in group], dtype=float)[:, None]
+
+
+def _iron_condor_payoffs(group, prices):
+    short_call, long_call = _field(group, 'short_call_strike'), _field(group, 'long_call_strike')
+    short_put, long_put = _field(group, 'short_put_strike'), _field(group, 'long_put_strike')
+    return (_field(group, 'net_credit')
+            - np.clip(prices - short_call, 0, long_call - short_call)
+            - np.clip(short_put - prices, 0, short_put - long_put))
+
+
+def _straddle_payoffs(group, prices):
+    strike = _field(group, 'strike')
+    return (np.maximum(prices - strike, 0) + np.maximum(strike - prices, 0)
+            - _field(group, 'call_premium') - _field(group, 'put_premium'))
+
+
+def _strangle_payoffs(group, prices):
+    return (np.maximum(prices - _field(group, 'call_strike'), 0)
+            + np.maximum(_field(group, 'put_strike') - prices, 0)
+            - _field(group, 'call_premium') - _field(group, 'put_premium'))
+
+
+def _call_spread_payoffs(group, prices):
+    buy, sell = _field(group, 'buy_strike'), _field(group, 'sell_strike')
+    return np.clip(prices - buy, 0, sell - buy) - _field(group, 'net_debit')
+
+
+def _put_spread_payoffs(group, prices):
+    buy, sell = _field(group, 'buy_strike'), _field(group, 'sell_strike')
+    return np.clip(buy - prices, 0, buy - sell) - _field(group, 'net_debit')
+
+
+def _butterfly_payoffs(group, prices):
+    low, middle, high = _field(group, 'low_strike'), _field(group, 'middle_strike'), _field(group, 'high_strike')
+    payoff = np.select(
+        [prices <= low, prices <= middle, prices <= high],
+        [0.0, prices - low, (middle - low) - (prices - middle)],
+        default=0.0
+    )
+    return payoff - _field(group, 'net_debit')
+
+
+# Broadcast payoff kernels; other strategy types fall back to calculate_payoff per price
+_VECTOR_PAYOFFS = {
+    IronCondor: _iron_condor_payoffs,
+    Straddle: _straddle_payoffs,
+    Strangle: _strangle_payoffs,
+    CallSpread: _call_spread_payoffs,
+    PutSpread: _put_spread_payoffs,
+    Butterfly: _butterfly_payoffs
+}
+
+
+def strategy_payoffs(strategies: List[OptionsStrategy], prices) -> 'np.ndarray':
+    """Expiration payoffs for each strategy's row of prices, one kernel call per strategy type"""
+    prices = np.asarray(prices, dtype=float)
+    payoffs = np.empty_like(prices)
+    groups: Dict[type, List[int]] = {}
+    for i, strategy in enumerate(strategies):
+        groups.setdefault(type(strategy), []).append(i)
+    for kind, rows in groups.items():
+        kernel = _VECTOR_PAYOFFS.get(kind)
+        if kernel is None:
+            for i in rows:
+                payoffs[i] = [strategies[i].calculate_payoff(p) for p in prices[i]]
+        else:
+            payoffs[rows] = kernel([strategies[i] for i in rows], prices[rows])
+    return payoffs
+
+
+@functools.lru_cache(maxsize=512)
+def _theta_factor(days_to_exp: int) -> float:
+    """Time decay factor 1/sqrt(days), shared by strategies with the same expiration"""
+    return 1 / math.sqrt(days_to_exp) if days_to_exp > 0 else 0
+
+
+@functools.lru_cache(maxsize=512)
+def _vega_factor(days_to_exp: int) -> float:
+    """Volatility factor sqrt(days/365), shared by strategies with the same expiration"""
+    return math.sqrt(days_to_exp / 365.0)
+
+
+def iron_condor_columns(condors: List[IronCondor]) -> Dict[str, 'np.ndarray']:
+    """Column (struct-of-arrays) view of iron condors, as consumed by compare_iron_condors"""
+    return {
+        'short_call': np.array([c.short_call_strike for c in condors], dtype=float),
+        'long_call': np.array([c.long_call_strike for c in condors], dtype=float),
+        'short_put': np.array([c.short_put_strike for c in condors], dtype=float),
+        'long_put': np.array([c.long_put_strike for c in condors], dtype=float),
+        'credit': np.array([c.net_credit for c in condors], dtype=float),
+        'current_price': np.array([c.current_price for c in condors], dtype=float)
+    }
 
 
 class StrategyAnalyzer:
@@ -18,38 +125,81 @@ class StrategyAnalyzer:
         
     def analyze_strategy(self, strategy: OptionsStrategy) -> Dict:
         """Comprehensive analysis of a strategy"""
-        analysis = {
-            'max_profit': strategy.get_max_profit(),
-            'max_loss': strategy.get_max_loss(),
-            'break_even_points': strategy.get_break_even_points(),
-            'risk_reward_ratio': self._calculate_risk_reward_ratio(strategy),
-            'probability_of_profit': self._calculate_probability_of_profit(strategy),
-            'expected_value': self._calculate_expected_value(strategy),
-            'greeks': self._calculate_greeks(strategy),
-            'profit_loss_curve': self._generate_profit_loss_curve(strategy),
-            'recommendation': self._get_recommendation(strategy)
-        }
+        return self.analyze_batch([strategy])[0]
         
-        return analysis
+    def analyze_batch(self, strategies: List[OptionsStrategy]) -> List[Dict]:
+        """Analyze many strategies, computing all profit/loss curves in one vectorized pass"""
+        if not strategies:
+            return []
+        prices, payoffs = self._payoff_grid(strategies)
+        today = date.today()  # Read the clock once for the whole batch
+        analyses = []
+        for strategy, price_row, payoff_row in zip(strategies, prices, payoffs):
+            summary = self._summary(strategy)
+            analyses.append({
+                'max_profit': summary['max_profit'],
+                'max_loss': summary['max_loss'],
+                'break_even_points': summary['break_even_points'],
+                'risk_reward_ratio': summary['risk_reward_ratio'],
+                'probability_of_profit': summary['probability_of_profit'],
+                'expected_value': summary['expected_value'],
+                'greeks': self._calculate_greeks(strategy, today),
+                'profit_loss_curve': {'prices': price_row, 'payoffs': payoff_row},
+                'recommendation': summary['recommendation']
+            })
+        return analyses
+        
+    def _payoff_grid(self, strategies: List[OptionsStrategy]):
+        """Price rows (one ±range grid per strategy) and the matching expiration payoffs, as lists"""
+        if not NUMPY_AVAILABLE:
+            prices = []
+            for strategy in strategies:
+                low = max(0.01, strategy.current_price - strategy.current_price * self.price_range_percent)
+                high = strategy.current_price + strategy.current_price * self.price_range_percent
+                prices.append([low + (high - low) * i / (CURVE_POINTS - 1) for i in range(CURVE_POINTS)])
+            payoffs = [[s.calculate_payoff(p) for p in row] for s, row in zip(strategies, prices)]
+            return prices, payoffs
+        
+        current = np.array([s.current_price for s in strategies], dtype=float)
+        low = np.maximum(0.01, current - current * self.price_range_percent)
+        high = current + current * self.price_range_percent
+        prices = low[:, None] + (high - low)[:, None] * np.linspace(0.0, 1.0, CURVE_POINTS)
+        # Curves are exported as JSON, so convert the whole grid to lists in one call each
+        return prices.tolist(), strategy_payoffs(strategies, prices).tolist()
+        
+    def _summary(self, strategy: OptionsStrategy) -> Dict:
+        """Scalar metrics for a strategy, calling each strategy getter once"""
+        max_profit = strategy.get_max_profit()
+        max_loss = strategy.get_max_loss()
+        break_even_points = strategy.get_break_even_points()
+        risk_reward = self._calculate_risk_reward_ratio(max_profit, max_loss)
+        prob_profit = self._calculate_probability_of_profit(strategy.current_price, break_even_points)
+        expected_value = self._calculate_expected_value(prob_profit, max_profit, max_loss)
+        return {
+            'max_profit': max_profit,
+            'max_loss': max_loss,
+            'break_even_points': break_even_points,
+            'risk_reward_ratio': risk_reward,
+            'probability_of_profit': prob_profit,
+            'expected_value': expected_value,
+            'recommendation': self._get_recommendation(risk_reward, prob_profit, expected_value, max_loss)
+        }
         
-    def _calculate_risk_reward_ratio(self, strategy: OptionsStrategy) -> float:
+    def _calculate_risk_reward_ratio(self, max_profit: float, max_loss: float) -> float:
         """Calculate risk/reward ratio"""
-        max_profit = strategy.get_max_profit()
-        max_loss = abs(strategy.get_max_loss())
+        max_loss = abs(max_loss)
         
         if max_loss == 0:
             return float('inf') if max_profit > 0 else 0
             
         return max_profit / max_loss if max_profit != float('inf') else 0
         
-    def _calculate_probability_of_profit(self, strategy: OptionsStrategy) -> float:
+    def _calculate_probability_of_profit(self, current_price: float,
+                                         break_even_points: List[float]) -> float:
         """Calculate probability of profit (simplified)"""
         # This is a simplified calculation
         # In reality, you'd use Black-Scholes or similar models
         
-        current_price = strategy.current_price
-        break_even_points = strategy.get_break_even_points()
-        
         if len(break_even_points) == 1:
             # Single break-even point
             be_point = break_even_points[0]
@@ -67,13 +217,9 @@ class StrategyAnalyzer:
         else:
             return 0.5  # Default 50%
             
-    def _calculate_expected_value(self, strategy: OptionsStrategy) -> float:
+    def _calculate_expected_value(self, prob_profit: float, max_profit: float, max_loss: float) -> float:
         """Calculate expected value of the strategy"""
         # Simplified expected value calculation
-        prob_profit = self._calculate_probability_of_profit(strategy)
-        max_profit = strategy.get_max_profit()
-        max_loss = strategy.get_max_loss()
-        
         if max_profit == float('inf'):
             # For unlimited profit strategies, use a reasonable estimate
             max_profit = abs(max_loss) * 2
@@ -81,19 +227,19 @@ class StrategyAnalyzer:
         expected_value = (prob_profit * max_profit) + ((1 - prob_profit) * max_loss)
         return expected_value
         
-    def _calculate_greeks(self, strategy: OptionsStrategy) -> Dict[str, float]:
+    def _calculate_greeks(self, strategy: OptionsStrategy, today: date = None) -> Dict[str, float]:
         """Calculate simplified Greeks"""
         # This is a very simplified calculation
         # Real Greeks require Black-Scholes model
         
         current_price = strategy.current_price
-        days_to_exp = strategy.days_to_expiration
+        days_to_exp = (strategy.expiration - (today or date.today())).days
         
-        # Delta: price sensitivity
-        delta = self._estimate_delta(strategy, current_price)
+        # Delta: price sensitivity (payoffs are piecewise linear, so the slope is exact)
+        delta = strategy.get_delta(current_price)
         
-        # Gamma: delta sensitivity
-        gamma = self._estimate_gamma(strategy, current_price)
+        # Gamma: delta sensitivity, zero away from the strikes
+        gamma = 0.0
         
         # Theta: time decay
         theta = self._estimate_theta(strategy, days_to_exp)
@@ -108,24 +254,6 @@ class StrategyAnalyzer:
             'vega': vega
         }
         
-    def _estimate_delta(self, strategy: OptionsStrategy, current_price: float) -> float:
-        """Estimate delta for the strategy"""
-        # Very simplified delta calculation
-        price_change = 0.01
-        current_payoff = strategy.calculate_payoff(current_price)
-        new_payoff = strategy.calculate_payoff(current_price + price_change)
-        
-        return (new_payoff - current_payoff) / price_change
-        
-    def _estimate_gamma(self, strategy: OptionsStrategy, current_price: float) -> float:
-        """Estimate gamma for the strategy"""
-        # Very simplified gamma calculation
-        price_change = 0.01
-        delta1 = self._estimate_delta(strategy, current_price)
-        delta2 = self._estimate_delta(strategy, current_price + price_change)
-        
-        return (delta2 - delta1) / price_change
-        
     def _estimate_theta(self, strategy: OptionsStrategy, days_to_exp: int) -> float:
         """Estimate theta (time decay) for the strategy"""
         if days_to_exp <= 0:
@@ -133,10 +261,10 @@ class StrategyAnalyzer:
             
         # Simplified theta calculation
         # Time decay accelerates as expiration approaches
-        time_decay_factor = 1 / math.sqrt(days_to_exp) if days_to_exp > 0 else 0
+        time_decay_factor = _theta_factor(days_to_exp)
         
         # For strategies that benefit from time decay (like iron condors)
-        if hasattr(strategy, 'net_credit'):
+        if strategy.POSITIVE_THETA:
             return time_decay_factor * 0.1  # Positive theta
         else:
             return -time_decay_factor * 0.1  # Negative theta
@@ -148,45 +276,24 @@ class StrategyAnalyzer:
             
         # Simplified vega calculation
         # Vega is higher for longer-dated options
-        vega_factor = math.sqrt(days_to_exp / 365.0)
+        vega_factor = _vega_factor(days_to_exp)
         
         # For strategies that benefit from volatility (like straddles)
-        if hasattr(strategy, 'total_cost'):
+        if strategy.POSITIVE_VEGA:
             return vega_factor * 0.2  # Positive vega
         else:
             return -vega_factor * 0.1  # Negative vega
             
-    def _generate_profit_loss_curve(self, strategy: OptionsStrategy) -> Dict[str, List[float]]:
-        """Generate profit/loss curve for different stock prices"""
-        current_price = strategy.current_price
-        price_range = current_price * self.price_range_percent
-        
-        # Generate price points
-        min_price = max(0.01, current_price - price_range)
-        max_price = current_price + price_range
-        price_points = np.linspace(min_price, max_price, 50)
-        
-        # Calculate payoffs
-        payoffs = [strategy.calculate_payoff(price) for price in price_points]
-        
-        return {
-            'prices': price_points.tolist(),
-            'payoffs': payoffs
-        }
-        
-    def _get_recommendation(self, strategy: OptionsStrategy) -> str:
+    def _get_recommendation(self, risk_reward: float, prob_profit: float,
+                            expected_value: float, max_loss: float) -> str:
         """Get trading recommendation based on analysis"""
-        risk_reward = self._calculate_risk_reward_ratio(strategy)
-        prob_profit = self._calculate_probability_of_profit(strategy)
-        expected_value = self._calculate_expected_value(strategy)
-        
         if expected_value > 0 and risk_reward > 1.5 and prob_profit > 0.6:
             return "STRONG BUY"
         elif expected_value > 0 and risk_reward > 1.0 and prob_profit > 0.5:
             return "BUY"
         elif expected_value > 0:
             return "WEAK BUY"
-        elif expected_value < -abs(strategy.get_max_loss()) * 0.5:
+        elif expected_value < -abs(max_loss) * 0.5:
             return "AVOID"
         else:
             return "HOLD"
@@ -195,8 +302,9 @@ class StrategyAnalyzer:
         """Compare multiple strategies"""
         comparison = {}
         
+        # Ranking only needs the scalar metrics, not curves or greeks
         for i, strategy in enumerate(strategies):
-            analysis = self.analyze_strategy(strategy)
+            analysis = self._summary(strategy)
             comparison[f"Strategy_{i+1}"] = {
                 'name': strategy.__class__.__name__,
                 'symbol': strategy.symbol,
@@ -217,13 +325,61 @@ class StrategyAnalyzer:
         
         return comparison
         
+    def compare_iron_condors(self, candidates: Dict[str, 'np.ndarray']) -> Dict[str, 'np.ndarray']:
+        """Score many iron condor candidates at once from columns short_call, long_call,
+        short_put, long_put, credit and current_price; same metrics as _summary, as arrays"""
+        short_call = np.asarray(candidates['short_call'], dtype=float)
+        long_call = np.asarray(candidates['long_call'], dtype=float)
+        short_put = np.asarray(candidates['short_put'], dtype=float)
+        long_put = np.asarray(candidates['long_put'], dtype=float)
+        credit = np.asarray(candidates['credit'], dtype=float)
+        current_price = np.asarray(candidates['current_price'], dtype=float)
+        
+        max_loss = np.maximum(long_call - short_call, short_put - long_put) - credit
+        lower_be = short_put - credit
+        upper_be = short_call + credit
+        prob_profit = np.where((lower_be <= current_price) & (current_price <= upper_be), 0.3, 0.7)
+        expected_value = prob_profit * credit + (1 - prob_profit) * max_loss
+        abs_loss = np.abs(max_loss)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            risk_reward = np.where(abs_loss == 0, np.where(credit > 0, np.inf, 0.0), credit / abs_loss)
+        
+        return {
+            'max_profit': credit,
+            'max_loss': max_loss,
+            'lower_break_even': lower_be,
+            'upper_break_even': upper_be,
+            'risk_reward_ratio': risk_reward,
+            'probability_of_profit': prob_profit,
+            'expected_value': expected_value,
+            # Stable, so ties keep candidate order like compare_strategies' sort
+            'ranking': np.argsort(-expected_value, kind='stable')
+        }
+        
     def analyze_market_conditions(self, strategies: List[OptionsStrategy]) -> Dict:
         """Analyze overall market conditions for strategies"""
         if not strategies:
             return {}
             
-        total_expected_value = sum(self._calculate_expected_value(s) for s in strategies)
-        avg_prob_profit = sum(self._calculate_probability_of_profit(s) for s in strategies) / len(strategies)
+        # One pass: iron condors are collected and scored column-wise, other types accumulate
+        # just their probability and expected value
+        condors = []
+        total_expected_value = 0.0
+        total_prob_profit = 0.0
+        for strategy in strategies:
+            if NUMPY_AVAILABLE and type(strategy) is IronCondor:
+                condors.append(strategy)
+                continue
+            prob_profit = self._calculate_probability_of_profit(strategy.current_price,
+                                                                strategy.get_break_even_points())
+            total_expected_value += self._calculate_expected_value(prob_profit, strategy.get_max_profit(),
+                                                                   strategy.get_max_loss())
+            total_prob_profit += prob_profit
+        if condors:
+            scores = self.compare_iron_condors(iron_condor_columns(condors))
+            total_expected_value += float(scores['expected_value'].sum())
+            total_prob_profit += float(scores['probability_of_profit'].sum())
+        avg_prob_profit = total_prob_profit / len(strategies)
         
         # Market sentiment based on strategy performance
         if total_expected_value > 0 and avg_prob_profit > 0.6:
@@ -2,51 +2,85 @@
 Strategy analyzer for options trading strategies (Safe version without numpy)
 """
 
+import functools
 import math
 from typing import Dict, List
 from datetime import date
 
 
+@functools.lru_cache(maxsize=512)
+def _theta_factor(days_to_exp: int) -> float:
+    """Time decay factor 1/sqrt(days), shared by strategies with the same expiration"""
+    return 1 / math.sqrt(days_to_exp) if days_to_exp > 0 else 0
+
+
+@functools.lru_cache(maxsize=512)
+def _vega_factor(days_to_exp: int) -> float:
+    """Volatility factor sqrt(days/365), shared by strategies with the same expiration"""
+    return math.sqrt(days_to_exp / 365.0)
+
+
 class StrategyAnalyzer:
     """Analyzes options trading strategies"""
     
     def __init__(self):
         self.price_range_percent = 0.3  # Analyze ±30% price movement
         
-    def analyze_strategy(self, strategy) -> Dict:
+    def analyze_strategy(self, strategy, today: date = None) -> Dict:
         """Comprehensive analysis of a strategy"""
+        summary = self._summary(strategy)
         analysis = {
-            'max_profit': strategy.get_max_profit(),
-            'max_loss': strategy.get_max_loss(),
-            'break_even_points': strategy.get_break_even_points(),
-            'risk_reward_ratio': self._calculate_risk_reward_ratio(strategy),
-            'probability_of_profit': self._calculate_probability_of_profit(strategy),
-            'expected_value': self._calculate_expected_value(strategy),
-            'greeks': self._calculate_greeks(strategy),
+            'max_profit': summary['max_profit'],
+            'max_loss': summary['max_loss'],
+            'break_even_points': summary['break_even_points'],
+            'risk_reward_ratio': summary['risk_reward_ratio'],
+            'probability_of_profit': summary['probability_of_profit'],
+            'expected_value': summary['expected_value'],
+            'greeks': self._calculate_greeks(strategy, today),
             'profit_loss_curve': self._generate_profit_loss_curve(strategy),
-            'recommendation': self._get_recommendation(strategy)
+            'recommendation': summary['recommendation']
         }
         
         return analysis
         
-    def _calculate_risk_reward_ratio(self, strategy) -> float:
-        """Calculate risk/reward ratio"""
+    def analyze_batch(self, strategies) -> List[Dict]:
+        """Analyze many strategies (same interface as the numpy analyzer)"""
+        today = date.today()  # Read the clock once for the whole batch
+        return [self.analyze_strategy(strategy, today) for strategy in strategies]
+        
+    def _summary(self, strategy) -> Dict:
+        """Scalar metrics for a strategy, calling each strategy getter once"""
         max_profit = strategy.get_max_profit()
-        max_loss = abs(strategy.get_max_loss())
+        max_loss = strategy.get_max_loss()
+        break_even_points = strategy.get_break_even_points()
+        risk_reward = self._calculate_risk_reward_ratio(max_profit, max_loss)
+        prob_profit = self._calculate_probability_of_profit(strategy.current_price, break_even_points)
+        expected_value = self._calculate_expected_value(prob_profit, max_profit, max_loss)
+        return {
+            'max_profit': max_profit,
+            'max_loss': max_loss,
+            'break_even_points': break_even_points,
+            'risk_reward_ratio': risk_reward,
+            'probability_of_profit': prob_profit,
+            'expected_value': expected_value,
+            'recommendation': self._get_recommendation(risk_reward, prob_profit, expected_value, max_loss)
+        }
+        
+    def _calculate_risk_reward_ratio(self, max_profit: float, max_loss: float) -> float:
+        """Calculate risk/reward ratio"""
+        max_loss = abs(max_loss)
         
         if max_loss == 0:
             return float('inf') if max_profit > 0 else 0
             
         return max_profit / max_loss if max_profit != float('inf') else 0
         
-    def _calculate_probability_of_profit(self, strategy) -> float:
+    def _calculate_probability_of_profit(self, current_price: float,
+                                         break_even_points: List[float]) -> float:
         """Calculate probability of profit (simplified)"""
         # This is a simplified calculation
         # In reality, you'd use Black-Scholes or similar models
         
-        current_price = strategy.current_price
-        break_even_points = strategy.get_break_even_points()
-        
         if len(break_even_points) == 1:
             # Single break-even point
             be_point = break_even_points[0]
@@ -64,13 +98,9 @@ class StrategyAnalyzer:
         else:
             return 0.5  # Default 50%
             
-    def _calculate_expected_value(self, strategy) -> float:
+    def _calculate_expected_value(self, prob_profit: float, max_profit: float, max_loss: float) -> float:
         """Calculate expected value of the strategy"""
         # Simplified expected value calculation
-        prob_profit = self._calculate_probability_of_profit(strategy)
-        max_profit = strategy.get_max_profit()
-        max_loss = strategy.get_max_loss()
-        
         if max_profit == float('inf'):
             # For unlimited profit strategies, use a reasonable estimate
             max_profit = abs(max_loss) * 2
@@ -78,19 +108,19 @@ class StrategyAnalyzer:
         expected_value = (prob_profit * max_profit) + ((1 - prob_profit) * max_loss)
         return expected_value
         
-    def _calculate_greeks(self, strategy) -> Dict[str, float]:
+    def _calculate_greeks(self, strategy, today: date = None) -> Dict[str, float]:
         """Calculate simplified Greeks"""
         # This is a very simplified calculation
         # Real Greeks require Black-Scholes model
         
         current_price = strategy.current_price
-        days_to_exp = strategy.days_to_expiration
+        days_to_exp = (strategy.expiration - (today or date.today())).days
         
-        # Delta: price sensitivity
-        delta = self._estimate_delta(strategy, current_price)
+        # Delta: price sensitivity (payoffs are piecewise linear, so the slope is exact)
+        delta = strategy.get_delta(current_price)
         
-        # Gamma: delta sensitivity
-        gamma = self._estimate_gamma(strategy, current_price)
+        # Gamma: delta sensitivity, zero away from the strikes
+        gamma = 0.0
         
         # Theta: time decay
         theta = self._estimate_theta(strategy, days_to_exp)
@@ -105,24 +135,6 @@ class StrategyAnalyzer:
             'vega': vega
         }
         
-    def _estimate_delta(self, strategy, current_price: float) -> float:
-        """Estimate delta for the strategy"""
-        # Very simplified delta calculation
-        price_change = 0.01
-        current_payoff = strategy.calculate_payoff(current_price)
-        new_payoff = strategy.calculate_payoff(current_price + price_change)
-        
-        return (new_payoff - current_payoff) / price_change
-        
-    def _estimate_gamma(self, strategy, current_price: float) -> float:
-        """Estimate gamma for the strategy"""
-        # Very simplified gamma calculation
-        price_change = 0.01
-        delta1 = self._estimate_delta(strategy, current_price)
-        delta2 = self._estimate_delta(strategy, current_price + price_change)
-        
-        return (delta2 - delta1) / price_change
-        
     def _estimate_theta(self, strategy, days_to_exp: int) -> float:
         """Estimate theta (time decay) for the strategy"""
         if days_to_exp <= 0:
@@ -130,10 +142,10 @@ class StrategyAnalyzer:
             
         # Simplified theta calculation
         # Time decay accelerates as expiration approaches
-        time_decay_factor = 1 / math.sqrt(days_to_exp) if days_to_exp > 0 else 0
+        time_decay_factor = _theta_factor(days_to_exp)
         
         # For strategies that benefit from time decay (like iron condors)
-        if hasattr(strategy, 'net_credit'):
+        if strategy.POSITIVE_THETA:
             return time_decay_factor * 0.1  # Positive theta
         else:
             return -time_decay_factor * 0.1  # Negative theta
@@ -145,10 +157,10 @@ class StrategyAnalyzer:
             
         # Simplified vega calculation
         # Vega is higher for longer-dated options
-        vega_factor = math.sqrt(days_to_exp / 365.0)
+        vega_factor = _vega_factor(days_to_exp)
         
         # For strategies that benefit from volatility (like straddles)
-        if hasattr(strategy, 'total_cost'):
+        if strategy.POSITIVE_VEGA:
             return vega_factor * 0.2  # Positive vega
         else:
             return -vega_factor * 0.1  # Negative vega
@@ -172,19 +184,16 @@ class StrategyAnalyzer:
             'payoffs': payoffs
         }
         
-    def _get_recommendation(self, strategy) -> str:
+    def _get_recommendation(self, risk_reward: float, prob_profit: float,
+                            expected_value: float, max_loss: float) -> str:
         """Get trading recommendation based on analysis"""
-        risk_reward = self._calculate_risk_reward_ratio(strategy)
-        prob_profit = self._calculate_probability_of_profit(strategy)
-        expected_value = self._calculate_expected_value(strategy)
-        
         if expected_value > 0 and risk_reward > 1.5 and prob_profit > 0.6:
             return "STRONG BUY"
         elif expected_value > 0 and risk_reward > 1.0 and prob_profit > 0.5:
             return "BUY"
         elif expected_value > 0:
             return "WEAK BUY"
-        elif expected_value < -abs(strategy.get_max_loss()) * 0.5:
+        elif expected_value < -abs(max_loss) * 0.5:
             return "AVOID"
         else:
             return "HOLD"
@@ -193,8 +202,9 @@ class StrategyAnalyzer:
         """Compare multiple strategies"""
         comparison = {}
         
+        # Ranking only needs the scalar metrics, not curves or greeks
         for i, strategy in enumerate(strategies):
-            analysis = self.analyze_strategy(strategy)
+            analysis = self._summary(strategy)
             comparison[f"Strategy_{i+1}"] = {
                 'name': strategy.__class__.__name__,
                 'symbol': strategy.symbol,
@@ -220,8 +230,16 @@ class StrategyAnalyzer:
         if not strategies:
             return {}
             
-        total_expected_value = sum(self._calculate_expected_value(s) for s in strategies)
-        avg_prob_profit = sum(self._calculate_probability_of_profit(s) for s in strategies) / len(strategies)
+        # One pass, computing only probability and expected value per strategy
+        total_expected_value = 0.0
+        total_prob_profit = 0.0
+        for strategy in strategies:
+            prob_profit = self._calculate_probability_of_profit(strategy.current_price,
+                                                                strategy.get_break_even_points())
+            total_expected_value += self._calculate_expected_value(prob_profit, strategy.get_max_profit(),
+                                                                   strategy.get_max_loss())
+            total_prob_profit += prob_profit
+        avg_prob_profit = total_prob_profit / len(strategies)
         
         # Market sentiment based on strategy performance
         if total_expected_value > 0 and avg_prob_profit > 0.6:
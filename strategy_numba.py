@@ -0,0 +1,137 @@
+"""
+Compiled strike-sweep scoring and price-path simulation (uses Numba when installed)
+"""
+
+import math
+import os
+import numpy as np
+
+# Keep compiled kernels next to the project so the one-time compile survives restarts
+os.environ.setdefault('NUMBA_CACHE_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), '.numba_cache'))
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# Score for pairs that can't be traded for a credit (finite, so argmax comparisons stay ordinary)
+INVALID_SCORE = -1e18
+
+# Floor for simulated prices so a random walk can never go to zero or negative
+MIN_PRICE = 0.01
+
+
+def _prob_below(strike: float, spot: float, sd: float) -> float:
+    """Lognormal probability (zero drift) that the underlying finishes below strike"""
+    d2 = (math.log(spot / strike) - 0.5 * sd * sd) / sd
+    return 0.5 * (1.0 + math.erf(-d2 / math.sqrt(2.0)))
+
+
+def _ic_expected_value(short_call, long_call, short_call_prem, long_call_prem,
+                       short_put, long_put, short_put_prem, long_put_prem,
+                       spot, sd):
+    """Expected value of one iron condor: keep the credit inside the shorts, lose the max outside"""
+    credit = (short_call_prem + short_put_prem) - (long_call_prem + long_put_prem)
+    if credit <= 0.0:
+        return INVALID_SCORE
+    max_loss = max(long_call - short_call, short_put - long_put) - credit
+    p_inside = _prob_below(short_call, spot, sd) - _prob_below(short_put, spot, sd)
+    return credit * p_inside - max_loss * (1.0 - p_inside)
+
+
+# Explicit signatures compile eagerly at import, so with cache=True the first
+# call never pays for codegen (the on-disk cache is loaded instead). No parallel=True:
+# the grids are small, and numba's threading layer hangs forked pool workers at exit
+_IC_VALUE_SIG = 'float64(' + ', '.join(['float64'] * 10) + ')'
+_SCORE_SIG = '(float64[::1], float64[::1], float64[::1], float64[::1], float64, float64)'
+_WALK_SIG = '(float64[::1], float64[:, ::1])'
+
+if NUMBA_AVAILABLE:
+    # Rebinding the module globals lets the kernel below call the compiled versions.
+    # No fastmath on the scoring path: reassociated log/erf could move the argmax away
+    # from the numpy fallback's choice
+    _prob_below = njit('float64(float64, float64, float64)', cache=True)(_prob_below)
+    _ic_expected_value = njit(_IC_VALUE_SIG, cache=True)(_ic_expected_value)
+
+    @njit(_SCORE_SIG, cache=True)
+    def _score_ic_pairs_jit(call_strikes, call_prem, put_strikes, put_prem, spot, sd):
+        n_calls = call_strikes.size - 1
+        n_puts = put_strikes.size - 1
+        out = np.empty((n_calls, n_puts))
+        for i in range(n_calls):
+            for j in range(n_puts):
+                out[i, j] = _ic_expected_value(
+                    call_strikes[i], call_strikes[i + 1], call_prem[i], call_prem[i + 1],
+                    put_strikes[j], put_strikes[j + 1], put_prem[j], put_prem[j + 1],
+                    spot, sd
+                )
+        return out
+
+
+def _score_ic_pairs_numpy(call_strikes, call_prem, put_strikes, put_prem, spot, sd):
+    """Same scoring as the compiled kernel, broadcast over the call x put grid"""
+    call_side = call_prem[:-1] - call_prem[1:]
+    put_side = put_prem[:-1] - put_prem[1:]
+    credit = call_side[:, None] + put_side[None, :]
+    max_loss = np.maximum((call_strikes[1:] - call_strikes[:-1])[:, None],
+                          (put_strikes[:-1] - put_strikes[1:])[None, :]) - credit
+    below_call = np.array([_prob_below(k, spot, sd) for k in call_strikes[:-1]])
+    below_put = np.array([_prob_below(k, spot, sd) for k in put_strikes[:-1]])
+    p_inside = below_call[:, None] - below_put[None, :]
+    scores = credit * p_inside - max_loss * (1.0 - p_inside)
+    return np.where(credit > 0.0, scores, INVALID_SCORE)
+
+
+def score_ic_pairs(call_strikes: np.ndarray, call_prem: np.ndarray,
+                   put_strikes: np.ndarray, put_prem: np.ndarray,
+                   spot: float, iv: float, t: float) -> np.ndarray:
+    """Score every (short call i, short put j) iron condor, each long leg one strike further out.
+
+    Strikes must be ordered nearest-OTM first (calls ascending, puts descending).
+    Returns an (n_calls - 1, n_puts - 1) grid of expected values.
+    """
+    sd = iv * math.sqrt(t)
+    args = (np.ascontiguousarray(call_strikes, dtype=np.float64),
+            np.ascontiguousarray(call_prem, dtype=np.float64),
+            np.ascontiguousarray(put_strikes, dtype=np.float64),
+            np.ascontiguousarray(put_prem, dtype=np.float64),
+            float(spot), float(sd))
+    if NUMBA_AVAILABLE:
+        return _score_ic_pairs_jit(*args)
+    return _score_ic_pairs_numpy(*args)
+
+
+def _walk_paths_numpy(spots, returns):
+    """Compound daily returns along every path at once, flooring each step at MIN_PRICE"""
+    paths = np.empty_like(returns)
+    price = spots.copy()
+    for day in range(returns.shape[1]):
+        price = np.maximum(price * (1.0 + returns[:, day]), MIN_PRICE)
+        paths[:, day] = price
+    return paths
+
+
+if NUMBA_AVAILABLE:
+    @njit(_WALK_SIG, fastmath=True, cache=True)
+    def _walk_paths_jit(spots, returns):
+        n_paths, days = returns.shape
+        paths = np.empty_like(returns)
+        for i in range(n_paths):
+            price = spots[i]
+            for day in range(days):
+                price = max(price * (1.0 + returns[i, day]), MIN_PRICE)
+                paths[i, day] = price
+        return paths
+
+
+def simulate_paths(spots, days: int, drift: float, volatility: float, seed: int) -> np.ndarray:
+    """Simulate one random-walk price path per spot.
+
+    Returns an (n_paths, days) grid where column d is the price after d + 1 daily steps.
+    """
+    spots = np.ascontiguousarray(spots, dtype=np.float64)
+    returns = np.random.default_rng(seed).normal(drift, volatility, size=(spots.size, days))
+    if NUMBA_AVAILABLE:
+        return _walk_paths_jit(spots, returns)
+    return _walk_paths_numpy(spots, returns)
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Offline test script for request coalescing in the AI strategy generator
+"""
+
+import asyncio
+import sys
+import os
+import json
+import threading
+import time
+from types import SimpleNamespace
+
+# Add current directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+STRATEGY = {
+    'strategy_type': 'Iron Condor',
+    'reasoning': 'Range-bound market with elevated volatility',
+    'risk_level': 'Medium',
+    'confidence': 0.7
+}
+RECOMMENDATION = {
+    'analysis': 'Neutral sentiment, iron condor favoured, medium risk',
+    'strategy': STRATEGY
+}
+
+
+class FakeClient:
+    """Streams canned completions slowly enough for concurrent callers to overlap"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.calls = []
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def create(self, stream=False, **request):
+        with self.lock:
+            self.calls.append(request)
+        time.sleep(0.2)
+        combined = request['response_format']['type'] == 'json_object'
+        content = json.dumps(RECOMMENDATION if combined else STRATEGY)
+        return iter([SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=content))])])
+
+
+def run_concurrently(generator, requests):
+    """Call get_strategy_recommendation from one thread per (symbol, price) request"""
+    results = {}
+
+    def worker(symbol, price):
+        results[symbol, price] = generator.get_strategy_recommendation(symbol, MARKET_DATA, price)
+
+    threads = [threading.Thread(target=worker, args=r) for r in requests]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+MARKET_DATA = {
+    'vix': 25.0,
+    'spy_price': 425.0,
+    'trend': 'Neutral',
+    'volatility': 0.20,
+    'time_of_day': '14:30'
+}
+
+try:
+    from ai_strategy_generator import AIStrategyGenerator, SingleFlight
+    print("✓ AI strategy generator imported successfully!")
+
+    # Two concurrent callers with the same snapshot share one model call
+    generator = AIStrategyGenerator()
+    generator.client = FakeClient()
+    results = run_concurrently(generator, [('AAPL', 150.0), ('AAPL', 150.0)])
+    assert len(generator.client.calls) == 1, len(generator.client.calls)
+    assert results['AAPL', 150.0]['strategy']['strategy_type'] == 'Iron Condor'
+    print("✓ Concurrent identical requests coalesced into one call")
+
+    # Other symbols reuse the in-flight market analysis and only ask for their strategy
+    generator = AIStrategyGenerator()
+    generator.client = FakeClient()
+    results = run_concurrently(generator, [('AAPL', 150.0), ('MSFT', 370.0)])
+    kinds = sorted(c['response_format']['type'] for c in generator.client.calls)
+    assert kinds == ['json_object', 'json_schema'], kinds
+    for symbol, price in results:
+        recommendation = results[symbol, price]
+        assert recommendation['strategy']['symbol'] == symbol
+        assert recommendation['market_analysis']['sentiment'] == 'Neutral'
+    print("✓ Market analysis shared across symbols")
+
+    # Cached halves are served without another call
+    generator.get_strategy_recommendation('MSFT', MARKET_DATA, 370.0)
+    assert len(generator.client.calls) == 2
+    print("✓ Cached recommendation reused")
+
+    # Async followers get the leader's error, not a cancellation
+    async def failing():
+        await asyncio.sleep(0.05)
+        raise ValueError("model unavailable")
+
+    async def two_callers():
+        flight = SingleFlight()
+        return await asyncio.gather(flight.ado('k', failing), flight.ado('k', failing),
+                                    return_exceptions=True)
+
+    errors = asyncio.run(two_callers())
+    assert [type(e) for e in errors] == [ValueError, ValueError], errors
+    print("✓ Async flight shares the leader's exception")
+
+    print("\n🎉 AI strategy generator tests passed!")
+
+except ImportError as e:
+    print(f"❌ Import error: {e}")
+    sys.exit(1)
+except Exception as e:
+    print(f"❌ Error: {e}")
+    sys.exit(1)
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Offline test script for batched quote parsing in the data fetcher
+"""
+
+import sys
+import os
+
+# Add current directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+# Canned v8 spark responses: the current keyed-by-symbol form and the older wrapped form
+SPARK_BY_SYMBOL = {
+    'AAPL': {'symbol': 'AAPL', 'timestamp': [1700000000], 'close': [189.5]},
+    'MSFT': {'symbol': 'MSFT', 'timestamp': [1700000000, 1700000300], 'close': [370.1, None]},
+    'BAD': {'symbol': 'BAD', 'timestamp': [], 'close': []}
+}
+SPARK_WRAPPED = {
+    'spark': {
+        'result': [
+            {'symbol': 'SPY', 'response': [{'meta': {'regularMarketPrice': 451.25}}]},
+            {'symbol': 'QQQ', 'response': [{'meta': {}}]}
+        ],
+        'error': None
+    }
+}
+
+
+class FakeResponse:
+    """Just enough of requests.Response for get_stock_prices"""
+
+    def __init__(self, data):
+        self._data = data
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self._data
+
+
+class FakeSession:
+    """Records spark requests and answers with the canned keyed response"""
+
+    def __init__(self):
+        self.requests = []
+
+    def get(self, url, params=None, **kwargs):
+        self.requests.append((url, params))
+        return FakeResponse(SPARK_BY_SYMBOL)
+
+
+try:
+    from data_fetcher import (YahooFinanceDataFetcher, YAHOO_SPARK_URL, _parse_spark,
+                              _spark_params)
+    print("✓ Data fetcher imported successfully!")
+
+    # Parser handles both response shapes and skips symbols without a price
+    prices = _parse_spark(SPARK_BY_SYMBOL)
+    assert prices == {'AAPL': 189.5, 'MSFT': 370.1}, prices
+    prices = _parse_spark(SPARK_WRAPPED)
+    assert prices == {'SPY': 451.25}, prices
+    assert _parse_spark({}) == {}
+    print("✓ Spark responses parsed")
+
+    params = _spark_params(['AAPL', 'MSFT'])
+    assert params['symbols'] == 'AAPL,MSFT', params
+
+    # One request serves the whole batch, and the result is cached for the next lookup
+    fetcher = YahooFinanceDataFetcher()
+    session = FakeSession()
+    fetcher._session = session
+    prices = fetcher.get_stock_prices(['AAPL', 'MSFT', 'AAPL'])
+    assert prices == {'AAPL': 189.5, 'MSFT': 370.1}, prices
+    assert len(session.requests) == 1 and session.requests[0][0] == YAHOO_SPARK_URL
+    assert fetcher.get_stock_price('AAPL') == 189.5
+    fetcher.get_stock_prices(['AAPL', 'MSFT'])
+    assert len(session.requests) == 1, "cached quotes should not be refetched"
+    print("✓ Batched prices fetched with one request and cached")
+
+    # Tickers are built with yfinance's own session (no network until data is read) and reused
+    ticker = fetcher._ticker('AAPL')
+    assert ticker is fetcher._ticker('AAPL')
+    print("✓ yfinance Ticker created and shared")
+
+    print("\n🎉 Data fetcher tests passed!")
+
+except ImportError as e:
+    print(f"❌ Import error: {e}")
+    print("Please install required dependencies: pip install yfinance numpy pandas")
+    sys.exit(1)
+except Exception as e:
+    print(f"❌ Error: {e}")
+    sys.exit(1)
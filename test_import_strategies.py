@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Smoke test for bulk strategy import from JSON and CSV files
+"""
+
+import sys
+import os
+import json
+import tempfile
+from datetime import date, timedelta
+
+# Add current directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+EXPIRATION = (date.today() + timedelta(days=30)).isoformat()
+
+JSON_ROWS = [
+    {'type': 'Iron Condor', 'symbol': 'aapl', 'current_price': 150, 'expiration': EXPIRATION,
+     'short_call_strike': 155, 'long_call_strike': 160, 'short_put_strike': 145,
+     'long_put_strike': 140, 'net_credit': 2.5},
+    {'type': 'option', 'symbol': 'SPY', 'option_type': 'call', 'strike': 430, 'expiration': EXPIRATION,
+     'premium': 5.2, 'current_price': 425, 'volume': 1200}
+]
+
+CSV_TEXT = (
+    "type,symbol,strike,current_price,expiration,call_premium,put_premium\n"
+    f"straddle,TSLA,200,200,{EXPIRATION},15,12\n"
+    f"straddle,MSFT,not-a-number,300,{EXPIRATION},9,8\n"
+    f"butterfly,QQQ,380,380,{EXPIRATION},4,4\n"
+)
+
+try:
+    from main import OptionsSimulator
+    from options_models import IronCondor, Straddle
+    print("✓ Simulator imported successfully!")
+    
+    simulator = OptionsSimulator()
+    engine = simulator.trading_engine
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        json_path = os.path.join(tmp, 'strategies.json')
+        csv_path = os.path.join(tmp, 'strategies.csv')
+        with open(json_path, 'w') as f:
+            json.dump(JSON_ROWS, f)
+        with open(csv_path, 'w', newline='') as f:
+            f.write(CSV_TEXT)
+        
+        assert simulator.import_strategies(json_path) == 2
+        # The unparseable strike and the unsupported type are skipped, not fatal
+        assert simulator.import_strategies(csv_path) == 1
+    
+    assert [type(s) for s in engine.strategies] == [IronCondor, Straddle]
+    condor, straddle = engine.strategies
+    assert condor.symbol == 'AAPL' and condor.net_credit == 2.5
+    assert condor.expiration.isoformat() == EXPIRATION
+    assert straddle.symbol == 'TSLA' and straddle.strike == 200.0 and straddle.put_premium == 12.0
+    print("✓ Strategies imported from JSON and CSV")
+    
+    assert len(engine.options) == 1
+    option = engine.options[0]
+    assert option.option_type == 'CALL' and option.volume == 1200 and option.strike == 430.0
+    print("✓ Options imported with typed fields")
+    
+    print("\n🎉 Import tests passed!")
+    
+except ImportError as e:
+    print(f"❌ Import error: {e}")
+    print("Please install required dependencies: pip install -r requirements.txt")
+    sys.exit(1)
+except Exception as e:
+    print(f"❌ Error: {e}")
+    sys.exit(1)
@@ -5,6 +5,7 @@ Test script for live data functionality
 
 import sys
 import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 
 # Add current directory to path
@@ -20,26 +21,38 @@ try:
     # Test data fetcher
     fetcher = YahooFinanceDataFetcher()
     
+    # The independent lookups are network-bound, so issue them together
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        price_future = executor.submit(fetcher.get_stock_price, "AAPL")
+        status_future = executor.submit(fetcher.get_market_status)
+        expirations_future = executor.submit(fetcher.get_available_expirations, "AAPL")
+        volatility_future = executor.submit(fetcher.get_volatility, "AAPL")
+        
+        aapl_price = price_future.result()
+        expirations = expirations_future.result()
+        # Strategy data needs the price and an expiration
+        if expirations:
+            iron_condor_future = executor.submit(fetcher.get_iron_condor_data, "AAPL", aapl_price, expirations[0])
+            straddle_future = executor.submit(fetcher.get_straddle_data, "AAPL", aapl_price, expirations[0])
+    
     # Test stock price
     print("\n--- Testing Stock Price Fetch ---")
-    aapl_price = fetcher.get_stock_price("AAPL")
     print(f"AAPL current price: ${aapl_price:.2f}")
     
     # Test market status
     print("\n--- Testing Market Status ---")
-    status = fetcher.get_market_status()
+    status = status_future.result()
     print(f"Market state: {status['market_state']}")
     print(f"Market open: {status['is_open']}")
     
     # Test available expirations
     print("\n--- Testing Options Expirations ---")
-    expirations = fetcher.get_available_expirations("AAPL")
     print(f"AAPL expirations: {[exp.strftime('%Y-%m-%d') for exp in expirations[:3]]}")
     
     # Test iron condor data
     print("\n--- Testing Iron Condor Data ---")
     if expirations:
-        iron_condor_data = fetcher.get_iron_condor_data("AAPL", aapl_price, expirations[0])
+        iron_condor_data = iron_condor_future.result()
         if iron_condor_data:
             print(f"Iron Condor data: {iron_condor_data}")
         else:
@@ -48,7 +61,7 @@ try:
     # Test straddle data
     print("\n--- Testing Straddle Data ---")
     if expirations:
-        straddle_data = fetcher.get_straddle_data("AAPL", aapl_price, expirations[0])
+        straddle_data = straddle_future.result()
         if straddle_data:
             print(f"Straddle data: {straddle_data}")
         else:
@@ -56,7 +69,7 @@ try:
     
     # Test volatility
     print("\n--- Testing Volatility Calculation ---")
-    volatility = fetcher.get_volatility("AAPL")
+    volatility = volatility_future.result()
     print(f"AAPL volatility: {volatility:.2%}")
     
     print("\n�� Live data tests completed!")
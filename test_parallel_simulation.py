@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Test script for the process-pool parallel simulation
+"""
+
+import sys
+import os
+import io
+import contextlib
+from datetime import date, timedelta
+
+# Add current directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+
+def build_engine():
+    """Engine with one iron condor and one straddle, progress output off"""
+    from options_models import IronCondor, Straddle
+    from trading_engine import TradingEngine
+    
+    engine = TradingEngine()
+    engine.add_strategy(IronCondor(
+        symbol="AAPL", current_price=150.0, expiration=date.today() + timedelta(days=30),
+        short_call_strike=155.0, long_call_strike=160.0,
+        short_put_strike=145.0, long_put_strike=140.0, net_credit=2.5
+    ))
+    engine.add_strategy(Straddle(
+        symbol="TSLA", strike=200.0, current_price=200.0, expiration=date.today() + timedelta(days=21),
+        call_premium=15.0, put_premium=12.0
+    ))
+    engine.verbose = False
+    return engine
+
+
+# Guarded so worker processes importing this script don't rerun the test
+if __name__ == '__main__':
+    try:
+        engine = build_engine()
+        print("✓ Trading engine imported successfully!")
+        
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            first = engine.run_parallel_simulation(seed=7, max_workers=2)
+        assert output.getvalue() == "", "verbose=False should silence progress output"
+        print(f"✓ Parallel simulation ran quietly: {first['total_trades']} trades")
+        
+        # The same seed reproduces the run, regardless of which worker finishes first
+        second = build_engine().run_parallel_simulation(seed=7, max_workers=2)
+        assert first['trades'] == second['trades']
+        assert first['final_value'] == second['final_value']
+        print("✓ Seeded runs are reproducible")
+        
+        # Strategies are independent portfolios: combined value is the capital plus summed P&L
+        assert first['independent_portfolios'] is True
+        pnl = sum(trade['pnl'] for trade in first['trades'])
+        assert abs(first['final_value'] - (engine.config.initial_capital + pnl)) < 1e-6
+        assert first['total_trades'] == first['winning_trades'] + first['losing_trades']
+        assert {trade['symbol'] for trade in first['trades']} <= {'AAPL', 'TSLA'}
+        print("✓ Aggregate results combine the per-strategy portfolios")
+        
+        print("\n🎉 Parallel simulation tests passed!")
+        
+    except ImportError as e:
+        print(f"❌ Import error: {e}")
+        sys.exit(1)
+    except Exception as e:
+        print(f"❌ Error: {e}")
+        sys.exit(1)
@@ -2,16 +2,57 @@
 Trading engine for simulating options trades with live data support
 """
 
+import itertools
+import functools
+import multiprocessing
+import os
 import random
+import statistics
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from datetime import date, datetime, timedelta
-from typing import List, Dict, Optional
-from dataclasses import dataclass, asdict
+from typing import Dict, Iterator, List, Optional, Tuple
+from dataclasses import dataclass
 import math
 
-from options_models import OptionsStrategy, Option
+from options_models import OptionsStrategy, Option, IronCondor, Straddle, Strangle, to_dict
 
+try:
+    from strategy_numba import simulate_paths
+    from strategy_analyzer import strategy_payoffs
+    PATH_KERNEL_AVAILABLE = True
+except ImportError:
+    PATH_KERNEL_AVAILABLE = False
 
-@dataclass
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+    # Flat record layout of Trade for columnar analytics (converts to a DataFrame without copying)
+    TRADE_DTYPE = np.dtype([
+        ('id', 'U8'), ('symbol', 'U8'), ('strategy_type', 'U16'),
+        ('entry_date', 'datetime64[D]'), ('exit_date', 'datetime64[D]'),
+        ('entry_price', 'f8'), ('exit_price', 'f8'), ('quantity', 'i4'),
+        ('pnl', 'f8'), ('action', 'U4')
+    ])
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+# Random walk parameters: 0.05% daily return, 2% daily volatility
+DAILY_DRIFT = 0.0005
+DAILY_VOLATILITY = 0.02
+MIN_PRICE = 0.01
+
+# Equal-probability standard normal points used by evaluate_analytic
+ANALYTIC_POINTS = 200
+
+# Preferred days-to-expiration window for entering each strategy type; other types enter anytime
+ENTRY_DTE_WINDOWS = {
+    IronCondor: (30, 45),
+    Straddle: (15, 30),
+    Strangle: (15, 30)
+}
+
+
+@dataclass(slots=True)
 class Trade:
     """Represents a completed trade"""
     id: str
@@ -26,7 +67,7 @@ class Trade:
     action: str  # "BUY" or "SELL"
 
 
-@dataclass
+@dataclass(slots=True)
 class Position:
     """Represents an open position"""
     id: str
@@ -37,9 +78,11 @@ class Position:
     quantity: int
     current_price: float
     unrealized_pnl: float
+    entry_day: int = 0  # Simulation day index the position was opened on
+    path_scale: float = 1.0  # Entry price over the symbol's path price on entry_day
 
 
-@dataclass
+@dataclass(slots=True)
 class SimulationConfig:
     """Configuration for trading simulation"""
     initial_capital: float = 10000.0
@@ -49,6 +92,25 @@ class SimulationConfig:
     use_live_data: bool = True
 
 
+def _simulate_strategy(config: SimulationConfig, strategy: OptionsStrategy, seed: int) -> List[Trade]:
+    """Simulate one strategy on its own engine in a worker process (module-level so it pickles)"""
+    random.seed(seed)
+    engine = TradingEngine()
+    engine.set_config(config)
+    engine.add_strategy(strategy)
+    # Per-day progress from many workers would interleave, so only the parent reports
+    engine.verbose = False
+    engine.run_simulation()
+    return engine.trades
+
+
+@functools.lru_cache(maxsize=None)
+def _normal_quantiles(n: int) -> Tuple[float, ...]:
+    """Midpoint quantiles of the standard normal, each standing for 1/n of the probability"""
+    normal = statistics.NormalDist()
+    return tuple(normal.inv_cdf((i + 0.5) / n) for i in range(n))
+
+
 class TradingEngine:
     """Engine for simulating options trading with live data support"""
     
@@ -57,11 +119,17 @@ class TradingEngine:
         self.positions: List[Position] = []
         self.trades: List[Trade] = []
         self.strategies: List[OptionsStrategy] = []
+        self._strategy_by_symbol: Dict[str, OptionsStrategy] = {}  # First strategy added per symbol
         self.options: List[Option] = []
         self.config = SimulationConfig()
         self.current_date = date.today()
+        self.current_day = 0  # Day index within the running simulation
         self.trade_counter = 0
         self.data_fetcher = None  # Will be set by main app
+        self.verbose = True  # False skips per-trade progress output (and its formatting) in the simulation runs
+        self._price_paths: Dict[str, List[float]] = {}
+        self._path_payoffs: Dict[str, List[float]] = {}
+        self._profit_loss_limits: Dict[int, Tuple[float, float]] = {}  # id(strategy) -> (max profit, max loss)
         
     def set_data_fetcher(self, data_fetcher):
         """Set the data fetcher for live data"""
@@ -75,15 +143,23 @@ class TradingEngine:
     def add_strategy(self, strategy: OptionsStrategy):
         """Add a strategy to the engine"""
         self.strategies.append(strategy)
+        self._strategy_by_symbol.setdefault(strategy.symbol, strategy)
         
     def add_option(self, option: Option):
         """Add a single option to the engine"""
         self.options.append(option)
         
+    def _max_profit_loss(self, strategy: OptionsStrategy) -> Tuple[float, float]:
+        """Max profit and max loss, from the per-simulation cache when running"""
+        limits = self._profit_loss_limits.get(id(strategy))
+        if limits is None:
+            return strategy.get_max_profit(), strategy.get_max_loss()
+        return limits
+        
     def calculate_position_size(self, strategy: OptionsStrategy) -> int:
         """Calculate position size based on risk management"""
         max_risk_amount = self.cash * self.config.risk_per_trade
-        max_loss = abs(strategy.get_max_loss())
+        max_loss = abs(self._max_profit_loss(strategy)[1])
         
         if max_loss <= 0:
             return 0
@@ -93,51 +169,49 @@ class TradingEngine:
     
     def should_enter_trade(self, strategy: OptionsStrategy) -> bool:
         """Determine if we should enter a trade based on strategy analysis"""
+        return self._entry_size(strategy) > 0
+        
+    def _entry_size(self, strategy: OptionsStrategy) -> int:
+        """Contracts to open for the strategy, or 0 when it should not be entered"""
         # Check if we have enough cash
         position_size = self.calculate_position_size(strategy)
         if position_size <= 0:
-            return False
+            return 0
             
         # Check if we're at max concurrent trades
         if len(self.positions) >= self.config.max_concurrent_trades:
-            return False
+            return 0
             
         # Check if strategy is not expired
         if strategy.is_expired:
-            return False
-            
-        # Simple entry criteria (can be enhanced)
-        days_to_exp = strategy.days_to_expiration
-        
-        # For iron condors, prefer 30-45 days to expiration
-        if isinstance(strategy, type(self.strategies[0])) and hasattr(strategy, 'net_credit'):
-            return 30 <= days_to_exp <= 45
-            
-        # For straddles/strangles, prefer 15-30 days to expiration
-        if hasattr(strategy, 'total_cost'):
-            return 15 <= days_to_exp <= 30
+            return 0
             
-        return True
+        # Simple entry criteria (can be enhanced): iron condors prefer 30-45 days to
+        # expiration, straddles/strangles 15-30
+        window = ENTRY_DTE_WINDOWS.get(type(strategy))
+        if window is not None and not window[0] <= strategy.days_to_expiration <= window[1]:
+            return 0
+        return position_size
         
     def should_exit_trade(self, position: Position, strategy: OptionsStrategy) -> bool:
         """Determine if we should exit a trade"""
-        # Exit if expired
-        if strategy.is_expired:
+        # Exit if expired (same test as is_expired, reading the day count once)
+        days_to_exp = strategy.days_to_expiration
+        if days_to_exp <= 0:
             return True
             
         # Exit if we've held for too long (50% of time to expiration)
-        days_held = (self.current_date - position.entry_date).days
-        if days_held >= strategy.days_to_expiration * 0.5:
+        days_held = self.current_day - position.entry_day
+        if days_held >= days_to_exp * 0.5:
             return True
             
         # Exit if we've made 50% of max profit
         current_pnl = position.unrealized_pnl
-        max_profit = strategy.get_max_profit()
+        max_profit, max_loss = self._max_profit_loss(strategy)
         if max_profit != float('inf') and current_pnl >= max_profit * 0.5:
             return True
             
         # Exit if we've lost 50% of max loss
-        max_loss = strategy.get_max_loss()
         if current_pnl <= max_loss * 0.5:
             return True
             
@@ -146,12 +220,68 @@ class TradingEngine:
     def simulate_price_movement(self, symbol: str, current_price: float, days: int) -> float:
         """Simulate stock price movement using random walk"""
         # Simple random walk with slight upward bias
-        daily_return = random.normalvariate(0.0005, 0.02)  # 0.05% daily return, 2% volatility
+        daily_return = random.normalvariate(DAILY_DRIFT, DAILY_VOLATILITY)
         price_change = current_price * daily_return * days
         new_price = current_price + price_change
         
         # Ensure price doesn't go negative
-        return max(new_price, 0.01)
+        return max(new_price, MIN_PRICE)
+    
+    def simulate_price_paths(self, days: int) -> Dict[str, List[float]]:
+        """Pre-generate one daily random-walk price path per symbol; element d is the price after d steps"""
+        spots = {}
+        for strategy in self.strategies:
+            spots.setdefault(strategy.symbol, strategy.current_price)
+        seed = random.getrandbits(32)
+        
+        if PATH_KERNEL_AVAILABLE:
+            paths = simulate_paths(list(spots.values()), days, DAILY_DRIFT, DAILY_VOLATILITY, seed)
+            return {symbol: [spot] + path for (symbol, spot), path in zip(spots.items(), paths.tolist())}
+        
+        # Pure-Python fallback for the offline, no-numpy setup. gauss is faster than
+        # normalvariate, and its cached second draw is safe here because rng is local to this call
+        rng = random.Random(seed)
+        gauss = rng.gauss
+        price_paths = {}
+        for symbol, price in spots.items():
+            path = [price]
+            for _ in range(days):
+                price = max(price * (1.0 + gauss(DAILY_DRIFT, DAILY_VOLATILITY)), MIN_PRICE)
+                path.append(price)
+            price_paths[symbol] = path
+        return price_paths
+    
+    def evaluate_analytic(self, strategy: OptionsStrategy, days: Optional[int] = None) -> Dict[str, float]:
+        """Closed-form estimate of per-contract P&L when held for `days`, without simulating"""
+        # Terminal prices are lognormal with the random walk's drift and volatility scaled to
+        # the horizon; early exits are ignored
+        days = self.config.simulation_days if days is None else days
+        drift = DAILY_DRIFT * days
+        volatility = DAILY_VOLATILITY * math.sqrt(days)
+        payoffs = [
+            strategy.calculate_payoff(strategy.current_price * math.exp(drift + volatility * z))
+            for z in _normal_quantiles(ANALYTIC_POINTS)
+        ]
+        expected_pnl = statistics.fmean(payoffs)
+        stdev = statistics.pstdev(payoffs, expected_pnl)
+        return {
+            'expected_pnl': expected_pnl,
+            'win_rate': sum(payoff > 0 for payoff in payoffs) / len(payoffs) * 100,
+            'sharpe': expected_pnl / stdev if stdev > 0 else 0.0
+        }
+        
+    def shortlist_strategies(self, strategies: List[OptionsStrategy]) -> List[OptionsStrategy]:
+        """Strategies whose analytic expected P&L is non-negative, worth a full simulation"""
+        return [strategy for strategy in strategies if self.evaluate_analytic(strategy)['expected_pnl'] >= 0]
+        
+    def price_path_payoffs(self, price_paths: Dict[str, List[float]]) -> Dict[str, List[float]]:
+        """Per-contract payoff of each symbol's position strategy at every point of its path"""
+        if not PATH_KERNEL_AVAILABLE or not price_paths:
+            return {}
+        symbols = list(price_paths)
+        payoffs = strategy_payoffs([self._strategy_by_symbol[s] for s in symbols],
+                                   [price_paths[s] for s in symbols])
+        return dict(zip(symbols, payoffs.tolist()))
         
     def get_live_price(self, symbol: str) -> float:
         """Get live price if data fetcher is available"""
@@ -192,11 +322,11 @@ class TradingEngine:
         self.trade_counter += 1
         return trade
         
-    def update_positions(self):
+    def update_positions(self, day: Optional[int] = None):
         """Update all open positions with current market data"""
         for position in self.positions:
             # Find corresponding strategy
-            strategy = next((s for s in self.strategies if s.symbol == position.symbol), None)
+            strategy = self._strategy_by_symbol.get(position.symbol)
             if not strategy:
                 continue
                 
@@ -211,6 +341,9 @@ class TradingEngine:
                     position.current_price = self.simulate_price_movement(
                         position.symbol, position.current_price, 1
                     )
+            elif day is not None and position.symbol in self._price_paths:
+                # Follow the pre-generated path from the position's own entry price
+                position.current_price = self._price_paths[position.symbol][day] * position.path_scale
             else:
                 # Use simulated movement
                 position.current_price = self.simulate_price_movement(
@@ -219,12 +352,24 @@ class TradingEngine:
             
             # Update unrealized P&L
             strategy.current_price = position.current_price
-            position.unrealized_pnl = strategy.calculate_payoff(position.current_price) * position.quantity
+            path_payoffs = self._path_payoffs.get(position.symbol) if day is not None else None
+            if path_payoffs and position.path_scale == 1.0:
+                payoff = path_payoffs[day]
+            else:
+                payoff = strategy.calculate_payoff(position.current_price)
+            position.unrealized_pnl = payoff * position.quantity
             
     def close_position(self, position: Position) -> Trade:
         """Close a position and create a trade record"""
+        trade = self._settle_position(position)
+        if trade:
+            self.positions.remove(position)
+        return trade
+        
+    def _settle_position(self, position: Position) -> Optional[Trade]:
+        """Book a position's final P&L and trade record, leaving it in self.positions"""
         # Find corresponding strategy
-        strategy = next((s for s in self.strategies if s.symbol == position.symbol), None)
+        strategy = self._strategy_by_symbol.get(position.symbol)
         if not strategy:
             return None
             
@@ -252,73 +397,157 @@ class TradingEngine:
         self.trade_counter += 1
         self.trades.append(trade)
         
-        # Remove position
-        self.positions.remove(position)
-        
         return trade
         
     def run_simulation(self) -> Dict:
         """Run the complete trading simulation"""
-        print("Starting simulation...")
+        verbose = self.verbose
+        if verbose:
+            print("Starting simulation...")
         
         # Reset state
         self.cash = self.config.initial_capital
         self.positions = []
         self.trades = []
-        self.current_date = date.today()
+        start_date = date.today()
+        self.current_date = start_date
+        self.current_day = 0
+        
+        # Without live data every price comes from a random walk, so build all paths up front
+        if self.config.use_live_data and self.data_fetcher:
+            self._price_paths = {}
+        else:
+            self._price_paths = self.simulate_price_paths(self.config.simulation_days)
+        # Payoffs along every path in one vectorized pass, instead of per position per day
+        self._path_payoffs = self.price_path_payoffs(self._price_paths)
+        # Strike-derived limits don't change during a run, so compute them once per strategy
+        self._profit_loss_limits = {
+            id(strategy): (strategy.get_max_profit(), strategy.get_max_loss()) for strategy in self.strategies
+        }
         
         # Run simulation for specified days
         for day in range(self.config.simulation_days):
-            self.current_date = date.today() + timedelta(days=day)
+            # Day counters drive the exit logic; the date is only kept for trade records
+            self.current_day = day
+            self.current_date = start_date + timedelta(days=day)
             
             # Update existing positions
-            self.update_positions()
+            self.update_positions(day)
             
             # Check for exits
             positions_to_close = []
             for position in self.positions:
-                strategy = next((s for s in self.strategies if s.symbol == position.symbol), None)
+                strategy = self._strategy_by_symbol.get(position.symbol)
                 if strategy and self.should_exit_trade(position, strategy):
                     positions_to_close.append(position)
                     
-            # Close positions
-            for position in positions_to_close:
-                trade = self.close_position(position)
-                if trade:
-                    print(f"Day {day+1}: Closed {trade.symbol} {trade.strategy_type} - P&L: ${trade.pnl:.2f}")
+            # Close positions, then drop them all in one pass instead of a list.remove each
+            if positions_to_close:
+                closed = set()
+                for position in positions_to_close:
+                    trade = self._settle_position(position)
+                    if trade:
+                        closed.add(id(position))
+                        if verbose:
+                            print(f"Day {day+1}: Closed {trade.symbol} {trade.strategy_type} - P&L: ${trade.pnl:.2f}")
+                self.positions = [p for p in self.positions if id(p) not in closed]
             
             # Check for new entries
+            open_symbols = {p.symbol for p in self.positions}
             for strategy in self.strategies:
-                if self.should_enter_trade(strategy):
-                    # Check if we already have a position in this symbol
-                    existing_position = next((p for p in self.positions if p.symbol == strategy.symbol), None)
-                    if not existing_position:
-                        # Enter new position
-                        position_size = self.calculate_position_size(strategy)
-                        if position_size > 0:
-                            position = Position(
-                                id=f"P{len(self.positions)+1:04d}",
-                                symbol=strategy.symbol,
-                                strategy_type=strategy.__class__.__name__,
-                                entry_date=self.current_date,
-                                entry_price=strategy.current_price,
-                                quantity=position_size,
-                                current_price=strategy.current_price,
-                                unrealized_pnl=0.0
-                            )
-                            
-                            self.positions.append(position)
-                            print(f"Day {day+1}: Opened {strategy.symbol} {strategy.__class__.__name__}")
-                            
+                # Check if we already have a position in this symbol before any sizing work
+                if strategy.symbol in open_symbols:
+                    continue
+                # Size once: a non-zero size means the entry checks passed
+                position_size = self._entry_size(strategy)
+                if position_size > 0:
+                    # Enter new position
+                    strategy_type = type(strategy).__name__
+                    position = Position(
+                        id=f"P{len(self.positions)+1:04d}",
+                        symbol=strategy.symbol,
+                        strategy_type=strategy_type,
+                        entry_date=self.current_date,
+                        entry_price=strategy.current_price,
+                        quantity=position_size,
+                        current_price=strategy.current_price,
+                        unrealized_pnl=0.0,
+                        entry_day=day
+                    )
+                    path = self._price_paths.get(strategy.symbol)
+                    if path:
+                        # 1.0 unless the symbol sat out while its path moved on
+                        position.path_scale = strategy.current_price / path[day]
+                    
+                    self.positions.append(position)
+                    open_symbols.add(strategy.symbol)
+                    if verbose:
+                        print(f"Day {day+1}: Opened {strategy.symbol} {strategy_type}")
+                    
         # Close any remaining positions
-        for position in self.positions[:]:
-            trade = self.close_position(position)
+        remaining = []
+        for position in self.positions:
+            trade = self._settle_position(position)
             if trade:
-                print(f"Final: Closed {trade.symbol} {trade.strategy_type} - P&L: ${trade.pnl:.2f}")
+                if verbose:
+                    print(f"Final: Closed {trade.symbol} {trade.strategy_type} - P&L: ${trade.pnl:.2f}")
+            else:
+                remaining.append(position)
+        self.positions = remaining
+        
+        self._profit_loss_limits = {}
+        return self._simulation_results()
+        
+    def run_parallel_simulation(self, strategies: Optional[List[OptionsStrategy]] = None,
+                                seed: Optional[int] = None, max_workers: Optional[int] = None,
+                                prefilter: bool = False) -> Dict:
+        """Simulate each strategy independently in a process pool and combine the trades
+        
+        Each strategy runs as its own portfolio starting from the full initial_capital, so
+        cash is not shared and max_concurrent_trades applies per strategy, not overall.
+        The combined final_value is initial_capital plus the summed P&L, flagged in the
+        results as 'independent_portfolios'; use run_simulation for one shared portfolio.
+        """
+        strategies = self.strategies if strategies is None else strategies
+        if prefilter:
+            # Skip strategies the closed-form estimate already expects to lose money
+            strategies = self.shortlist_strategies(strategies)
+        # Derive one seed per strategy, so a given seed reproduces the whole run
+        rng = random.Random(random.getrandbits(32) if seed is None else seed)
+        seeds = [rng.getrandbits(32) for _ in strategies]
+        if self.verbose:
+            print(f"Starting parallel simulation of {len(strategies)} strategies...")
         
-        # Calculate results
+        results: List[List[Trade]] = [[] for _ in strategies]
+        # Spawned, not forked: the parent may already hold threads (numba, data fetch pools)
+        with ProcessPoolExecutor(max_workers=max_workers or os.cpu_count(),
+                                 mp_context=multiprocessing.get_context('spawn')) as pool:
+            futures = {
+                pool.submit(_simulate_strategy, self.config, strategy, job_seed): i
+                for i, (strategy, job_seed) in enumerate(zip(strategies, seeds))
+            }
+            for done, future in enumerate(as_completed(futures), 1):
+                i = futures[future]
+                results[i] = future.result()
+                if self.verbose:
+                    print(f"[{done}/{len(strategies)}] Finished {strategies[i].symbol} "
+                          f"{strategies[i].__class__.__name__}: {len(results[i])} trades")
+        
+        # Each strategy ran as its own portfolio from the initial capital; combine their P&L
+        self.positions = []
+        self.trades = list(itertools.chain.from_iterable(results))
+        for number, trade in enumerate(self.trades):
+            trade.id = f"T{number:04d}"
+        self.trade_counter = len(self.trades)
+        self.cash = self.config.initial_capital + sum(trade.pnl for trade in self.trades)
+        results = self._simulation_results()
+        results['independent_portfolios'] = True
+        return results
+        
+    def _simulation_results(self) -> Dict:
+        """Summary statistics of the completed trades"""
         total_trades = len(self.trades)
-        winning_trades = len([t for t in self.trades if t.pnl > 0])
+        winning_trades = sum(trade.pnl > 0 for trade in self.trades)  # Counted without building a list
         losing_trades = total_trades - winning_trades
         win_rate = (winning_trades / total_trades * 100) if total_trades > 0 else 0
         
@@ -331,7 +560,7 @@ class TradingEngine:
             'winning_trades': winning_trades,
             'losing_trades': losing_trades,
             'win_rate': win_rate,
-            'trades': [asdict(trade) for trade in self.trades]
+            'trades': [to_dict(trade) for trade in self.trades]
         }
         
     def get_portfolio(self) -> Dict:
@@ -343,19 +572,41 @@ class TradingEngine:
         return {
             'cash': self.cash,
             'total_value': total_value,
-            'positions': [asdict(position) for position in self.positions]
+            'positions': [to_dict(position) for position in self.positions]
         }
         
     def get_trade_history(self) -> List[Dict]:
         """Get trade history"""
-        return [asdict(trade) for trade in self.trades]
+        return list(self.iter_trade_history())
+        
+    def iter_trade_history(self) -> Iterator[Dict]:
+        """Yield trade history one record at a time"""
+        return map(to_dict, self.trades)
+        
+    def get_trade_array(self):
+        """Trade history as a numpy structured array of TRADE_DTYPE, one row per trade"""
+        if not NUMPY_AVAILABLE:
+            raise ImportError("numpy is required for get_trade_array; install it or use get_trade_history")
+        return np.array([
+            (t.id, t.symbol, t.strategy_type, t.entry_date, t.exit_date,
+             t.entry_price, t.exit_price, t.quantity, t.pnl, t.action)
+            for t in self.trades
+        ], dtype=TRADE_DTYPE)
+        
+    def iter_tail(self, n: int) -> Iterator[Dict]:
+        """Yield the last n trades, newest first, without converting the rest"""
+        return map(to_dict, itertools.islice(reversed(self.trades), n))
         
     def update_live_prices(self):
         """Update all strategy prices with live data"""
         if not self.data_fetcher or not self.config.use_live_data:
             return
             
+        # Strategies often share an underlying; look each symbol up once
+        prices = {}
         for strategy in self.strategies:
-            live_price = self.get_live_price(strategy.symbol)
+            if strategy.symbol not in prices:
+                prices[strategy.symbol] = self.get_live_price(strategy.symbol)
+            live_price = prices[strategy.symbol]
             if live_price > 0:
                 strategy.current_price = live_price